@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+from bisect import bisect_right
+from itertools import accumulate
 import random
+import re
 from typing import Iterable, Iterator, Mapping
 
 from backend.src.components.optional_component import OptionalComponent
@@ -16,6 +19,8 @@ from backend.src.utils.strings.splitting import split_multiple
 
 DEFAULT_FORENAMES = ('Tom', 'John', 'Mary', 'Alice')  # _DEFAULT_SURNAME = 'Jackson'
 
+_DEFAULT_FORENAME_PATTERN = re.compile('|'.join(DEFAULT_FORENAMES))
+
 
 class ForenameConvertor(OptionalComponent):
     @staticmethod
@@ -66,6 +71,32 @@ class ForenameConvertor(OptionalComponent):
         else:
             return self._convert_sentence_pair(sentence_pair)
 
+    def convert_batch(self, sentence_pairs: list[list[str]]) -> list[list[str]]:
+        """ Bulk counterpart of __call__, screening the english sentences of all sentence pairs
+            for default forenames by means of a single regex scan, solely the ones comprising
+            them being converted, whereas the remaining ones are returned as they are
+
+            >>> convertor = ForenameConvertor('Italian', train_english=False)
+            >>> sentence_pairs = [['I am hungry.', 'Ho fame.'], ['Tom is hungry.', 'Tom ha fame.']]
+            >>> converted_sentence_pairs = convertor.convert_batch(sentence_pairs)
+            >>> converted_sentence_pairs[0] is sentence_pairs[0], converted_sentence_pairs[1] == sentence_pairs[1]
+            (True, False)
+            """
+
+        english_sentences = [sentence_pair[self._train_english] for sentence_pair in sentence_pairs]
+
+        # exclusive end offsets of the newline-delimited english sentences
+        sentence_end_offsets = list(accumulate(len(sentence) + 1 for sentence in english_sentences))
+        forename_comprising_sentence_indices = {
+            bisect_right(sentence_end_offsets, match.start())
+            for match in _DEFAULT_FORENAME_PATTERN.finditer('\n'.join(english_sentences))
+        }
+
+        return [
+            self(sentence_pair) if i in forename_comprising_sentence_indices else sentence_pair
+            for i, sentence_pair in enumerate(sentence_pairs)
+        ]
+
     def _convert_sentence_pair(self, sentence_pair: Iterable[str]) -> list[str]:
         forename_index_blacklist: list[int | None] = [None, None]  # for prevention of usage of same replacement
         # forename for two different fallback forenames of same gender
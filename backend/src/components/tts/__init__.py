@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from tempfile import _TemporaryFileWrapper
+from typing import TYPE_CHECKING
 
 from playsound import playsound
 
@@ -10,6 +11,10 @@ from backend.src.database.user_database import LanguageMetadataCollection, UserD
 from backend.src.utils import either_or
 from backend.src.utils.io import file_size
 
+if TYPE_CHECKING:
+    from backend.src.database.journal import UserJournal
+    from backend.src.database.journal.collections import JournalLanguageMetadataCollection
+
 
 class TTS(OptionalComponent):
     @staticmethod
@@ -17,10 +22,10 @@ class TTS(OptionalComponent):
         return GoogleTTSClient.available_for(language)
 
     @UserDatabase.receiver
-    def __init__(self, language: str, user_database: UserDatabase):
+    def __init__(self, language: str, user_database: UserDatabase | UserJournal):
         self._language = language
 
-        self._language_metadata_db_collection: LanguageMetadataCollection = user_database.language_metadata_collection
+        self._language_metadata_db_collection: LanguageMetadataCollection | JournalLanguageMetadataCollection = user_database.language_metadata_collection
         self._google_tts_client = GoogleTTSClient(language)
 
         self._accent: str | None = self._retrieve_previous_accent()
@@ -116,10 +121,22 @@ class TTS(OptionalComponent):
     # Downloading / Playing
     # -----------------------
     def download_audio(self, text: str):
-        self._audio = self._google_tts_client.download_audio(text, self._accent)
+        self._audio = self.fetch_audio(text)
+
+    def fetch_audio(self, text: str) -> _TemporaryFileWrapper:
+        """ Stateless, thread-safe counterpart of download_audio, returning
+            the audio file instead of storing it """
+
+        return self._google_tts_client.download_audio(text, self._accent)
+
+    def play_audio(self, suspend_for_playback_duration=True, audio: _TemporaryFileWrapper | None = None) -> bool:
+        """ Suspends program for playback duration, deletes _audio file subsequently
+
+            Args:
+                audio: previously fetched audio file to be played instead of the downloaded one """
 
-    def play_audio(self, suspend_for_playback_duration=True) -> bool:
-        """ Suspends program for playback duration, deletes _audio file subsequently """
+        if audio is not None:
+            self._audio = audio
 
         assert self._audio is not None
 
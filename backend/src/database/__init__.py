@@ -1,19 +1,43 @@
 from __future__ import annotations
 
+import logging
 from typing import Type
 
 from pymongo.errors import ConfigurationError, ServerSelectionTimeoutError
 
+from backend.src.database.command_monitoring import CommandMonitor
+from backend.src.database.connection_pool import PoolOptions
 from backend.src.database.mongo_client import Client
 
 
-def connect_database_client(server_selection_timeout=1_000) -> Type[ConfigurationError] | Type[ServerSelectionTimeoutError] | None:
-    """ Returns:
+def connect_database_client(server_selection_timeout=1_000, pool_options: PoolOptions = PoolOptions(), warm_up_timeout: float | None = None, command_monitor: CommandMonitor | None = None) -> Type[ConfigurationError] | Type[ServerSelectionTimeoutError] | None:
+    """ Instantiates the process-wide Client once, subsequent calls solely checking its health,
+        without a round trip, and reestablishing the connection if unhealthy
+
+        Args:
+            pool_options, command_monitor: solely applied upon the instantiation, a warning being
+                logged if subsequent calls pass differing ones
+            warm_up_timeout: seconds to wait for the min_pool_size connections of pool_options
+                to be established, the connection being solely asserted if None, and a warning
+                being logged if not all of them having been established in time
+
+        Returns:
             instantiation_error: errors.PyMongoError in case of existence, otherwise None """
 
+    if (client := Client.established()) is not None:
+        if pool_options != client.pool_options or (command_monitor is not None and command_monitor is not client.command_monitor):
+            logging.warning('Ignoring the pool options or command monitor passed, differing from the ones of the established client')
+        if client.healthy():
+            return None
+
     try:
-        client = Client(server_selection_timeout=server_selection_timeout)
-        client.assert_connection()
+        if client is None:
+            client = Client(server_selection_timeout=server_selection_timeout, pool_options=pool_options, command_monitor=command_monitor)
+
+        if warm_up_timeout is None:
+            client.assert_connection()
+        elif not client.warm_up(timeout=warm_up_timeout):
+            logging.warning(f'Solely {client.pool_statistics.n_open_connections} of {client.pool_options.min_pool_size} connections established within the warm-up timeout of {warm_up_timeout}s')
         return None
     except (ConfigurationError, ServerSelectionTimeoutError) as error:
         return type(error)
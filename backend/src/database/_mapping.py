@@ -0,0 +1,583 @@
+""" Document mapping shared by the pymongo based collections and their motor based asyncio counterparts,
+    the latter of which solely differ in awaiting their database operations """
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+import datetime
+import time
+from typing import Iterable, Mapping, TypedDict
+
+from pymongo import ASCENDING, UpdateOne
+from typing_extensions import TypeAlias
+
+from backend.src.database._utils import ID, JOURNAL_OPERATIONS
+from backend.src.types.session_checkpoint import SessionCheckpoint
+from backend.src.types.vocable_entry import BaseVocableEntry, PERFECTION_EXPIRY_DAYS, PERFECTION_SCORE, VocableEntries
+from backend.src.utils.date import string_2_epoch_day, today_epoch_day
+
+
+DOCUMENT_ACCESS_EXCEPTIONS = (KeyError, TypeError)
+
+
+class LanguageScopedMapping(ABC):
+    @property
+    @abstractmethod
+    def language(self) -> str:
+        """ Language of the owning database """
+
+    @property
+    def _language_id_filter(self) -> dict:
+        return {ID: self.language}
+
+    @property
+    def _language_filter(self) -> dict:
+        return {'language': self.language}
+
+
+# ---------------
+# Vocabulary
+# ---------------
+class _VocableDataCorpus(TypedDict):
+    t: str
+    tf: int
+    s: float
+    lfd: int | None
+
+
+_LegacyVocabularyDocument: TypeAlias = dict[str, _VocableDataCorpus]
+
+
+class _VocableEntryDocument(_VocableDataCorpus):
+    language: str
+    vocable: str
+    due: int
+
+
+class VocabularyMapping(LanguageScopedMapping, ABC):
+    _QUERY_PAGE_SIZE = 512
+    _ENTRY_PROJECTION = {ID: False, 'vocable': True, 't': True, 'tf': True, 's': True, 'lfd': True}
+    _LEGACY_DOCUMENT_FILTER = {'language': {'$exists': False}}
+    _INDEXES: tuple[tuple[list[tuple[str, int]], dict], ...] = (
+        ([('language', ASCENDING), ('vocable', ASCENDING)], {'unique': True}),
+        ([('language', ASCENDING), ('due', ASCENDING)], {})
+    )
+
+    def _entry_filter(self, vocable: str) -> dict:
+        return self._language_filter | {'vocable': vocable}
+
+    @staticmethod
+    def _due(times_faced: int, score: float, last_faced_date: int | None) -> int:
+        """ Returns:
+                epoch day as of which the entry is due for training, 0 if not perfected,
+                in correspondence with VocableEntries.due_mask
+
+            >>> VocabularyMapping._due(3, 6.0, 19066), VocabularyMapping._due(3, 2.0, 19066), VocabularyMapping._due(0, 0, None)
+            (19116, 0, 0) """
+
+        if times_faced and score >= PERFECTION_SCORE:
+            return last_faced_date + PERFECTION_EXPIRY_DAYS  # type: ignore[operator]
+        return 0
+
+    def _entry_2_document(self, entry: BaseVocableEntry) -> _VocableEntryDocument:
+        return {
+            'language': self.language,
+            'vocable': entry.vocable,
+            't': entry.translation,
+            'tf': entry.times_faced,
+            's': entry.score,
+            'lfd': entry.last_faced_date,
+            'due': self._due(entry.times_faced, entry.score, entry.last_faced_date)
+        }
+
+    @staticmethod
+    def _to_entries(vocable_entry_documents: list[dict]) -> VocableEntries:
+        return VocableEntries(
+            vocables=(document['vocable'] for document in vocable_entry_documents),
+            translations=(document['t'] for document in vocable_entry_documents),
+            times_faced=(document['tf'] for document in vocable_entry_documents),
+            scores=(document['s'] for document in vocable_entry_documents),
+            last_faced_dates=(document['lfd'] for document in vocable_entry_documents)
+        )
+
+    def _entries_query(self, vocables: Iterable[str] | None, due_only: bool, today: int | None) -> dict:
+        query = self._language_filter
+        if vocables is not None:
+            query = query | {'vocable': {'$in': list(vocables)}}
+        if due_only:
+            query = query | {'due': {'$lte': today_epoch_day() if today is None else today}}
+        return query
+
+    def _entry_update(self, new_score: float) -> dict:
+        today = today_epoch_day()
+        return {
+            '$inc': {'tf': 1},
+            '$set': {
+                'lfd': today,
+                's': new_score,
+                'due': self._due(1, new_score, today)
+            }
+        }
+
+    @staticmethod
+    def _translation(vocable_entry_document: dict | None) -> str | None:
+        try:
+            return vocable_entry_document['t']  # type: ignore
+        except DOCUMENT_ACCESS_EXCEPTIONS:
+            return None
+
+    # ---------------
+    # Legacy Layout Migration
+    # ---------------
+    @classmethod
+    def _migration_upserts(cls, language_document: dict) -> list[UpdateOne]:
+        """ Returns:
+                upserts of the entry documents of the legacy language_document, not overwriting
+                already existent ones, e.g. inserted after a deployment preceding the migration """
+
+        return [
+            UpdateOne(
+                {'language': language_document[ID], 'vocable': vocable},
+                {'$setOnInsert': cls._migrated_entry_fields(entry_corpus)},
+                upsert=True
+            )
+            for vocable, entry_corpus in language_document.items() if vocable != ID
+        ]
+
+    @classmethod
+    def _migrated_entry_fields(cls, entry_corpus: _VocableDataCorpus) -> dict:
+        """ Converts legacy '%Y-%m-%d' last faced date strings to epoch days
+
+            >>> VocabularyMapping._migrated_entry_fields({'t': 'dog', 'tf': 3, 's': 6.0, 'lfd': '2022-03-15'})
+            {'t': 'dog', 'tf': 3, 's': 6.0, 'lfd': 19066, 'due': 19116} """
+
+        # typed as the one of migrated documents, legacy ones however storing strings
+        last_faced_date: int | str | None = entry_corpus['lfd']
+        if isinstance(last_faced_date, str):
+            last_faced_date = string_2_epoch_day(last_faced_date)
+
+        return {
+            't': entry_corpus['t'],
+            'tf': entry_corpus['tf'],
+            's': entry_corpus['s'],
+            'lfd': last_faced_date,
+            'due': cls._due(entry_corpus['tf'], entry_corpus['s'], last_faced_date)
+        }
+
+
+# ---------------
+# Paraphrase Index
+# ---------------
+class ParaphraseIndexMapping(LanguageScopedMapping, ABC):
+    _INDEX = [('language', ASCENDING), ('meaning', ASCENDING)]
+    _PARAPHRASES_PROJECTION = {ID: False, 'meaning': True, 'vocables': True}
+
+    def _meaning_filter(self, meaning: str) -> dict:
+        return self._language_filter | {'meaning': meaning}
+
+    @property
+    def _paraphrases_filter(self) -> dict:
+        return self._language_filter | {'vocables.1': {'$exists': True}}
+
+    @property
+    def _built_marker_filter(self) -> dict:
+        """ Filter of the meaning-less document marking the index of the language as having been
+            built, from which on it is maintained by the entry manipulations """
+
+        return self._language_filter | {'built': True}
+
+    def _paraphrase_index_documents(self, entries: VocableEntries) -> list[dict]:
+        meaning_2_vocables: dict[str, list[str]] = {}
+        for entry in entries:
+            meaning_2_vocables.setdefault(entry.the_stripped_meaning, []).append(entry.vocable)
+        return [self._meaning_filter(meaning) | {'vocables': vocables} for meaning, vocables in meaning_2_vocables.items()]
+
+    def _build_requests(self, paraphrase_index_documents: list[dict]) -> list[UpdateOne]:
+        """ Returns:
+                upserts of paraphrase_index_documents, merging their vocables into the ones of
+                documents having been added concurrently, and of the built marker """
+
+        return [
+            *(
+                UpdateOne(self._meaning_filter(document['meaning']), {'$addToSet': {'vocables': {'$each': document['vocables']}}}, upsert=True)
+                for document in paraphrase_index_documents
+            ),
+            UpdateOne(self._built_marker_filter, {'$setOnInsert': self._built_marker_filter}, upsert=True)
+        ]
+
+    @staticmethod
+    def _paraphrases(paraphrase_index_documents: list[dict]) -> dict[str, list[str]]:
+        return {document['meaning']: document['vocables'] for document in paraphrase_index_documents if len(document['vocables']) >= 2}
+
+
+# ---------------
+# Vocable Schedule
+# ---------------
+@dataclass(frozen=True)
+class VocabularyChanges:
+    """ Vocables added to and deleted from the vocabulary since the last persistence of the
+        schedule, disjoint, with the latest manipulation of a vocable prevailing """
+
+    added: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_document(cls, document: dict | None) -> VocabularyChanges:
+        return cls(added=(document or {}).get('added', []), deleted=(document or {}).get('deleted', []))
+
+
+class VocableScheduleMapping(LanguageScopedMapping, ABC):
+    """ The vocabulary changes are recorded by the vocabulary collection upon each entry manipulation,
+        by means of which the stored schedule is synchronized with the vocabulary without scanning it,
+        and pulled upon the persistence of the schedule they have been reconciled with """
+
+    @staticmethod
+    def _vocable_added_update(vocable: str) -> dict:
+        return {'$addToSet': {'added': vocable}, '$pull': {'deleted': vocable}}
+
+    @staticmethod
+    def _vocable_deleted_update(vocable: str) -> dict:
+        return {'$addToSet': {'deleted': vocable}, '$pull': {'added': vocable}}
+
+    @staticmethod
+    def _schedule_update(schedule_document: dict[str, list], reconciled_changes: VocabularyChanges) -> dict:
+        return {
+            '$set': {'schedule': schedule_document},
+            '$pullAll': {'added': reconciled_changes.added, 'deleted': reconciled_changes.deleted}
+        }
+
+
+# ---------------
+# Training Chronic
+# ---------------
+class Streak(TypedDict):
+    length: int
+    longest: int
+    lastDate: str
+
+
+class TrainingChronicMapping(LanguageScopedMapping, ABC):
+    _WEEKS = 'weeks'
+    _MONTHS = 'months'
+    _TOTAL = 'total'
+    _STREAK = 'streak'
+    _ROLLUP_FIELDS = (_WEEKS, _MONTHS, _TOTAL, _STREAK)
+    _NON_DAILY_FIELDS = (*_ROLLUP_FIELDS, JOURNAL_OPERATIONS)
+    _DAILY_STATISTICS_PROJECTION = {ID: False} | {field: False for field in _NON_DAILY_FIELDS}
+
+    @staticmethod
+    def _week_key(date: datetime.date) -> str:
+        """ Returns:
+                ISO week, lexicographically ordered
+
+            >>> TrainingChronicMapping._week_key(datetime.date(2022, 3, 15)), TrainingChronicMapping._week_key(datetime.date(2021, 1, 2))
+            ('2022-W11', '2020-W53') """
+
+        year, week, _ = date.isocalendar()
+        return f'{year}-W{week:02d}'
+
+    @staticmethod
+    def _month_key(date: datetime.date) -> str:
+        """ >>> TrainingChronicMapping._month_key(datetime.date(2022, 3, 15))
+            '2022-03' """
+
+        return f'{date.year}-{date.month:02d}'
+
+    @classmethod
+    def _training_chronic_update(cls, trainer_shortform: str, n_faced_items: int, today: datetime.date | None = None) -> list[dict]:
+        """ Returns:
+                update pipeline incrementing the daily, weekly, monthly and total statistics and
+                advancing the streak, atomically within one write """
+
+        today = today or datetime.date.today()
+
+        def incremented(path: str) -> dict:
+            return {'$mergeObjects': [f'${path}', {trainer_shortform: {'$add': [{'$ifNull': [f'${path}.{trainer_shortform}', 0]}, n_faced_items]}}]}
+
+        week_path = f'{cls._WEEKS}.{cls._week_key(today)}'
+        month_path = f'{cls._MONTHS}.{cls._month_key(today)}'
+        return [{'$set': {
+            str(today): incremented(str(today)),
+            week_path: incremented(week_path),
+            month_path: incremented(month_path),
+            cls._TOTAL: incremented(cls._TOTAL),
+            cls._STREAK: cls._advanced_streak(today)
+        }}]
+
+    @classmethod
+    def _advanced_streak(cls, today: datetime.date) -> dict:
+        streak_length = {'$switch': {
+            'branches': [
+                {'case': {'$eq': [f'${cls._STREAK}.lastDate', str(today)]}, 'then': f'${cls._STREAK}.length'},
+                {'case': {'$eq': [f'${cls._STREAK}.lastDate', str(today - datetime.timedelta(days=1))]}, 'then': {'$add': [f'${cls._STREAK}.length', 1]}}
+            ],
+            'default': 1
+        }}
+        return {'$let': {
+            'vars': {'length': streak_length},
+            'in': {
+                'length': '$$length',
+                'longest': {'$max': [{'$ifNull': [f'${cls._STREAK}.longest', 0]}, '$$length']},
+                'lastDate': {'$literal': str(today)}
+            }
+        }}
+
+    def _ranged_statistics_pipeline(self, field: str | None, first_key: str, last_key: str) -> list[dict]:
+        """ Returns:
+                pipeline yielding the statistics of field, the daily ones if None, whose keys lie within
+                [first_key, last_key], as array of {k: key, v: {$trainer_shortform: n_faced_items}} """
+
+        return [
+            {'$match': self._language_id_filter},
+            {'$project': {ID: False, 'statistics': {'$filter': {
+                'input': {'$objectToArray': '$$ROOT' if field is None else f'${field}'},
+                'cond': {'$and': [
+                    {'$gte': ['$$this.k', first_key]},
+                    {'$lte': ['$$this.k', last_key]},
+                    {'$eq': [{'$type': '$$this.v'}, 'object']}
+                ]}
+            }}}}
+        ]
+
+    @staticmethod
+    def _ranged_statistics(documents: list[dict]) -> dict[str, dict[str, int]]:
+        return {item['k']: item['v'] for document in documents for item in document['statistics']}
+
+    @staticmethod
+    def _current_streak(streak: Streak | None, today: datetime.date | None = None) -> Streak | None:
+        """ Returns:
+                streak, whose length is 0 if neither trained today nor yesterday
+
+            >>> TrainingChronicMapping._current_streak({'length': 3, 'longest': 5, 'lastDate': '2022-03-14'}, today=datetime.date(2022, 3, 15))
+            {'length': 3, 'longest': 5, 'lastDate': '2022-03-14'}
+            >>> TrainingChronicMapping._current_streak({'length': 3, 'longest': 5, 'lastDate': '2022-03-13'}, today=datetime.date(2022, 3, 15))
+            {'length': 0, 'longest': 5, 'lastDate': '2022-03-13'} """
+
+        if streak is None:
+            return None
+        if (today or datetime.date.today()) - datetime.date.fromisoformat(streak['lastDate']) > datetime.timedelta(days=1):
+            return Streak(length=0, longest=streak['longest'], lastDate=streak['lastDate'])
+        return streak
+
+    @classmethod
+    def _rebuilt_rollups(cls, training_chronic: Mapping[str, dict[str, int] | None]) -> dict:
+        """ Returns:
+                rollup fields computed from the daily statistics of training_chronic
+
+            >>> rollups = TrainingChronicMapping._rebuilt_rollups({'2022-03-13': {'v': 2}, '2022-03-14': {'v': 1, 's': 4}, '2022-03-20': None, '2022-03-21': {'s': 1}})
+            >>> rollups['weeks'], rollups['months'], rollups['total']
+            ({'2022-W10': {'v': 2}, '2022-W11': {'v': 1, 's': 4}, '2022-W12': {'s': 1}}, {'2022-03': {'v': 3, 's': 5}}, {'v': 3, 's': 5})
+            >>> rollups['streak']
+            {'length': 1, 'longest': 2, 'lastDate': '2022-03-21'} """
+
+        rollups: dict = {cls._WEEKS: {}, cls._MONTHS: {}, cls._TOTAL: {}}
+        trained_dates: list[datetime.date] = []
+        for date_string, trainer_2_n_faced_items in sorted(training_chronic.items()):
+            if not trainer_2_n_faced_items:
+                continue
+
+            date = datetime.date.fromisoformat(date_string)
+            trained_dates.append(date)
+            for trainer_2_total in (rollups[cls._WEEKS].setdefault(cls._week_key(date), {}), rollups[cls._MONTHS].setdefault(cls._month_key(date), {}), rollups[cls._TOTAL]):
+                for trainer_shortform, n_faced_items in trainer_2_n_faced_items.items():
+                    trainer_2_total[trainer_shortform] = trainer_2_total.get(trainer_shortform, 0) + n_faced_items
+
+        if trained_dates:
+            length = longest = 1
+            for previous_date, date in zip(trained_dates, trained_dates[1:]):
+                length = length + 1 if date - previous_date == datetime.timedelta(days=1) else 1
+                longest = max(longest, length)
+            rollups[cls._STREAK] = Streak(length=length, longest=longest, lastDate=str(trained_dates[-1]))
+        return rollups
+
+    @classmethod
+    def _rollups_lacking_filter(cls, language: str) -> dict:
+        return {ID: language, cls._TOTAL: {'$exists': False}}
+
+    @classmethod
+    def _rollups_rebuild_update(cls) -> list[dict]:
+        """ Returns:
+                update pipeline computing the rollups and the streak from the daily statistics
+                server-side, the counterpart of _rebuilt_rollups, atomically within one write """
+
+        def summed_per_trainer(entries: str | dict) -> dict:
+            return {'$arrayToObject': {'$map': {
+                'input': {'$setUnion': [{'$map': {'input': entries, 'as': 'entry', 'in': '$$entry.trainer'}}]},
+                'as': 'trainer',
+                'in': {'k': '$$trainer', 'v': {'$sum': {'$map': {
+                    'input': {'$filter': {'input': entries, 'as': 'entry', 'cond': {'$eq': ['$$entry.trainer', '$$trainer']}}},
+                    'as': 'entry',
+                    'in': '$$entry.n'
+                }}}}
+            }}}
+
+        def summed_per_period(period: str) -> dict:
+            return {'$arrayToObject': {'$map': {
+                'input': {'$setUnion': [{'$map': {'input': '$_entries', 'as': 'entry', 'in': f'$$entry.{period}'}}]},
+                'as': 'period',
+                'in': {'k': '$$period', 'v': summed_per_trainer({'$filter': {'input': '$_entries', 'as': 'entry', 'cond': {'$eq': [f'$$entry.{period}', '$$period']}}})}
+            }}}
+
+        def run_length(end: str | dict) -> dict:
+            return {'$add': [{'$subtract': [end, {'$max': {'$filter': {'input': '$_runStarts', 'as': 'start', 'cond': {'$lte': ['$$start', end]}}}}]}, 1]}
+
+        # days comprising statistics, alongside their dates
+        trained_days = {'$map': {
+            'input': {'$filter': {
+                'input': {'$objectToArray': '$$ROOT'},
+                'cond': {'$and': [
+                    {'$not': [{'$in': ['$$this.k', list(cls._ROLLUP_FIELDS)]}]},
+                    {'$gt': [{'$size': {'$objectToArray': {'$cond': [{'$eq': [{'$type': '$$this.v'}, 'object']}, '$$this.v', {}]}}}, 0]}
+                ]}
+            }},
+            'in': {'k': '$$this.k', 'v': '$$this.v', 'date': {'$dateFromString': {'dateString': '$$this.k', 'format': '%Y-%m-%d'}}}
+        }}
+        # one entry per day and trainer
+        entries = {'$reduce': {
+            'input': '$_days',
+            'initialValue': [],
+            'in': {'$concatArrays': ['$$value', {'$map': {
+                'input': {'$objectToArray': '$$this.v'},
+                'as': 'trainerStatistics',
+                'in': {
+                    'week': {'$dateToString': {'format': '%G-W%V', 'date': '$$this.date'}},
+                    'month': {'$substrCP': ['$$this.k', 0, 7]},
+                    'trainer': '$$trainerStatistics.k',
+                    'n': '$$trainerStatistics.v'
+                }
+            }}]}
+        }}
+        day_numbers = {'$setUnion': [{'$map': {'input': '$_days', 'in': {'$trunc': {'$divide': [{'$toLong': '$$this.date'}, 24 * 60 * 60 * 1000]}}}}]}
+        run_starts = {'$filter': {'input': '$_dayNumbers', 'cond': {'$not': [{'$in': [{'$subtract': ['$$this', 1]}, '$_dayNumbers']}]}}}
+        run_ends = {'$filter': {'input': '$_dayNumbers', 'cond': {'$not': [{'$in': [{'$add': ['$$this', 1]}, '$_dayNumbers']}]}}}
+
+        return [
+            {'$set': {'_days': trained_days}},
+            {'$set': {'_entries': entries, '_dayNumbers': day_numbers}},
+            {'$set': {'_runStarts': run_starts}},
+            {'$set': {
+                cls._WEEKS: summed_per_period('week'),
+                cls._MONTHS: summed_per_period('month'),
+                cls._TOTAL: summed_per_trainer('$_entries'),
+                cls._STREAK: {'$cond': [
+                    {'$gt': [{'$size': '$_days'}, 0]},
+                    {
+                        'length': run_length({'$max': '$_dayNumbers'}),
+                        'longest': {'$max': {'$map': {'input': run_ends, 'as': 'end', 'in': run_length('$$end')}}},
+                        'lastDate': {'$dateToString': {'format': '%Y-%m-%d', 'date': {'$max': '$_days.date'}}}
+                    },
+                    '$$REMOVE'
+                ]}
+            }},
+            {'$unset': ['_days', '_entries', '_dayNumbers', '_runStarts']}
+        ]
+
+    def _last_session_statistics_update(self, trainer_shortform: str, n_faced_items: int) -> dict:
+        return {'$set': {'lastSession': {'trainer': trainer_shortform,
+                                         'nFacedItems': n_faced_items,
+                                         'date': str(datetime.date.today()),
+                                         'language': self.language}}}
+
+    def _session_checkpoint_field(self, trainer_shortform: str) -> str:
+        return f'sessionCheckpoints.{self.language}.{trainer_shortform}'
+
+    def _session_checkpoint(self, document: dict | None, trainer_shortform: str) -> SessionCheckpoint | None:
+        try:
+            return SessionCheckpoint.from_document(document['sessionCheckpoints'][self.language][trainer_shortform])  # type: ignore
+        except DOCUMENT_ACCESS_EXCEPTIONS:
+            return None
+
+    @staticmethod
+    def _language_placeholder_update() -> dict:
+        return {'$set': {str(datetime.date.today()): None}}
+
+
+# ---------------
+# Language Metadata
+# ---------------
+@dataclass
+class _CachedDocument:
+    document: dict
+    version: int
+    loaded_at: float
+
+
+class LanguageMetadataMapping(LanguageScopedMapping, ABC):
+    """ Cache shared by all instances, including the asyncio ones, keyed by user and document id """
+
+    _CACHE: dict[tuple[str, str], _CachedDocument] = {}
+    _PROJECTION = {ID: False, 'accent': True, 'playbackSpeed': True, 'ttsEnabled': True, 'referenceLanguage': True, 'version': True}
+    _VERSION_PROJECTION = {ID: False, 'version': True}
+    _ENGLISH_TRAINING_ID = 'englishTraining'
+
+    _cache_ttl: float | None
+    _version_validated: bool
+    _validated_document_ids: set[str]
+
+    @property
+    @abstractmethod
+    def user(self) -> str:
+        """ User of the owning database """
+
+    def _fresh_cached_document(self, document_id: str) -> _CachedDocument | None:
+        """ Returns:
+                cached document if existent and not expired """
+
+        if (cached_document := self._CACHE.get((self.user, document_id))) is None:
+            return None
+        if self._cache_ttl is not None and time.monotonic() - cached_document.loaded_at > self._cache_ttl:
+            return None
+        return cached_document
+
+    def _requires_version_validation(self, document_id: str) -> bool:
+        return self._version_validated and document_id not in self._validated_document_ids
+
+    @staticmethod
+    def _version_matches(cached_document: _CachedDocument, version_document: dict | None) -> bool:
+        return (version_document or {}).get('version', 0) == cached_document.version
+
+    def _cache(self, document_id: str, document: dict | None) -> dict:
+        document = document or {}
+        self._CACHE[(self.user, document_id)] = _CachedDocument(document, document.get('version', 0), time.monotonic())
+        self._validated_document_ids.add(document_id)
+        return document
+
+    def _uncache(self, document_id: str):
+        self._CACHE.pop((self.user, document_id), None)
+
+    def _uncache_language_document(self):
+        self._uncache(self.language)
+
+    @staticmethod
+    def _upsert_update(fields: dict) -> dict:
+        return {'$set': fields, '$inc': {'version': 1}}
+
+    @staticmethod
+    def _playback_speed(document: dict, accent: str) -> float | None:
+        return document.get('playbackSpeed', {}).get(accent)
+
+
+# ---------------
+# Credentials
+# ---------------
+class CredentialsMapping:
+    _EMAIL_ADDRESS_INDEX = [('emailAddress', ASCENDING)]
+    _PASSWORD_PROJECTION = {ID: False, 'password': True}
+    _EMAIL_ADDRESS_PROJECTION = {ID: False, 'emailAddress': True}
+
+    @staticmethod
+    def _credentials_document(username: str, email_address: str, password: str) -> dict:
+        return {
+            ID: username,
+            'emailAddress': email_address,
+            'password': password
+        }
+
+    @staticmethod
+    def _legacy_credentials_upsert(username: str, legacy_credentials_document: dict) -> dict:
+        return {
+            'filter': {ID: username},
+            'update': {'$setOnInsert': {'emailAddress': legacy_credentials_document['emailAddress'], 'password': legacy_credentials_document['password']}},
+            'upsert': True
+        }
@@ -1,6 +1,9 @@
 ID = '_id'
 UNIQUE_ID_FILTER = {ID: 'unique'}
 
+# ids of the latest journal operations having been replayed onto a document, see journal.JournalOperation
+JOURNAL_OPERATIONS = 'journalOperations'
+
 
 def id_popped(document: dict) -> dict:
     document.pop(ID)
@@ -0,0 +1,3 @@
+from .mongo_client import AsyncClient
+from .user_database import AsyncUserDatabase
+from .credentials_database import AsyncCredentialsDatabase
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import logging
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError
+
+from backend.src.database._mapping import CredentialsMapping
+from backend.src.database._utils import ID, UNIQUE_ID_FILTER
+from backend.src.database.aio.extended_collection import AsyncExtendedCollection
+from backend.src.database.aio.extended_database import AsyncExtendedDatabase
+
+
+class AsyncCredentialsDatabase(AsyncExtendedDatabase, CredentialsMapping):
+    """ Asyncio counterpart of CredentialsDatabase """
+
+    def __init__(self, client: AsyncIOMotorClient):
+        super().__init__(client, name='CREDENTIALS')
+
+        self.user_registry_collection = AsyncUserRegistryCollection(self)
+        self._migrated = False
+
+    async def usernames(self) -> list[str]:
+        await self._ensure_migrated()
+        return await self.user_registry_collection._ids()
+
+    async def username_taken(self, username: str) -> bool:
+        return await self._registered(filter={ID: username})
+
+    async def initialize_user(self, username: str, email_address: str, password: str):
+        """ Raises:
+                pymongo.errors.DuplicateKeyError: if username or email_address already taken """
+
+        await self._ensure_migrated()
+        await self.user_registry_collection.ensure_indexes()
+        await self.user_registry_collection.insert_one(self._credentials_document(username, email_address, password))
+
+    async def remove_user(self, username: str):
+        await self.client.drop_database(username)
+        await self.user_registry_collection.delete_one(filter={ID: username})
+
+    async def query_password(self, username: str) -> str:
+        if (credentials_document := await self.user_registry_collection.find_one(filter={ID: username}, projection=self._PASSWORD_PROJECTION)) is None and await self._ensure_migrated():
+            credentials_document = await self.user_registry_collection.find_one(filter={ID: username}, projection=self._PASSWORD_PROJECTION)
+        return credentials_document['password']
+
+    async def mail_address_taken(self, mail_address: str) -> bool:
+        return await self._registered(filter={'emailAddress': mail_address})
+
+    async def mail_addresses(self) -> list[str]:
+        await self._ensure_migrated()
+        return [document['emailAddress'] async for document in self.user_registry_collection.find(projection=self._EMAIL_ADDRESS_PROJECTION)]
+
+    async def _registered(self, filter: dict) -> bool:
+        async def registered() -> bool:
+            return await self.user_registry_collection.find_one(filter=filter, projection={ID: True}) is not None
+
+        return await registered() or (await self._ensure_migrated() and await registered())
+
+    async def migrate_user_collections(self) -> list[str]:
+        await self.user_registry_collection.ensure_indexes()
+        conflicting_usernames = []
+        for name in await self.list_collection_names():
+            if name == self.user_registry_collection.name:
+                continue
+
+            if (legacy_credentials_document := await self[name].find_one(filter=UNIQUE_ID_FILTER)) is not None:
+                try:
+                    await self.user_registry_collection.update_one(**self._legacy_credentials_upsert(name, legacy_credentials_document))
+                except DuplicateKeyError:
+                    conflicting_usernames.append(name)
+                    continue
+            await self.drop_collection(name)
+
+        if conflicting_usernames:
+            logging.error(f'Failed to migrate the credentials of {conflicting_usernames}, their email addresses being registered for other users')
+        self._migrated = True
+        return conflicting_usernames
+
+    async def _ensure_migrated(self) -> bool:
+        if self._migrated:
+            return False
+        await self.migrate_user_collections()
+        return True
+
+
+class AsyncUserRegistryCollection(AsyncExtendedCollection, CredentialsMapping):
+    """ Asyncio counterpart of UserRegistryCollection """
+
+    async def ensure_indexes(self):
+        await self.create_index(self._EMAIL_ADDRESS_INDEX, unique=True)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from abc import ABC
+from typing import Any
+
+from backend.src.database._utils import ID
+from backend.src.database.aio.extended_database import AsyncExtendedDatabase
+from backend.src.utils.strings.splitting import split_at_uppercase
+
+
+class AsyncExtendedCollection(ABC):
+    """ Asyncio counterpart of ExtendedCollection, delegating the database operations, which
+        return awaitables, to the motor collection of the name of the synchronous counterpart """
+
+    def __init__(self, database: AsyncExtendedDatabase):
+        self.database = database
+
+        self._collection = database[self._name()]
+
+    def _name(self) -> str:
+        """ Returns:
+                class name without leading 'Async' and trailing 'Collection', converted to snake case """
+
+        return '_'.join(
+            map(
+                lambda token: token.lower(),
+                split_at_uppercase(self.__class__.__name__)[1:-1]
+            )
+        )
+
+    @property
+    def name(self) -> str:
+        return self._collection.name
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._collection, name)
+
+    async def _ids(self) -> list:
+        return await self._collection.distinct(ID)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from abc import ABC
+from typing import AsyncIterator
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+
+
+class AsyncExtendedDatabase(ABC):
+    """ Asyncio counterpart of ExtendedDatabase, wrapping the motor database of the passed client """
+
+    def __init__(self, client: AsyncIOMotorClient, name: str):
+        self.client = client
+        self.name = name
+
+        self._database = client[name]
+
+    def __getitem__(self, name: str) -> AsyncIOMotorCollection:
+        return self._database[name]
+
+    async def list_collection_names(self) -> list[str]:
+        return await self._database.list_collection_names()
+
+    async def drop_collection(self, name: str):
+        await self._database.drop_collection(name)
+
+    async def collections(self) -> AsyncIterator[AsyncIOMotorCollection]:
+        for name in await self.list_collection_names():
+            yield self[name]
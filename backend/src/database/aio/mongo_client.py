@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from backend.src.database.connection_pool import PoolMonitor, PoolOptions, PoolStatistics
+from backend.src.database.mongo_client import Client
+
+
+class AsyncClient(AsyncIOMotorClient):
+    """ Asyncio counterpart of Client, connecting to the same endpoint, which, rather than being a
+        MonoState, is to be shared by passing it to the asyncio database constructors """
+
+    def __init__(self, server_selection_timeout: int, pool_options: PoolOptions = PoolOptions()):
+        pool_monitor = PoolMonitor()
+        super().__init__(
+            host=Client._client_endpoint(),
+            serverSelectionTimeoutMS=server_selection_timeout,
+            event_listeners=[pool_monitor],
+            **pool_options.client_kwargs()
+        )
+
+        self.pool_monitor = pool_monitor
+        self.pool_options = pool_options
+
+    async def assert_connection(self):
+        """ Triggers errors.ServerSelectionTimeoutError in case of its
+            foundation being present """
+
+        await self.server_info()
+
+    @property
+    def pool_statistics(self) -> PoolStatistics:
+        return self.pool_monitor.statistics
+
+    def healthy(self) -> bool:
+        """ Returns:
+                whether a writable server is known to be reachable, without a round trip """
+
+        return self.delegate.topology_description.has_writable_server()
@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+from abc import ABC
+import asyncio
+import datetime
+from typing import AsyncIterator, Iterable
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
+
+from backend.src.database._mapping import (
+    DOCUMENT_ACCESS_EXCEPTIONS,
+    LanguageMetadataMapping,
+    LanguageScopedMapping,
+    ParaphraseIndexMapping,
+    Streak,
+    TrainingChronicMapping,
+    VocableScheduleMapping,
+    VocabularyChanges,
+    VocabularyMapping
+)
+from backend.src.database._utils import ID, UNIQUE_ID_FILTER
+from backend.src.database.aio.extended_collection import AsyncExtendedCollection
+from backend.src.database.aio.extended_database import AsyncExtendedDatabase
+from backend.src.database.user_database import LastSessionStatistics, TrainingChronic
+from backend.src.types.session_checkpoint import SessionCheckpoint
+from backend.src.types.vocable_entry import BaseVocableEntry, the_stripped_meaning, VocableEntries
+
+
+class AsyncUserDatabase(AsyncExtendedDatabase):
+    """ Asyncio counterpart of UserDatabase, sharing the document mapping of its collections
+
+        Rather than being a MonoState, it is to be instantiated per session, sharing the passed
+        client, whereby a single event loop may serve the sessions of many users concurrently.
+        Entry updates are written immediately rather than by means of a write-behind buffer,
+        as not blocking the event loop """
+
+    def __init__(self, client: AsyncIOMotorClient, user: str, language: str = str()):
+        super().__init__(client, name=user)
+
+        self.language = language
+
+        self.vocabulary_collection = AsyncVocabularyCollection(self)
+        self.training_chronic_collection = AsyncTrainingChronicCollection(self)
+        self.language_metadata_collection = AsyncLanguageMetadataCollection(self)
+        self.vocable_schedule_collection = AsyncVocableScheduleCollection(self)
+        self.paraphrase_index_collection = AsyncParaphraseIndexCollection(self)
+
+        self._collections: list[_AsyncUserCollection] = [
+            self.vocabulary_collection,
+            self.training_chronic_collection,
+            self.language_metadata_collection,
+            self.vocable_schedule_collection,
+            self.paraphrase_index_collection
+        ]
+
+    @property
+    def user(self) -> str:
+        return self.name
+
+    async def remove_language_related_documents(self):
+        await asyncio.gather(*(collection.remove_language_related_documents() for collection in self._collections))
+
+
+class _AsyncUserCollection(AsyncExtendedCollection, LanguageScopedMapping, ABC):
+    def __init__(self, database: AsyncUserDatabase):
+        super().__init__(database=database)
+
+        self._user_database = database
+
+    @property
+    def language(self) -> str:
+        return self._user_database.language
+
+    @property
+    def user(self) -> str:
+        return self._user_database.user
+
+    async def remove_language_related_documents(self):
+        await self.delete_one(filter=self._language_id_filter)
+
+
+class AsyncVocabularyCollection(_AsyncUserCollection, VocabularyMapping):
+    """ Asyncio counterpart of VocabularyCollection """
+
+    def __init__(self, database: AsyncUserDatabase):
+        super().__init__(database)
+
+        self._indexes_ensured = False
+        self._migrated_languages: set[str] = set()
+
+    async def vocabulary_possessing_languages(self) -> set[str]:
+        languages, legacy_document_languages = await asyncio.gather(
+            self.distinct('language'),
+            self.distinct(ID, filter=self._LEGACY_DOCUMENT_FILTER)
+        )
+        return set(languages) | set(legacy_document_languages)
+
+    async def entries(self) -> VocableEntries:
+        return VocableEntries.concatenated([page async for page in self.query_entries()])
+
+    # ---------------
+    # Queries
+    # ---------------
+    async def vocables(self) -> list[str]:
+        await self._ensure_migrated()
+        return [document['vocable'] async for document in self.find(self._language_filter, projection={ID: False, 'vocable': True})]
+
+    async def query_entries(self, vocables: Iterable[str] | None = None, due_only=False, today: int | None = None, page_size: int = VocabularyMapping._QUERY_PAGE_SIZE) -> AsyncIterator[VocableEntries]:
+        """ Yields:
+                non-empty pages of up to page_size entries, see VocabularyCollection.query_entries """
+
+        await self._ensure_migrated()
+
+        cursor = self.find(self._entries_query(vocables, due_only, today), projection=self._ENTRY_PROJECTION, batch_size=page_size)
+        while page_documents := await cursor.to_list(length=page_size):
+            yield self._to_entries(page_documents)
+
+    # ---------------
+    # Legacy Layout Migration
+    # ---------------
+    async def migrate_language_documents(self):
+        await self._ensure_indexes()
+        for language_document in await self.find(self._LEGACY_DOCUMENT_FILTER).to_list(length=None):
+            await self._migrate(language_document)
+            self._migrated_languages.add(language_document[ID])
+
+    async def migrate_last_faced_dates(self):
+        await self.migrate_language_documents()
+
+    async def _ensure_migrated(self):
+        if self.language not in self._migrated_languages:
+            await self._ensure_indexes()
+            if (language_document := await self.find_one({ID: self.language})) is not None:
+                await self._migrate(language_document)
+            self._migrated_languages.add(self.language)
+
+    async def _ensure_indexes(self):
+        if not self._indexes_ensured:
+            for keys, options in self._INDEXES:
+                await self.create_index(keys, **options)
+            self._indexes_ensured = True
+
+    async def _migrate(self, language_document: dict):
+        if upserts := self._migration_upserts(language_document):
+            await self.bulk_write(upserts, ordered=False)
+        await self.delete_one({ID: language_document[ID]})
+
+    # ---------------
+    # Entry Manipulation
+    # ---------------
+    async def remove_language_related_documents(self):
+        await self.delete_many(filter=self._language_filter)
+        await self.delete_one(filter=self._language_id_filter)
+        # schedule outdated by the removal, which isn't recorded as vocabulary changes
+        await self._user_database.vocable_schedule_collection.remove_language_related_documents()
+
+    async def upsert_entry(self, entry: BaseVocableEntry):
+        await self._ensure_indexes()
+        previous_document = await self.find_one_and_update(
+            filter=self._entry_filter(entry.vocable),
+            update={'$set': self._entry_2_document(entry)},
+            projection={ID: False, 't': True},
+            upsert=True
+        )
+
+        if previous_document is None:
+            await self._user_database.vocable_schedule_collection.record_added(entry.vocable)
+
+        if (previous_translation := self._translation(previous_document)) != entry.translation:
+            if previous_translation is not None:
+                await self._paraphrase_index_collection.remove(entry.vocable, the_stripped_meaning(previous_translation))
+            await self._paraphrase_index_collection.add(entry.vocable, entry.the_stripped_meaning)
+
+    async def delete_entry(self, entry: BaseVocableEntry):
+        await self.delete_one(filter=self._entry_filter(entry.vocable))
+        await self._user_database.vocable_schedule_collection.record_deleted(entry.vocable)
+        await self._paraphrase_index_collection.remove(entry.vocable, entry.the_stripped_meaning)
+
+    async def update_entry(self, vocable: str, new_score: float):
+        await self.update_one(
+            filter=self._entry_filter(vocable),
+            update=self._entry_update(new_score)
+        )
+
+    async def alter_entry(self, old_vocable: str, altered_vocable_entry: BaseVocableEntry):
+        previous_document = await self.find_one_and_delete(
+            filter=self._entry_filter(old_vocable),
+            projection={ID: False, 't': True}
+        )
+        if previous_document is not None:
+            await self._user_database.vocable_schedule_collection.record_deleted(old_vocable)
+        if (previous_translation := self._translation(previous_document)) is not None:
+            await self._paraphrase_index_collection.remove(old_vocable, the_stripped_meaning(previous_translation))
+
+        await self.upsert_entry(altered_vocable_entry)
+
+    @property
+    def _paraphrase_index_collection(self) -> AsyncParaphraseIndexCollection:
+        return self._user_database.paraphrase_index_collection
+
+
+class AsyncVocableScheduleCollection(_AsyncUserCollection, VocableScheduleMapping):
+    """ Asyncio counterpart of VocableScheduleCollection """
+
+    async def upsert_schedule(self, schedule_document: dict[str, list], reconciled_changes: VocabularyChanges | None = None):
+        await self.update_one(
+            filter=self._language_id_filter,
+            update=self._schedule_update(schedule_document, reconciled_changes or VocabularyChanges()),
+            upsert=True
+        )
+
+    async def schedule(self) -> dict[str, list] | None:
+        return (await self.schedule_and_vocabulary_changes())[0]
+
+    async def schedule_and_vocabulary_changes(self) -> tuple[dict[str, list] | None, VocabularyChanges]:
+        document = await self.find_one(filter=self._language_id_filter)
+        return (document or {}).get('schedule'), VocabularyChanges.from_document(document)
+
+    async def record_added(self, vocable: str):
+        await self.update_one(filter=self._language_id_filter, update=self._vocable_added_update(vocable), upsert=True)
+
+    async def record_deleted(self, vocable: str):
+        await self.update_one(filter=self._language_id_filter, update=self._vocable_deleted_update(vocable), upsert=True)
+
+
+class AsyncParaphraseIndexCollection(_AsyncUserCollection, ParaphraseIndexMapping):
+    """ Asyncio counterpart of ParaphraseIndexCollection """
+
+    async def remove_language_related_documents(self):
+        await self.delete_many(filter=self._language_filter)
+
+    async def add(self, vocable: str, meaning: str):
+        await self.update_one(
+            filter=self._meaning_filter(meaning),
+            update={'$addToSet': {'vocables': vocable}},
+            upsert=True
+        )
+
+    async def remove(self, vocable: str, meaning: str):
+        await self.update_one(
+            filter=self._meaning_filter(meaning),
+            update={'$pull': {'vocables': vocable}}
+        )
+        await self.delete_one(filter=self._meaning_filter(meaning) | {'vocables': {'$size': 0}})
+
+    async def paraphrases(self) -> dict[str, list[str]]:
+        if await self.find_one(filter=self._built_marker_filter) is None:
+            await self._build()
+        return self._paraphrases(await self.find(filter=self._paraphrases_filter, projection=self._PARAPHRASES_PROJECTION).to_list(length=None))
+
+    async def _build(self):
+        paraphrase_index_documents = self._paraphrase_index_documents(await self._user_database.vocabulary_collection.entries())
+
+        await self.create_index(self._INDEX, unique=True)
+        await self.bulk_write(self._build_requests(paraphrase_index_documents), ordered=False)
+
+
+class AsyncTrainingChronicCollection(_AsyncUserCollection, TrainingChronicMapping):
+    """ Asyncio counterpart of TrainingChronicCollection """
+
+    async def upsert_session_statistics(self, trainer_shortform: str, n_faced_items: int):
+        await self.bulk_write(
+            [
+                UpdateOne(self._language_id_filter, self._training_chronic_update(trainer_shortform, n_faced_items), upsert=True),
+                UpdateOne(UNIQUE_ID_FILTER, self._last_session_statistics_update(trainer_shortform, n_faced_items), upsert=True)
+            ],
+            ordered=False
+        )
+
+    async def last_session_statistics(self) -> LastSessionStatistics | None:
+        try:
+            return (await self.find_one(UNIQUE_ID_FILTER))['lastSession']
+        except DOCUMENT_ACCESS_EXCEPTIONS:
+            return None
+
+    # ------------------
+    # Session Checkpoints
+    # ------------------
+    async def upsert_session_checkpoint(self, trainer_shortform: str, checkpoint: SessionCheckpoint):
+        await self.update_one(
+            filter=UNIQUE_ID_FILTER,
+            update={'$set': {self._session_checkpoint_field(trainer_shortform): checkpoint.to_document()}},
+            upsert=True
+        )
+
+    async def session_checkpoint(self, trainer_shortform: str) -> SessionCheckpoint | None:
+        document = await self.find_one(UNIQUE_ID_FILTER, projection={self._session_checkpoint_field(trainer_shortform): True})
+        return self._session_checkpoint(document, trainer_shortform)
+
+    async def delete_session_checkpoint(self, trainer_shortform: str):
+        await self.update_one(
+            filter=UNIQUE_ID_FILTER,
+            update={'$unset': {self._session_checkpoint_field(trainer_shortform): 1}}
+        )
+
+    async def upsert_language_placeholder_document(self, language: str):
+        await self.update_one(
+            filter={ID: language},
+            update=self._language_placeholder_update(),
+            upsert=True
+        )
+
+    async def comprised_languages(self) -> set[str]:
+        return set(await self._ids()) - {'unique'}
+
+    async def training_chronic(self) -> TrainingChronic | None:
+        if (document := await self.find_one(self._language_id_filter, projection=self._DAILY_STATISTICS_PROJECTION)) is None:
+            return None
+        return TrainingChronic(document)
+
+    # ------------------
+    # Rollups
+    # ------------------
+    async def daily_statistics(self, first_date: datetime.date, last_date: datetime.date) -> TrainingChronic:
+        return self._ranged_statistics(await self.aggregate(self._ranged_statistics_pipeline(None, str(first_date), str(last_date))).to_list(length=None))
+
+    async def weekly_statistics(self, first_date: datetime.date, last_date: datetime.date) -> TrainingChronic:
+        return self._ranged_statistics(await self.aggregate(self._ranged_statistics_pipeline(self._WEEKS, self._week_key(first_date), self._week_key(last_date))).to_list(length=None))
+
+    async def monthly_statistics(self, first_date: datetime.date, last_date: datetime.date) -> TrainingChronic:
+        return self._ranged_statistics(await self.aggregate(self._ranged_statistics_pipeline(self._MONTHS, self._month_key(first_date), self._month_key(last_date))).to_list(length=None))
+
+    async def total_statistics(self) -> dict[str, int]:
+        if (document := await self.find_one(self._language_id_filter, projection={ID: False, self._TOTAL: True})) is None:
+            return {}
+        return document.get(self._TOTAL, {})
+
+    async def streak(self, today: datetime.date | None = None) -> Streak | None:
+        document = await self.find_one(self._language_id_filter, projection={ID: False, self._STREAK: True})
+        return self._current_streak((document or {}).get(self._STREAK), today)
+
+
+class AsyncLanguageMetadataCollection(_AsyncUserCollection, LanguageMetadataMapping):
+    """ Asyncio counterpart of LanguageMetadataCollection, sharing its cache """
+
+    def __init__(self, database: AsyncUserDatabase, cache_ttl: float | None = None, version_validated=False):
+        super().__init__(database)
+
+        self._cache_ttl = cache_ttl
+        self._version_validated = version_validated
+        self._validated_document_ids: set[str] = set()
+
+    async def _cached_document(self, document_id: str) -> dict:
+        cached_document = self._fresh_cached_document(document_id)
+
+        if cached_document is not None and self._requires_version_validation(document_id):
+            if not self._version_matches(cached_document, await self.find_one(filter={ID: document_id}, projection=self._VERSION_PROJECTION)):
+                cached_document = None
+
+        if cached_document is None:
+            return self._cache(document_id, await self.find_one(filter={ID: document_id}, projection=self._PROJECTION))
+        self._validated_document_ids.add(document_id)
+        return cached_document.document
+
+    async def _upsert(self, document_id: str, fields: dict):
+        self._cache(
+            document_id,
+            await self.find_one_and_update(
+                filter={ID: document_id},
+                update=self._upsert_update(fields),
+                projection=self._PROJECTION,
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        )
+
+    async def remove_language_related_documents(self):
+        await super().remove_language_related_documents()
+        self._uncache_language_document()
+
+    # ------------------
+    # Accent
+    # ------------------
+    async def upsert_accent(self, accent: str):
+        await self._upsert(self.language, {'accent': accent})
+
+    async def query_accent(self) -> str | None:
+        return (await self._cached_document(self.language)).get('accent')
+
+    # ------------------
+    # Playback Speed
+    # ------------------
+    async def upsert_playback_speed(self, accent: str, playback_speed: float):
+        await self._upsert(self.language, {f'playbackSpeed.{accent}': playback_speed})
+
+    async def query_playback_speed(self, accent: str) -> float | None:
+        return self._playback_speed(await self._cached_document(self.language), accent)
+
+    # ------------------
+    # Enablement
+    # ------------------
+    async def upsert_tts_enablement(self, value: bool):
+        await self._upsert(self.language, {'ttsEnabled': value})
+
+    async def query_tts_enablement(self) -> bool | None:
+        return (await self._cached_document(self.language)).get('ttsEnabled')
+
+    # ------------------
+    # English Training
+    # ------------------
+    async def upsert_reference_language(self, reference_language: str):
+        await self._upsert(self._ENGLISH_TRAINING_ID, {'referenceLanguage': reference_language})
+
+    async def query_reference_language(self) -> str | None:
+        return (await self._cached_document(self._ENGLISH_TRAINING_ID)).get('referenceLanguage')
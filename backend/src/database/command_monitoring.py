@@ -0,0 +1,362 @@
+""" Per-collection, per-operation and per-calling-method command latencies, BSON sizes and
+    failures, recorded by means of the pymongo command monitoring, and exported to pluggable sinks """
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+import copy
+from dataclasses import dataclass, field
+from functools import wraps
+import inspect
+import logging
+import os
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Callable, Iterator, NamedTuple, Sequence, TypeVar
+
+import bson
+from pymongo import monitoring
+
+from backend.src.database.connection_pool import PoolStatistics
+from backend.src.utils.io import PathLike
+
+
+# ---------------
+# Caller Tagging
+# ---------------
+_caller: ContextVar[str] = ContextVar('database_caller', default=str())
+
+_Method = TypeVar('_Method', bound=Callable)
+
+
+@contextmanager
+def _tag(tag: str) -> Iterator[None]:
+    """ Tags the commands issued within the context with tag, unless already tagged """
+
+    if _caller.get():
+        yield
+        return
+
+    token = _caller.set(tag)
+    try:
+        yield
+    finally:
+        _caller.reset(token)
+
+
+def tagged(method: _Method) -> _Method:
+    """ Decorator tagging the commands issued by method with '$class_name.$method_name',
+        unless issued within another tagged method, whose tag is retained
+
+        Generator functions are tagged around each resumption, as their commands are issued
+        whilst being iterated by the caller, rather than upon being called """
+
+    if inspect.isgeneratorfunction(method):
+        @wraps(method)
+        def generator_wrapper(self, *args, **kwargs):
+            tag = f'{type(self).__name__}.{method.__name__}'
+            generator = method(self, *args, **kwargs)
+            try:
+                while True:
+                    with _tag(tag):
+                        try:
+                            item = next(generator)
+                        except StopIteration as stop:
+                            return stop.value
+                    yield item
+            finally:
+                with _tag(tag):
+                    generator.close()
+
+        return generator_wrapper  # type: ignore[return-value]
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with _tag(f'{type(self).__name__}.{method.__name__}'):
+            return method(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def tag_public_methods(cls: type):
+    """ Applies tagged to the public synchronous functions defined by cls """
+
+    for name, attribute in list(vars(cls).items()):
+        if not name.startswith('_') and inspect.isfunction(attribute) and not inspect.iscoroutinefunction(attribute) and not inspect.isasyncgenfunction(attribute):
+            setattr(cls, name, tagged(attribute))
+
+
+# ---------------
+# Metrics
+# ---------------
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class CommandKey(NamedTuple):
+    collection: str
+    operation: str
+    caller: str
+
+
+@dataclass
+class CommandMetrics:
+    """ latency_bucket_counts: commands per latency bucket, the last one comprising the ones
+            exceeding the largest upper bound of LATENCY_BUCKETS
+        n_size_samples: commands whose request and reply sizes have been sampled """
+
+    latency_bucket_counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    total_latency: float = 0.0
+    n_failures: int = 0
+    n_size_samples: int = 0
+    total_request_bytes: int = 0
+    total_reply_bytes: int = 0
+
+    @property
+    def n_commands(self) -> int:
+        return sum(self.latency_bucket_counts)
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.n_commands if self.n_commands else 0.0
+
+    def latency_quantile(self, q: float) -> float:
+        """ Returns:
+                upper bound of the bucket comprising the q-quantile, inf if exceeding the largest one
+
+            >>> metrics = CommandMetrics()
+            >>> for latency in (0.0002, 0.003, 0.004, 0.2):
+            ...     metrics.record(latency, failed=False)
+            >>> metrics.latency_quantile(0.5), metrics.latency_quantile(0.99)
+            (0.005, 0.25) """
+
+        rank = q * self.n_commands
+        n_cumulative = 0
+        for upper_bound, count in zip(LATENCY_BUCKETS + (float('inf'),), self.latency_bucket_counts):
+            n_cumulative += count
+            if n_cumulative >= rank:
+                return upper_bound
+        return float('inf')
+
+    def record(self, latency: float, failed: bool):
+        self.latency_bucket_counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.total_latency += latency
+        self.n_failures += failed
+
+
+@dataclass
+class MetricsSnapshot:
+    commands: dict[CommandKey, CommandMetrics]
+    pool_statistics: PoolStatistics | None = None
+
+
+# ---------------
+# Sinks
+# ---------------
+class MetricsSink(ABC):
+    @abstractmethod
+    def export(self, snapshot: MetricsSnapshot):
+        """ Receives the cumulative metrics since the instantiation of the monitor """
+
+
+class InMemorySink(MetricsSink):
+    def __init__(self):
+        self.snapshot: MetricsSnapshot | None = None
+
+    def export(self, snapshot: MetricsSnapshot):
+        self.snapshot = snapshot
+
+
+class LogSink(MetricsSink):
+    """ Logs one line per command key """
+
+    def __init__(self, logger: logging.Logger = logging.getLogger('default'), level: int = logging.INFO):
+        self._logger = logger
+        self._level = level
+
+    def export(self, snapshot: MetricsSnapshot):
+        for key, metrics in sorted(snapshot.commands.items()):
+            self._logger.log(
+                self._level,
+                f'{key.caller or "untagged"} {key.collection}.{key.operation}: '
+                f'n={metrics.n_commands}, failures={metrics.n_failures}, '
+                f'mean={metrics.mean_latency * 1e3:.2f}ms, p99<={metrics.latency_quantile(0.99) * 1e3:.1f}ms'
+            )
+
+
+class PrometheusTextFileSink(MetricsSink):
+    """ Writes the metrics in the Prometheus text exposition format to file_path, to be
+        collected by e.g. the textfile collector of the node exporter
+
+        The file is replaced atomically, in order for collectors not to read partial writes """
+
+    def __init__(self, file_path: PathLike):
+        self._file_path = Path(file_path)
+
+    def export(self, snapshot: MetricsSnapshot):
+        temporary_file_path = self._file_path.with_name(f'.{self._file_path.name}.tmp')
+        temporary_file_path.write_text(prometheus_text(snapshot), encoding='utf-8')
+        os.replace(temporary_file_path, self._file_path)
+
+
+def prometheus_text(snapshot: MetricsSnapshot) -> str:
+    """ >>> metrics = CommandMetrics()
+        >>> metrics.record(0.002, failed=False)
+        >>> lines = prometheus_text(MetricsSnapshot({CommandKey('vocabulary', 'find', 'VocabularyCollection.entries'): metrics})).splitlines()
+        >>> lines[2], lines[3]
+        ('mongodb_command_duration_seconds_bucket{collection="vocabulary",operation="find",caller="VocabularyCollection.entries",le="0.001"} 0', 'mongodb_command_duration_seconds_bucket{collection="vocabulary",operation="find",caller="VocabularyCollection.entries",le="0.0025"} 1') """
+
+    lines = ['# TYPE mongodb_command_duration_seconds histogram']
+    for key, metrics in snapshot.commands.items():
+        labels = _prometheus_labels(key)
+        n_cumulative = 0
+        for upper_bound, count in zip(LATENCY_BUCKETS + (float('inf'),), metrics.latency_bucket_counts):
+            n_cumulative += count
+            lines.append(f'mongodb_command_duration_seconds_bucket{{{labels},le="{"+Inf" if upper_bound == float("inf") else upper_bound}"}} {n_cumulative}')
+        lines.append(f'mongodb_command_duration_seconds_sum{{{labels}}} {metrics.total_latency}')
+        lines.append(f'mongodb_command_duration_seconds_count{{{labels}}} {metrics.n_commands}')
+
+    for name, metric_type, value_of in (
+        ('mongodb_command_failures_total', 'counter', lambda metrics: metrics.n_failures),
+        ('mongodb_command_size_samples_total', 'counter', lambda metrics: metrics.n_size_samples),
+        ('mongodb_command_request_bytes_sampled_total', 'counter', lambda metrics: metrics.total_request_bytes),
+        ('mongodb_command_reply_bytes_sampled_total', 'counter', lambda metrics: metrics.total_reply_bytes)
+    ):
+        lines.append(f'# TYPE {name} {metric_type}')
+        lines.extend(f'{name}{{{_prometheus_labels(key)}}} {value_of(metrics)}' for key, metrics in snapshot.commands.items())
+
+    if (pool_statistics := snapshot.pool_statistics) is not None:
+        for name, value in (
+            ('mongodb_pool_open_connections', pool_statistics.n_open_connections),
+            ('mongodb_pool_checked_out_connections', pool_statistics.n_checked_out),
+            ('mongodb_pool_wait_queue_length', pool_statistics.n_waiting),
+            ('mongodb_pool_max_wait_queue_length', pool_statistics.max_n_waiting),
+            ('mongodb_pool_checkout_latency_p50_seconds', pool_statistics.checkout_latency_quantile(0.5)),
+            ('mongodb_pool_checkout_latency_p99_seconds', pool_statistics.checkout_latency_quantile(0.99))
+        ):
+            lines.extend((f'# TYPE {name} gauge', f'{name} {value}'))
+
+    return '\n'.join(lines) + '\n'
+
+
+def _prometheus_labels(key: CommandKey) -> str:
+    return ','.join(f'{name}="{_escaped_label_value(value)}"' for name, value in key._asdict().items())
+
+
+def _escaped_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# ---------------
+# Monitor
+# ---------------
+@dataclass
+class _StartedCommand:
+    key: CommandKey
+    request_bytes: int | None
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """ Records the CommandMetrics of the commands of the client it has been passed to as event listener,
+        keyed by collection, operation and the tag of the calling method, thus not by user database,
+        in order to bound their number
+
+        Recording amounts to a dictionary lookup and a bucket increment per command, the BSON encoding
+        required for the request and reply sizes being solely conducted for every size_sampling_interval-th
+        command; the commands are tagged in the thread issuing them, asyncio ones thus remaining untagged
+
+        Args:
+            sinks: to be exported to every export_interval seconds by a daemon thread, as well as upon close
+            pool_statistics: to be exported alongside the command metrics """
+
+    def __init__(
+            self,
+            sinks: Sequence[MetricsSink] = (),
+            export_interval: float = 60.0,
+            size_sampling_interval: int = 16,
+            pool_statistics: PoolStatistics | None = None):
+
+        self._sinks = list(sinks)
+        self._export_interval = export_interval
+        self._size_sampling_interval = size_sampling_interval
+        self.pool_statistics = pool_statistics
+
+        self._key_2_metrics: dict[CommandKey, CommandMetrics] = {}
+        self._request_id_2_started_command: dict[int, _StartedCommand] = {}
+        self._n_started = 0
+        self._lock = Lock()
+
+        self._closed = Event()
+        if self._sinks:
+            Thread(target=self._export_periodically, daemon=True).start()
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        collection = event.command.get(event.command_name)
+        if event.command_name == 'getMore':
+            collection = event.command.get('collection')
+
+        with self._lock:
+            self._n_started += 1
+            sampled = not self._n_started % self._size_sampling_interval
+
+        self._request_id_2_started_command[event.request_id] = _StartedCommand(
+            key=CommandKey(collection if isinstance(collection, str) else str(), event.command_name, _caller.get()),
+            request_bytes=len(bson.encode(event.command)) if sampled else None
+        )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        if (started_command := self._request_id_2_started_command.pop(event.request_id, None)) is None:
+            return
+
+        reply_bytes = len(bson.encode(event.reply)) if started_command.request_bytes is not None else 0
+        with self._lock:
+            metrics = self._metrics(started_command.key)
+            metrics.record(event.duration_micros / 1e6, failed=False)
+            if started_command.request_bytes is not None:
+                metrics.n_size_samples += 1
+                metrics.total_request_bytes += started_command.request_bytes
+                metrics.total_reply_bytes += reply_bytes
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        if (started_command := self._request_id_2_started_command.pop(event.request_id, None)) is None:
+            return
+
+        with self._lock:
+            self._metrics(started_command.key).record(event.duration_micros / 1e6, failed=True)
+
+    def _metrics(self, key: CommandKey) -> CommandMetrics:
+        if (metrics := self._key_2_metrics.get(key)) is None:
+            metrics = self._key_2_metrics[key] = CommandMetrics()
+        return metrics
+
+    # ---------------
+    # Exporting
+    # ---------------
+    def snapshot(self) -> MetricsSnapshot:
+        with self._lock:
+            return MetricsSnapshot(copy.deepcopy(self._key_2_metrics), None if self.pool_statistics is None else self.pool_statistics.copy())
+
+    def add_sink(self, sink: MetricsSink):
+        if not self._sinks:
+            Thread(target=self._export_periodically, daemon=True).start()
+        self._sinks.append(sink)
+
+    def export(self):
+        snapshot = self.snapshot()
+        for sink in self._sinks:
+            try:
+                sink.export(snapshot)
+            except Exception as error:
+                logging.error(f'Failed to export command metrics to {type(sink).__name__}: {error}')
+
+    def _export_periodically(self):
+        while not self._closed.wait(self._export_interval):
+            self.export()
+
+    def close(self):
+        """ Stops the periodic exporting, exporting a last time """
+
+        self._closed.set()
+        self.export()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field, replace
+from threading import Lock, local
+import time
+
+from pymongo import monitoring
+
+
+@dataclass(frozen=True)
+class PoolOptions:
+    """ Connection pool configuration of the client, defaulting to the ones of pymongo
+
+        min_pool_size: connections to be kept open, being established in the background
+        max_pool_size: connections per server, checkouts exceeding it queueing up
+        max_connecting: connections to be established concurrently
+        max_idle_time: seconds after which idle connections are closed, never if None
+        connect_timeout: seconds after which establishing a connection fails
+        socket_timeout: seconds after which operations fail, never if None
+        wait_queue_timeout: seconds after which queued checkouts fail, never if None """
+
+    min_pool_size: int = 0
+    max_pool_size: int = 100
+    max_connecting: int = 2
+    max_idle_time: float | None = None
+    connect_timeout: float = 20.0
+    socket_timeout: float | None = None
+    wait_queue_timeout: float | None = None
+
+    def client_kwargs(self) -> dict:
+        """ >>> PoolOptions(min_pool_size=4, wait_queue_timeout=0.5).client_kwargs()
+            {'minPoolSize': 4, 'maxPoolSize': 100, 'maxConnecting': 2, 'maxIdleTimeMS': None, 'connectTimeoutMS': 20000, 'socketTimeoutMS': None, 'waitQueueTimeoutMS': 500} """
+
+        return {
+            'minPoolSize': self.min_pool_size,
+            'maxPoolSize': self.max_pool_size,
+            'maxConnecting': self.max_connecting,
+            'maxIdleTimeMS': _milliseconds(self.max_idle_time),
+            'connectTimeoutMS': _milliseconds(self.connect_timeout),
+            'socketTimeoutMS': _milliseconds(self.socket_timeout),
+            'waitQueueTimeoutMS': _milliseconds(self.wait_queue_timeout)
+        }
+
+
+def _milliseconds(seconds: float | None) -> int | None:
+    return None if seconds is None else round(seconds * 1e3)
+
+
+@dataclass
+class PoolStatistics:
+    """ n_open_connections: connections currently established
+        n_checked_out: connections currently checked out
+        n_waiting: checkouts currently waiting for a connection, that is the wait queue length
+        max_n_waiting: longest wait queue observed
+        n_checkouts: connections having been checked out
+        n_failed_checkouts: checkouts having failed, by reason, e.g. 'timeout' in case of the
+            wait queue timeout having elapsed
+        n_pool_clears: pool resets, caused by connection errors
+        checkout_latencies: seconds having elapsed between the start and the completion of the latest checkouts """
+
+    n_open_connections: int = 0
+    n_checked_out: int = 0
+    n_waiting: int = 0
+    max_n_waiting: int = 0
+    n_checkouts: int = 0
+    n_failed_checkouts: dict[str, int] = field(default_factory=dict)
+    n_pool_clears: int = 0
+    checkout_latencies: deque[float] = field(default_factory=lambda: deque(maxlen=4096))
+
+    def copy(self) -> PoolStatistics:
+        """ Returns:
+                copy to be read while the statistics keep being recorded """
+
+        return replace(self, n_failed_checkouts=dict(self.n_failed_checkouts), checkout_latencies=self.checkout_latencies.copy())
+
+    @property
+    def mean_checkout_latency(self) -> float:
+        if not self.checkout_latencies:
+            return 0.0
+        return sum(self.checkout_latencies) / len(self.checkout_latencies)
+
+    def checkout_latency_quantile(self, q: float) -> float:
+        """ >>> PoolStatistics(checkout_latencies=deque([0.004, 0.001, 0.002, 0.003])).checkout_latency_quantile(0.5)
+            0.003 """
+
+        if not self.checkout_latencies:
+            return 0.0
+        sorted_latencies = sorted(self.checkout_latencies)
+        return sorted_latencies[min(int(q * len(sorted_latencies)), len(sorted_latencies) - 1)]
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """ Records the PoolStatistics of the pools of the client it has been passed to as event listener
+
+        Checkouts being performed synchronously by the requesting thread, their start times are
+        kept thread-locally """
+
+    def __init__(self):
+        self.statistics = PoolStatistics()
+
+        self._lock = Lock()
+        self._checkout_start_times = local()
+
+    def _checkout_completed(self, address) -> float | None:
+        return getattr(self._checkout_start_times, 'address_2_start_time', {}).pop(address, None)
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent):
+        if not hasattr(self._checkout_start_times, 'address_2_start_time'):
+            self._checkout_start_times.address_2_start_time = {}
+        self._checkout_start_times.address_2_start_time[event.address] = time.perf_counter()
+
+        with self._lock:
+            self.statistics.n_waiting += 1
+            self.statistics.max_n_waiting = max(self.statistics.max_n_waiting, self.statistics.n_waiting)
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent):
+        start_time = self._checkout_completed(event.address)
+
+        with self._lock:
+            self.statistics.n_waiting = max(self.statistics.n_waiting - 1, 0)
+            self.statistics.n_checked_out += 1
+            self.statistics.n_checkouts += 1
+            if start_time is not None:
+                self.statistics.checkout_latencies.append(time.perf_counter() - start_time)
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent):
+        self._checkout_completed(event.address)
+
+        with self._lock:
+            self.statistics.n_waiting = max(self.statistics.n_waiting - 1, 0)
+            self.statistics.n_failed_checkouts[event.reason] = self.statistics.n_failed_checkouts.get(event.reason, 0) + 1
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent):
+        with self._lock:
+            self.statistics.n_checked_out = max(self.statistics.n_checked_out - 1, 0)
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent):
+        with self._lock:
+            self.statistics.n_open_connections += 1
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent):
+        with self._lock:
+            self.statistics.n_open_connections = max(self.statistics.n_open_connections - 1, 0)
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent):
+        with self._lock:
+            self.statistics.n_pool_clears += 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent):
+        pass
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent):
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent):
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent):
+        pass
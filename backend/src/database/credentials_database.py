@@ -1,35 +1,115 @@
 from __future__ import annotations
 
+import logging
 from typing import Iterator
 
-from backend.src.database._utils import UNIQUE_ID_FILTER
+from pymongo.errors import DuplicateKeyError
+
+from backend.src.database._mapping import CredentialsMapping
+from backend.src.database._utils import ID, UNIQUE_ID_FILTER
+from backend.src.database.extended_collection import ExtendedCollection
 from backend.src.database.extended_database import ExtendedDatabase
+from backend.src.database.mongo_client import Client
+
+
+class CredentialsDatabase(ExtendedDatabase, CredentialsMapping):
+    """ Migrates the legacy per-user collections lazily, upon the first registry miss or
+        enumeration of the registered users, once per instance """
 
+    def __init__(self, client: Client | None = None):
+        super().__init__(name='CREDENTIALS', client=client)
 
-class CredentialsDatabase(ExtendedDatabase):
-    def __init__(self):
-        super().__init__(name='CREDENTIALS')
+        self.user_registry_collection = UserRegistryCollection(self)
+        self._migrated = False
 
     def usernames(self) -> list[str]:
-        return self.list_collection_names()
+        self._ensure_migrated()
+        return self.user_registry_collection._ids()
+
+    def username_taken(self, username: str) -> bool:
+        return self._registered(filter={ID: username})
 
     def initialize_user(self, username: str, email_address: str, password: str):
-        self[username].insert_one(
-            UNIQUE_ID_FILTER | {
-                'emailAddress': email_address,
-                'password': password
-            }
-        )
+        """ Raises:
+                pymongo.errors.DuplicateKeyError: if username or email_address already taken """
+
+        self._ensure_migrated()
+        self.user_registry_collection.ensure_indexes()
+        self.user_registry_collection.insert_one(self._credentials_document(username, email_address, password))
 
     def remove_user(self, username: str):
         self.client.drop_database(username)
-        self.drop_collection(username)
+        self.user_registry_collection.delete_one(filter={ID: username})
 
     def query_password(self, username: str) -> str:
-        return self[username].find_one(filter=UNIQUE_ID_FILTER)['password']  # type: ignore
+        if (credentials_document := self.user_registry_collection.find_one(filter={ID: username}, projection=self._PASSWORD_PROJECTION)) is None and self._ensure_migrated():
+            credentials_document = self.user_registry_collection.find_one(filter={ID: username}, projection=self._PASSWORD_PROJECTION)
+        return credentials_document['password']  # type: ignore
 
     def mail_address_taken(self, mail_address: str) -> bool:
-        return mail_address in self.mail_addresses()
+        return self._registered(filter={'emailAddress': mail_address})
 
     def mail_addresses(self) -> Iterator[str]:
-        return (collection.find_one(filter=UNIQUE_ID_FILTER)['emailAddress'] for collection in self.collections())  # type: ignore
\ No newline at end of file
+        self._ensure_migrated()
+        return (document['emailAddress'] for document in self.user_registry_collection.find(projection=self._EMAIL_ADDRESS_PROJECTION))
+
+    def _registered(self, filter: dict) -> bool:
+        """ Returns:
+                whether a credentials document matching filter is registered, possibly only
+                subsequently to the migration triggered by the miss """
+
+        registered = lambda: self.user_registry_collection.find_one(filter=filter, projection={ID: True}) is not None
+        return registered() or (self._ensure_migrated() and registered())
+
+    # ---------------
+    # Per-User Collection Migration
+    # ---------------
+    def migrate_user_collections(self) -> list[str]:
+        """ Transfers the credentials documents of the legacy layout, of one collection per user,
+            named after them, to the user registry, dropping the respective collections
+
+            Idempotent, as already registered users are not overwritten
+
+            Returns:
+                usernames whose email address is already registered for another user, whose
+                collections are thus retained for manual resolution """
+
+        self.user_registry_collection.ensure_indexes()
+        conflicting_usernames = []
+        for name in self.list_collection_names():
+            if name == self.user_registry_collection.name:
+                continue
+
+            if (legacy_credentials_document := self[name].find_one(filter=UNIQUE_ID_FILTER)) is not None:
+                try:
+                    self.user_registry_collection.update_one(**self._legacy_credentials_upsert(name, legacy_credentials_document))
+                except DuplicateKeyError:
+                    conflicting_usernames.append(name)
+                    continue
+            self.drop_collection(name)
+
+        if conflicting_usernames:
+            logging.error(f'Failed to migrate the credentials of {conflicting_usernames}, their email addresses being registered for other users')
+        self._migrated = True
+        return conflicting_usernames
+
+    def _ensure_migrated(self) -> bool:
+        """ Returns:
+                whether the migration has been conducted by the call """
+
+        if self._migrated:
+            return False
+        self.migrate_user_collections()
+        return True
+
+
+class UserRegistryCollection(ExtendedCollection, CredentialsMapping):
+    """ {_id: username,
+         emailAddress: email_address,
+         password: password}
+
+        Uniquely indexed by username, as _id, as well as by emailAddress, whereby
+        existence checks amount to single index lookups """
+
+    def ensure_indexes(self):
+        self.create_index(self._EMAIL_ADDRESS_INDEX, unique=True)
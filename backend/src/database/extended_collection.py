@@ -6,10 +6,17 @@ from pymongo.collection import Collection
 from pymongo.database import Database
 
 from backend.src.database._utils import ID
+from backend.src.database.command_monitoring import tag_public_methods
 from backend.src.utils.strings.splitting import split_at_uppercase
 
 
 class ExtendedCollection(Collection, ABC):
+    def __init_subclass__(cls, **kwargs):
+        """ Tags the commands issued by the public methods of subclasses with their names """
+
+        super().__init_subclass__(**kwargs)
+        tag_public_methods(cls)
+
     def __init__(self, database: Database):
         super().__init__(
             database,
@@ -3,21 +3,30 @@ from __future__ import annotations
 from abc import ABC
 from typing import Iterator, NoReturn
 
-from monostate import MonoState
+from pymongo import MongoClient
 from pymongo.collection import Collection
 from pymongo.database import Database
 
+from backend.src.database.command_monitoring import tag_public_methods
 from backend.src.database.mongo_client import Client
 
 
-class ExtendedDatabase(Database, MonoState, ABC):
-    @Client.receiver
-    def __init__(self, name: str, client: Client):
-        MonoState.__init__(self)
-        Database.__init__(self, client=client, name=name)
+class ExtendedDatabase(Database, ABC):
+    def __init_subclass__(cls, **kwargs):
+        """ Tags the commands issued by the public methods of subclasses with their names """
+
+        super().__init_subclass__(**kwargs)
+        tag_public_methods(cls)
+
+    def __init__(self, name: str, client: MongoClient | None = None):
+        """ Args:
+                client: defaults to the process-wide Client, whose connection pool is
+                    thereby shared by all database handles """
+
+        Database.__init__(self, client=client if client is not None else Client.instance(), name=name)
 
     def __bool__(self) -> NoReturn:
         pass
 
     def collections(self) -> Iterator[Collection]:
-        return (self[name] for name in self.list_collection_names())
\ No newline at end of file
+        return (self[name] for name in self.list_collection_names())
@@ -0,0 +1,2 @@
+from .store import JournalOperation, JournalStore
+from .user_journal import JournalSynchronizer, SyncStatistics, UserJournal
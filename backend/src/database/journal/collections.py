@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import datetime
+from typing import Iterable, Iterator, TYPE_CHECKING
+
+from more_itertools import chunked
+
+from backend.src.database._mapping import (
+    DOCUMENT_ACCESS_EXCEPTIONS,
+    LanguageMetadataMapping,
+    LanguageScopedMapping,
+    ParaphraseIndexMapping,
+    Streak,
+    TrainingChronicMapping,
+    VocableScheduleMapping,
+    VocabularyChanges,
+    VocabularyMapping
+)
+from backend.src.database._utils import ID, UNIQUE_ID_FILTER
+from backend.src.database.journal.store import JournalOperation, JournalStore, OperationKind
+from backend.src.database.user_database import LastSessionStatistics, TrainingChronic
+from backend.src.types.session_checkpoint import SessionCheckpoint
+from backend.src.types.vocable_entry import BaseVocableEntry, the_stripped_meaning, VocableEntries
+from backend.src.utils.date import today_epoch_day
+
+if TYPE_CHECKING:
+    from backend.src.database.journal.user_journal import UserJournal
+
+
+class _JournalCollection(LanguageScopedMapping, ABC):
+    """ Counterpart of a remote user collection, whose methods apply writes to the local state and
+        journal the remote updates of the corresponding remote collection methods within the same
+        transaction, thus replaying identically
+
+        Args:
+            _NAME: name of the remote collection """
+
+    _NAME: str
+
+    def __init__(self, journal: UserJournal):
+        self._journal = journal
+
+    @property
+    def language(self) -> str:
+        return self._journal.language
+
+    @property
+    def user(self) -> str:
+        return self._journal.user
+
+    @property
+    def _store(self) -> JournalStore:
+        return self._journal.store
+
+    def _journal_operation(self, kind: OperationKind, filter: dict, update: dict | list | None = None, upsert=False, collection: str | None = None):
+        self._store.enqueue(JournalOperation(collection or self._NAME, kind, filter, update, upsert))
+
+    def _document(self, id: str) -> dict | None:
+        return self._store.document(self._NAME, id)
+
+    @abstractmethod
+    def remove_language_related_documents(self):
+        ...
+
+
+def _set_path(document: dict, path: str, value):
+    """ >>> document = {'a': {'b': 1}}
+        >>> _set_path(document, 'a.c.d', 2); document
+        {'a': {'b': 1, 'c': {'d': 2}}} """
+
+    *parents, key = path.split('.')
+    for parent in parents:
+        document = document.setdefault(parent, {})
+    document[key] = value
+
+
+def _unset_path(document: dict, path: str):
+    *parents, key = path.split('.')
+    for parent in parents:
+        if not isinstance(child := document.get(parent), dict):
+            return
+        document = child
+    document.pop(key, None)
+
+
+class JournalVocabularyCollection(_JournalCollection, VocabularyMapping, ParaphraseIndexMapping):
+    """ Journaled counterpart of VocabularyCollection, likewise maintaining the remote paraphrase index """
+
+    _NAME = 'vocabulary'
+    _PARAPHRASE_INDEX_NAME = 'paraphrase_index'
+
+    def vocabulary_possessing_languages(self) -> set[str]:
+        return self._store.vocabulary_languages()
+
+    def entries(self) -> VocableEntries:
+        return VocableEntries.concatenated(self.query_entries())
+
+    # ---------------
+    # Queries
+    # ---------------
+    def vocables(self) -> list[str]:
+        return [document['vocable'] for document in self._store.vocable_entry_documents(self.language)]
+
+    def query_entries(self, vocables: Iterable[str] | None = None, due_only=False, today: int | None = None, page_size: int = VocabularyMapping._QUERY_PAGE_SIZE) -> Iterator[VocableEntries]:
+        """ Yields:
+                non-empty pages of up to page_size entries, see VocabularyCollection.query_entries """
+
+        entry_documents = self._store.vocable_entry_documents(
+            self.language,
+            vocables=vocables,
+            due_before=(today_epoch_day() if today is None else today) if due_only else None
+        )
+        for page_documents in chunked(entry_documents, page_size):
+            yield self._to_entries(page_documents)
+
+    # ---------------
+    # Entry Manipulation
+    # ---------------
+    def remove_language_related_documents(self):
+        with self._store.transaction():
+            self._store.delete_vocable_entry_documents(self.language)
+            self._journal_operation('delete_many', self._language_filter)
+            self._journal_operation('delete_one', self._language_id_filter)
+            self._journal_operation('delete_many', self._language_filter, collection=self._PARAPHRASE_INDEX_NAME)
+        # schedule outdated by the removal, which isn't recorded as vocabulary changes
+        self._journal.vocable_schedule_collection.remove_language_related_documents()
+
+    def upsert_entry(self, entry: BaseVocableEntry):
+        document = self._entry_2_document(entry)
+        with self._store.transaction():
+            previous_document = self._store.vocable_entry_document(self.language, entry.vocable)
+            self._store.put_vocable_entry_document(dict(document))
+            self._journal_operation('update', self._entry_filter(entry.vocable), {'$set': document}, upsert=True)
+
+            if previous_document is None:
+                self._journal.vocable_schedule_collection.record_added(entry.vocable)
+
+            if (previous_translation := self._translation(previous_document)) != entry.translation:
+                if previous_translation is not None:
+                    self._remove_from_paraphrase_index(entry.vocable, the_stripped_meaning(previous_translation))
+                self._journal_operation('update', self._meaning_filter(entry.the_stripped_meaning), {'$addToSet': {'vocables': entry.vocable}}, upsert=True, collection=self._PARAPHRASE_INDEX_NAME)
+
+    def delete_entry(self, entry: BaseVocableEntry):
+        with self._store.transaction():
+            self._store.delete_vocable_entry_documents(self.language, entry.vocable)
+            self._journal_operation('delete_one', self._entry_filter(entry.vocable))
+            self._journal.vocable_schedule_collection.record_deleted(entry.vocable)
+            self._remove_from_paraphrase_index(entry.vocable, entry.the_stripped_meaning)
+
+    def update_entry(self, vocable: str, new_score: float):
+        update = self._entry_update(new_score)
+        with self._store.transaction():
+            if (document := self._store.vocable_entry_document(self.language, vocable)) is not None:
+                document['tf'] += update['$inc']['tf']
+                self._store.put_vocable_entry_document(document | update['$set'])
+            self._journal_operation('update', self._entry_filter(vocable), update)
+
+    def alter_entry(self, old_vocable: str, altered_vocable_entry: BaseVocableEntry):
+        with self._store.transaction():
+            previous_document = self._store.vocable_entry_document(self.language, old_vocable)
+            self._store.delete_vocable_entry_documents(self.language, old_vocable)
+            self._journal_operation('delete_one', self._entry_filter(old_vocable))
+            if previous_document is not None:
+                self._journal.vocable_schedule_collection.record_deleted(old_vocable)
+            if (previous_translation := self._translation(previous_document)) is not None:
+                self._remove_from_paraphrase_index(old_vocable, the_stripped_meaning(previous_translation))
+
+            self.upsert_entry(altered_vocable_entry)
+
+    def _remove_from_paraphrase_index(self, vocable: str, meaning: str):
+        self._journal_operation('update', self._meaning_filter(meaning), {'$pull': {'vocables': vocable}}, collection=self._PARAPHRASE_INDEX_NAME)
+        self._journal_operation('delete_one', self._meaning_filter(meaning) | {'vocables': {'$size': 0}}, collection=self._PARAPHRASE_INDEX_NAME)
+
+
+class JournalParaphraseIndexCollection(_JournalCollection, ParaphraseIndexMapping):
+    """ Counterpart of ParaphraseIndexCollection, whose paraphrases are derived from the local vocabulary,
+        the remote paraphrase index being maintained by the journaled entry manipulations """
+
+    _NAME = JournalVocabularyCollection._PARAPHRASE_INDEX_NAME
+
+    def remove_language_related_documents(self):
+        """ Solely journaled, as the paraphrases are derived from the local vocabulary """
+
+        self._journal_operation('delete_many', self._language_filter)
+
+    def paraphrases(self) -> dict[str, list[str]]:
+        return self._paraphrases(self._paraphrase_index_documents(self._journal.vocabulary_collection.entries()))
+
+
+class JournalVocableScheduleCollection(_JournalCollection, VocableScheduleMapping):
+    """ Journaled counterpart of VocableScheduleCollection """
+
+    _NAME = 'vocable_schedule'
+
+    def remove_language_related_documents(self):
+        with self._store.transaction():
+            self._store.delete_document(self._NAME, self.language)
+            self._journal_operation('delete_one', self._language_id_filter)
+
+    def upsert_schedule(self, schedule_document: dict[str, list], reconciled_changes: VocabularyChanges | None = None):
+        reconciled_changes = reconciled_changes or VocabularyChanges()
+        with self._store.transaction():
+            document = self._document(self.language) or {}
+            document['schedule'] = schedule_document
+            for key, reconciled_vocables in (('added', set(reconciled_changes.added)), ('deleted', set(reconciled_changes.deleted))):
+                document[key] = [vocable for vocable in document.get(key, []) if vocable not in reconciled_vocables]
+            self._store.put_document(self._NAME, self.language, document)
+            self._journal_operation('update', self._language_id_filter, self._schedule_update(schedule_document, reconciled_changes), upsert=True)
+
+    def schedule(self) -> dict[str, list] | None:
+        return self.schedule_and_vocabulary_changes()[0]
+
+    def schedule_and_vocabulary_changes(self) -> tuple[dict[str, list] | None, VocabularyChanges]:
+        document = self._document(self.language)
+        return (document or {}).get('schedule'), VocabularyChanges.from_document(document)
+
+    def record_added(self, vocable: str):
+        self._record(vocable, 'added', update=self._vocable_added_update(vocable))
+
+    def record_deleted(self, vocable: str):
+        self._record(vocable, 'deleted', update=self._vocable_deleted_update(vocable))
+
+    def _record(self, vocable: str, key: str, update: dict):
+        """ Adds vocable to the vocabulary change list of key, removing it from the other one """
+
+        with self._store.transaction():
+            document = self._document(self.language) or {}
+            for change_key in ('added', 'deleted'):
+                document[change_key] = [recorded_vocable for recorded_vocable in document.get(change_key, []) if recorded_vocable != vocable]
+            document[key].append(vocable)
+            self._store.put_document(self._NAME, self.language, document)
+            self._journal_operation('update', self._language_id_filter, update, upsert=True)
+
+
+class JournalTrainingChronicCollection(_JournalCollection, TrainingChronicMapping):
+    """ Journaled counterpart of TrainingChronicCollection, whose local language documents solely
+        hold the daily statistics, the rollups and the streak being computed from them """
+
+    _NAME = 'training_chronic'
+
+    def remove_language_related_documents(self):
+        with self._store.transaction():
+            self._store.delete_document(self._NAME, self.language)
+            self._journal_operation('delete_one', self._language_id_filter)
+
+    def upsert_session_statistics(self, trainer_shortform: str, n_faced_items: int):
+        today = datetime.date.today()
+        last_session_statistics_update = self._last_session_statistics_update(trainer_shortform, n_faced_items)
+        with self._store.transaction():
+            document = self._document(self.language) or {}
+            trainer_2_n_faced_items = document.get(str(today)) or {}
+            trainer_2_n_faced_items[trainer_shortform] = trainer_2_n_faced_items.get(trainer_shortform, 0) + n_faced_items
+            document[str(today)] = trainer_2_n_faced_items
+            self._store.put_document(self._NAME, self.language, document)
+            self._journal_operation('update', self._language_id_filter, self._training_chronic_update(trainer_shortform, n_faced_items, today=today), upsert=True)
+
+            self._update_unique_document(last_session_statistics_update, upsert=True)
+
+    def last_session_statistics(self) -> LastSessionStatistics | None:
+        try:
+            return self._document(UNIQUE_ID_FILTER[ID])['lastSession']  # type: ignore
+        except DOCUMENT_ACCESS_EXCEPTIONS:
+            return None
+
+    def _update_unique_document(self, update: dict, upsert=False):
+        """ Applies the $set and $unset fields of update to the local unique document """
+
+        with self._store.transaction():
+            if (document := self._document(UNIQUE_ID_FILTER[ID])) is not None or upsert:
+                document = document or {}
+                for path, value in update.get('$set', {}).items():
+                    _set_path(document, path, value)
+                for path in update.get('$unset', {}):
+                    _unset_path(document, path)
+                self._store.put_document(self._NAME, UNIQUE_ID_FILTER[ID], document)
+            self._journal_operation('update', UNIQUE_ID_FILTER, update, upsert=upsert)
+
+    # ------------------
+    # Session Checkpoints
+    # ------------------
+    def upsert_session_checkpoint(self, trainer_shortform: str, checkpoint: SessionCheckpoint):
+        self._update_unique_document({'$set': {self._session_checkpoint_field(trainer_shortform): checkpoint.to_document()}}, upsert=True)
+
+    def session_checkpoint(self, trainer_shortform: str) -> SessionCheckpoint | None:
+        return self._session_checkpoint(self._document(UNIQUE_ID_FILTER[ID]), trainer_shortform)
+
+    def delete_session_checkpoint(self, trainer_shortform: str):
+        self._update_unique_document({'$unset': {self._session_checkpoint_field(trainer_shortform): 1}})
+
+    def upsert_language_placeholder_document(self, language: str):
+        update = self._language_placeholder_update()
+        with self._store.transaction():
+            self._store.put_document(self._NAME, language, (self._document(language) or {}) | update['$set'])
+            self._journal_operation('update', {ID: language}, update, upsert=True)
+
+    def comprised_languages(self) -> set[str]:
+        return set(self._store.document_ids(self._NAME)) - {UNIQUE_ID_FILTER[ID]}
+
+    def training_chronic(self) -> TrainingChronic | None:
+        return self._document(self.language)
+
+    # ------------------
+    # Rollups
+    # ------------------
+    def daily_statistics(self, first_date: datetime.date, last_date: datetime.date) -> TrainingChronic:
+        return {
+            date: trainer_2_n_faced_items
+            for date, trainer_2_n_faced_items in (self.training_chronic() or {}).items()
+            if str(first_date) <= date <= str(last_date) and trainer_2_n_faced_items is not None
+        }
+
+    def weekly_statistics(self, first_date: datetime.date, last_date: datetime.date) -> TrainingChronic:
+        return self._ranged_rollup(self._WEEKS, self._week_key(first_date), self._week_key(last_date))
+
+    def monthly_statistics(self, first_date: datetime.date, last_date: datetime.date) -> TrainingChronic:
+        return self._ranged_rollup(self._MONTHS, self._month_key(first_date), self._month_key(last_date))
+
+    def total_statistics(self) -> dict[str, int]:
+        return self._rollups()[self._TOTAL]
+
+    def streak(self, today: datetime.date | None = None) -> Streak | None:
+        return self._current_streak(self._rollups().get(self._STREAK), today)
+
+    def _rollups(self) -> dict:
+        return self._rebuilt_rollups(self.training_chronic() or {})
+
+    def _ranged_rollup(self, field: str, first_key: str, last_key: str) -> TrainingChronic:
+        return {key: statistics for key, statistics in self._rollups()[field].items() if first_key <= key <= last_key}
+
+
+class JournalLanguageMetadataCollection(_JournalCollection, LanguageMetadataMapping):
+    """ Journaled counterpart of LanguageMetadataCollection, whose local documents supersede its cache,
+        the cached documents of the replayed upserts being invalidated by the synchronization """
+
+    _NAME = 'language_metadata'
+
+    def _cached_document(self, document_id: str) -> dict:
+        return self._document(document_id) or {}
+
+    def _upsert(self, document_id: str, fields: dict):
+        update = self._upsert_update(fields)
+        with self._store.transaction():
+            document = self._cached_document(document_id)
+            for path, value in fields.items():
+                _set_path(document, path, value)
+            document['version'] = document.get('version', 0) + update['$inc']['version']
+            self._store.put_document(self._NAME, document_id, document)
+            self._journal_operation('update', {ID: document_id}, update, upsert=True)
+
+    def remove_language_related_documents(self):
+        with self._store.transaction():
+            self._store.delete_document(self._NAME, self.language)
+            self._journal_operation('delete_one', self._language_id_filter)
+
+    # ------------------
+    # Accent
+    # ------------------
+    def upsert_accent(self, accent: str):
+        self._upsert(self.language, {'accent': accent})
+
+    def query_accent(self) -> str | None:
+        return self._cached_document(self.language).get('accent')
+
+    # ------------------
+    # Playback Speed
+    # ------------------
+    def upsert_playback_speed(self, accent: str, playback_speed: float):
+        self._upsert(self.language, {f'playbackSpeed.{accent}': playback_speed})
+
+    def query_playback_speed(self, accent: str) -> float | None:
+        return self._playback_speed(self._cached_document(self.language), accent)
+
+    # ------------------
+    # Enablement
+    # ------------------
+    def upsert_tts_enablement(self, value: bool):
+        self._upsert(self.language, {'ttsEnabled': value})
+
+    def query_tts_enablement(self) -> bool | None:
+        return self._cached_document(self.language).get('ttsEnabled')
+
+    # ------------------
+    # English Training
+    # ------------------
+    def upsert_reference_language(self, reference_language: str):
+        self._upsert(self._ENGLISH_TRAINING_ID, {'referenceLanguage': reference_language})
+
+    def query_reference_language(self) -> str | None:
+        return self._cached_document(self._ENGLISH_TRAINING_ID).get('referenceLanguage')
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import json
+import secrets
+import sqlite3
+from threading import RLock
+from typing import Iterable, Iterator, Literal
+
+from more_itertools import chunked
+from pymongo import DeleteMany, DeleteOne, UpdateOne
+
+from backend.src.database._utils import JOURNAL_OPERATIONS
+from backend.src.utils.io import PathLike
+
+
+OperationKind = Literal['update', 'delete_one', 'delete_many']
+
+
+@dataclass(frozen=True)
+class JournalOperation:
+    """ Write to be replayed onto a collection of the remote user database
+
+        Args:
+            collection: name of the remote collection
+            update: update document or pipeline, None for deletions
+            id: generated upon journaling, by means of which replays are recognized """
+
+    collection: str
+    kind: OperationKind
+    filter: dict
+    update: dict | list | None = None
+    upsert: bool = False
+    id: str = field(default_factory=lambda: secrets.token_urlsafe(12))
+
+    def request(self, n_retained_ids: int) -> UpdateOne | DeleteOne | DeleteMany:
+        """ Returns:
+                bulk write request, updates solely matching documents lacking the operation id among
+                their n_retained_ids latest recorded ones, and recording it
+
+                Hence, updates replayed in the same order aren't reapplied, as even a replayed $set
+                would otherwise revert subsequent updates of its document. Replayed deletions, on the
+                other hand, reset their document to the state preceding its subsequent updates, which
+                are thereupon reapplied
+
+            >>> JournalOperation('vocabulary', 'update', {'vocable': 'hund'}, {'$inc': {'tf': 1}}, id='op').request(4)
+            UpdateOne({'vocable': 'hund', 'journalOperations': {'$ne': 'op'}}, {'$inc': {'tf': 1}, '$push': {'journalOperations': {'$each': ['op'], '$slice': -4}}}, False, None, None, None) """
+
+        if self.kind == 'delete_one':
+            return DeleteOne(self.filter)
+        if self.kind == 'delete_many':
+            return DeleteMany(self.filter)
+
+        filter = self.filter | {JOURNAL_OPERATIONS: {'$ne': self.id}}
+        if isinstance(self.update, list):
+            return UpdateOne(filter, [*self.update, {'$set': {JOURNAL_OPERATIONS: {'$slice': [
+                {'$concatArrays': [{'$ifNull': [f'${JOURNAL_OPERATIONS}', []]}, [{'$literal': self.id}]]},
+                -n_retained_ids
+            ]}}}], upsert=self.upsert)
+        return UpdateOne(filter, self.update | {'$push': {JOURNAL_OPERATIONS: {'$each': [self.id], '$slice': -n_retained_ids}}}, upsert=self.upsert)  # type: ignore[operator]
+
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS vocabulary (
+        language TEXT NOT NULL,
+        vocable TEXT NOT NULL,
+        t TEXT NOT NULL,
+        tf INTEGER NOT NULL,
+        s REAL NOT NULL,
+        lfd INTEGER,
+        due INTEGER NOT NULL,
+        PRIMARY KEY (language, vocable)
+    );
+    CREATE INDEX IF NOT EXISTS vocabulary_due ON vocabulary (language, due);
+
+    CREATE TABLE IF NOT EXISTS documents (
+        collection TEXT NOT NULL,
+        id TEXT NOT NULL,
+        body TEXT NOT NULL,
+        PRIMARY KEY (collection, id)
+    );
+
+    CREATE TABLE IF NOT EXISTS operations (
+        sequence INTEGER PRIMARY KEY AUTOINCREMENT,
+        id TEXT NOT NULL UNIQUE,
+        collection TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        filter TEXT NOT NULL,
+        modification TEXT,
+        upsert INTEGER NOT NULL
+    );
+"""
+
+_VOCABULARY_COLUMNS = ('language', 'vocable', 't', 'tf', 's', 'lfd', 'due')
+
+# bound below SQLite's default maximum number of host parameters per statement
+_MAX_N_PARAMETERS = 512
+
+
+class JournalStore:
+    """ SQLite database holding the local state of the journaled collections of one user, that is
+        one row per vocable entry and one JSON body per training chronic and language metadata
+        document, as well as the outbox of operations pending to be replayed, in journaling order
+
+        Shared by the session and the synchronizing thread, whereby all accesses are serialized,
+        state changes and the operations reflecting them being committed within one transaction """
+
+    def __init__(self, file_path: PathLike):
+        self._connection = sqlite3.connect(str(file_path), check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.executescript(_SCHEMA)
+
+        self._lock = RLock()
+        self._transaction_depth = 0
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """ Commits the statements executed within the outermost transaction at once, rolling
+            them back upon exceptions """
+
+        with self._lock:
+            if self._transaction_depth == 0:
+                self._connection.execute('BEGIN IMMEDIATE')
+            self._transaction_depth += 1
+            try:
+                yield
+            except BaseException:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    self._connection.execute('ROLLBACK')
+                raise
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self._connection.execute('COMMIT')
+
+    def _execute(self, statement: str, parameters: Iterable = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._connection.execute(statement, tuple(parameters)).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    # ---------------
+    # Vocabulary
+    # ---------------
+    def vocabulary_languages(self) -> set[str]:
+        return {row['language'] for row in self._execute('SELECT DISTINCT language FROM vocabulary')}
+
+    def vocable_entry_document(self, language: str, vocable: str) -> dict | None:
+        rows = self._execute('SELECT * FROM vocabulary WHERE language = ? AND vocable = ?', (language, vocable))
+        return dict(rows[0]) if rows else None
+
+    def vocable_entry_documents(self, language: str, vocables: Iterable[str] | None = None, due_before: int | None = None) -> list[dict]:
+        """ Args:
+                due_before: epoch day, as of which the retrieved entries are to be due, all if None """
+
+        statement = 'SELECT * FROM vocabulary WHERE language = ?'
+        parameters: list = [language]
+        if due_before is not None:
+            statement += ' AND due <= ?'
+            parameters.append(due_before)
+
+        if vocables is None:
+            return [dict(row) for row in self._execute(f'{statement} ORDER BY rowid', parameters)]
+        return [
+            dict(row)
+            for vocables_chunk in chunked(vocables, _MAX_N_PARAMETERS)
+            for row in self._execute(f'{statement} AND vocable IN ({", ".join("?" * len(vocables_chunk))}) ORDER BY rowid', [*parameters, *vocables_chunk])
+        ]
+
+    def put_vocable_entry_document(self, document: dict):
+        """ Updates existent rows in place, thus retaining the insertion order of the entries """
+
+        self._execute(
+            f'INSERT INTO vocabulary ({", ".join(_VOCABULARY_COLUMNS)}) VALUES ({", ".join("?" * len(_VOCABULARY_COLUMNS))}) '
+            f'ON CONFLICT (language, vocable) DO UPDATE SET {", ".join(f"{column} = excluded.{column}" for column in _VOCABULARY_COLUMNS[2:])}',
+            (document[column] for column in _VOCABULARY_COLUMNS)
+        )
+
+    def delete_vocable_entry_documents(self, language: str, vocable: str | None = None):
+        if vocable is None:
+            self._execute('DELETE FROM vocabulary WHERE language = ?', (language,))
+        else:
+            self._execute('DELETE FROM vocabulary WHERE language = ? AND vocable = ?', (language, vocable))
+
+    def replace_vocabulary(self, documents: Iterable[dict]):
+        with self.transaction():
+            self._execute('DELETE FROM vocabulary')
+            for document in documents:
+                self.put_vocable_entry_document(document)
+
+    # ---------------
+    # Documents
+    # ---------------
+    def document(self, collection: str, id: str) -> dict | None:
+        rows = self._execute('SELECT body FROM documents WHERE collection = ? AND id = ?', (collection, id))
+        return json.loads(rows[0]['body']) if rows else None
+
+    def document_ids(self, collection: str) -> list[str]:
+        return [row['id'] for row in self._execute('SELECT id FROM documents WHERE collection = ?', (collection,))]
+
+    def put_document(self, collection: str, id: str, document: dict):
+        self._execute('INSERT OR REPLACE INTO documents (collection, id, body) VALUES (?, ?, ?)', (collection, id, json.dumps(document)))
+
+    def delete_document(self, collection: str, id: str):
+        self._execute('DELETE FROM documents WHERE collection = ? AND id = ?', (collection, id))
+
+    def replace_documents(self, collection: str, id_2_document: dict[str, dict]):
+        with self.transaction():
+            self._execute('DELETE FROM documents WHERE collection = ?', (collection,))
+            for id, document in id_2_document.items():
+                self.put_document(collection, id, document)
+
+    # ---------------
+    # Outbox
+    # ---------------
+    @property
+    def n_pending(self) -> int:
+        return self._execute('SELECT COUNT(*) FROM operations')[0][0]
+
+    def enqueue(self, operation: JournalOperation):
+        self._execute(
+            'INSERT INTO operations (id, collection, kind, filter, modification, upsert) VALUES (?, ?, ?, ?, ?, ?)',
+            (operation.id, operation.collection, operation.kind, json.dumps(operation.filter), json.dumps(operation.update), operation.upsert)
+        )
+
+    def pending_operations(self, limit: int) -> list[JournalOperation]:
+        """ Returns:
+                up to limit earliest pending operations, in journaling order """
+
+        return [
+            JournalOperation(
+                collection=row['collection'],
+                kind=row['kind'],
+                filter=json.loads(row['filter']),
+                update=json.loads(row['modification']),
+                upsert=bool(row['upsert']),
+                id=row['id']
+            )
+            for row in self._execute('SELECT * FROM operations ORDER BY sequence LIMIT ?', (limit,))
+        ]
+
+    def acknowledge(self, operation_ids: Iterable[str]):
+        """ Removes the operations of operation_ids from the outbox, having been replayed """
+
+        with self.transaction():
+            for operation_ids_chunk in chunked(operation_ids, _MAX_N_PARAMETERS):
+                self._execute(f'DELETE FROM operations WHERE id IN ({", ".join("?" * len(operation_ids_chunk))})', operation_ids_chunk)
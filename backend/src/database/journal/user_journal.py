@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass
+from itertools import groupby
+import logging
+from threading import Event, Lock, Thread
+
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from backend.src.database._mapping import ParaphraseIndexMapping
+from backend.src.database._utils import ID, JOURNAL_OPERATIONS, UNIQUE_ID_FILTER
+from backend.src.database.journal.collections import (
+    JournalLanguageMetadataCollection,
+    JournalParaphraseIndexCollection,
+    JournalTrainingChronicCollection,
+    JournalVocableScheduleCollection,
+    JournalVocabularyCollection
+)
+from backend.src.database.journal.store import JournalOperation, JournalStore
+from backend.src.database.user_database import UserDatabase
+from backend.src.database.write_behind_buffer import WriteBehindBuffer
+from backend.src.utils.io import PathLike
+
+
+_DUPLICATE_KEY_ERROR_CODE = 11000
+
+
+@dataclass
+class SyncStatistics:
+    """ n_replayed_operations: operations having been replayed and removed from the outbox since
+        n_bulk_writes: ordered bulk write round trips, one per run of consecutive operations of the same collection
+        n_unmatched_updates: updates having matched no remote document, either as their target has been
+            deleted remotely or as they had already been applied
+        n_already_applied: upserts recognized as having already been applied by a preceding replay
+        n_conflicts: operations having been rejected by the remote database, being dropped """
+
+    n_replayed_operations: int = 0
+    n_bulk_writes: int = 0
+    n_unmatched_updates: int = 0
+    n_already_applied: int = 0
+    n_conflicts: int = 0
+
+
+class JournalSynchronizer:
+    """ Replays the pending operations of store onto the remote database of user_database in batches
+        of batch_size, by means of ordered bulk writes, and removes them from the outbox subsequently
+
+        Replays are at-least-once, an interruption between the bulk write and the removal causing
+        the batch to be replayed again, whereby updates record their ids within the latest batch_size
+        ids of their target document and solely match documents lacking it. Replayed upserts of
+        already recorded ids hence violate the unique indexes and are skipped likewise.
+
+        Conflicts are resolved field-wise by last writer wins, the replayed $set fields overwriting
+        remote ones written in the meantime, whereas increments add up with the remote ones. Updates
+        whose target has been deleted remotely match nothing, and operations rejected by the remote
+        database are logged and dropped, neither blocking the subsequent ones.
+
+        Connection errors leave the operations of the failed batch pending """
+
+    def __init__(self, store: JournalStore, user_database: UserDatabase, batch_size: int = 64):
+        self._store = store
+        self._user_database = user_database
+        self._batch_size = batch_size
+
+        self._lock = Lock()
+        self.statistics = SyncStatistics()
+
+    def push(self):
+        """ Replays all pending operations
+
+            Raises:
+                PyMongoError: on connection errors """
+
+        with self._lock:
+            self._ensure_indexes()
+            while operations := self._store.pending_operations(self._batch_size):
+                self._ensure_rollups(operations)
+                self._replay(operations)
+                self._store.acknowledge(operation.id for operation in operations)
+                self.statistics.n_replayed_operations += len(operations)
+                self._uncache_language_metadata(operations)
+
+    def _ensure_indexes(self):
+        """ Ensures the unique indexes, by means of which replayed upserts are recognized """
+
+        self._user_database.vocabulary_collection._ensure_indexes()
+        self._user_database.paraphrase_index_collection.create_index(ParaphraseIndexMapping._INDEX, unique=True)
+
+    def _ensure_rollups(self, operations: list[JournalOperation]):
+        """ Rebuilds the rollups of the remote training chronic documents preceding their introduction,
+            prior to the replayed increments """
+
+        training_chronic_collection = self._user_database.training_chronic_collection
+        for operation in operations:
+            if operation.collection == training_chronic_collection.name and operation.filter[ID] != UNIQUE_ID_FILTER[ID]:
+                training_chronic_collection._ensure_rollups(operation.filter[ID])
+
+    def _replay(self, operations: list[JournalOperation]):
+        for collection_name, collection_operations in groupby(operations, key=lambda operation: operation.collection):
+            self._bulk_write(collection_name, list(collection_operations))
+
+    def _bulk_write(self, collection_name: str, operations: list[JournalOperation]):
+        """ Resumes the ordered bulk write after the operation having caused a write error """
+
+        collection = self._user_database[collection_name]
+        while operations:
+            self.statistics.n_bulk_writes += 1
+            try:
+                result = collection.bulk_write([operation.request(self._batch_size) for operation in operations], ordered=True)
+            except BulkWriteError as error:
+                write_error = error.details['writeErrors'][0]
+                self._record_unmatched_updates(operations[:write_error['index']], error.details['nMatched'], error.details['nUpserted'])
+                self._resolve(operations[write_error['index']], write_error)
+                operations = operations[write_error['index'] + 1:]
+            else:
+                self._record_unmatched_updates(operations, result.matched_count, result.upserted_count)
+                return
+
+    def _record_unmatched_updates(self, operations: list[JournalOperation], n_matched: int, n_upserted: int):
+        self.statistics.n_unmatched_updates += sum(operation.kind == 'update' for operation in operations) - n_matched - n_upserted
+
+    def _resolve(self, operation: JournalOperation, write_error: dict):
+        if write_error['code'] == _DUPLICATE_KEY_ERROR_CODE and operation.upsert:
+            self.statistics.n_already_applied += 1
+        else:
+            self.statistics.n_conflicts += 1
+            logging.error(f'Dropping journal operation {operation} rejected by the remote database: {write_error["errmsg"]}')
+
+    def _uncache_language_metadata(self, operations: list[JournalOperation]):
+        """ Invalidates the documents of the process-wide language metadata cache having been replayed onto """
+
+        for operation in operations:
+            if operation.collection == self._user_database.language_metadata_collection.name:
+                self._user_database.language_metadata_collection._uncache(operation.filter[ID])
+
+
+class UserJournal:
+    """ Offline-first counterpart of the vocabulary, training chronic, language metadata and vocable
+        schedule collections of user_database, as well as of its paraphrase index, derived from the
+        local vocabulary, answering reads from the local JournalStore at file_path and journaling writes,
+        which are replayed onto the remote database every sync_interval seconds by a daemon thread,
+        solely upon sync calls if None, as well as upon closing
+
+        Training thus neither awaits remote round trips nor fails while the remote database is
+        unreachable, the journaled operations remaining pending until it is reachable again.
+        The local state is pulled from the remote database upon instantiation, if reachable, and
+        pull calls, thereby reflecting writes of other sessions
+
+        Takes the place of user_database as database handle of the trainers, language-scoped
+        handles being derived by for_language
+
+        Args:
+            batch_size: operations per replayed batch, being as well the number of operation ids
+                retained per document for recognizing replays """
+
+    def __init__(self, user_database: UserDatabase, file_path: PathLike, batch_size: int = 64, sync_interval: float | None = 5.0):
+        self.user_database = user_database
+        self.language = user_database.language
+        self.store = JournalStore(file_path)
+        self.synchronizer = JournalSynchronizer(self.store, user_database, batch_size=batch_size)
+
+        self._set_collections()
+        # whether owning the store and the sync thread, as opposed to language-scoped handles
+        self._owning = True
+
+        try:
+            self.pull()
+        except PyMongoError as error:
+            logging.warning(f'Failed to pull the journaled collections of {self.user}, answering reads from the local state: {error}')
+
+        self._closed = Event()
+        self._sync_thread: Thread | None = None
+        if sync_interval is not None:
+            self._sync_thread = Thread(target=self._sync_periodically, args=(sync_interval,), daemon=True)
+            self._sync_thread.start()
+
+    def _set_collections(self):
+        self.vocabulary_collection = JournalVocabularyCollection(self)
+        self.training_chronic_collection = JournalTrainingChronicCollection(self)
+        self.language_metadata_collection = JournalLanguageMetadataCollection(self)
+        self.vocable_schedule_collection = JournalVocableScheduleCollection(self)
+        self.paraphrase_index_collection = JournalParaphraseIndexCollection(self)
+
+    @property
+    def user(self) -> str:
+        return self.user_database.user
+
+    @property
+    def write_behind_buffer(self) -> WriteBehindBuffer:
+        """ Write-behind buffer of user_database, the journaled writes not being buffered,
+            as they're committed locally at once """
+
+        return self.user_database.write_behind_buffer
+
+    def for_language(self, language: str) -> UserJournal:
+        """ Returns:
+                handle scoped to language, sharing the store, the synchronizer and the sync
+                thread of self, whose closing is solely up to self """
+
+        journal = copy.copy(self)
+        journal.user_database = self.user_database.for_language(language)
+        journal.language = language
+        journal._owning = False
+        journal._set_collections()
+        return journal
+
+    @property
+    def statistics(self) -> SyncStatistics:
+        return self.synchronizer.statistics
+
+    def sync(self):
+        """ Replays the pending operations
+
+            Raises:
+                PyMongoError: on connection errors, the operations remaining pending """
+
+        self.synchronizer.push()
+
+    def pull(self) -> bool:
+        """ Replaces the local state by the remote one, unless operations are pending, which would
+            otherwise be discarded
+
+            Returns:
+                whether pulled
+
+            Raises:
+                PyMongoError: on connection errors """
+
+        if self.store.n_pending:
+            return False
+
+        vocabulary_collection = self.user_database.vocabulary_collection
+        vocabulary_collection.migrate_language_documents()
+        vocable_entry_documents = list(vocabulary_collection.find(
+            {'language': {'$exists': True}},
+            projection={ID: False, 'language': True, 'vocable': True, 't': True, 'tf': True, 's': True, 'lfd': True, 'due': True}
+        ))
+        training_chronic_documents = list(self.user_database.training_chronic_collection.find(
+            projection={field: False for field in self.training_chronic_collection._NON_DAILY_FIELDS}
+        ))
+        language_metadata_documents = list(self.user_database.language_metadata_collection.find(projection={JOURNAL_OPERATIONS: False}))
+        vocable_schedule_documents = list(self.user_database.vocable_schedule_collection.find(projection={JOURNAL_OPERATIONS: False}))
+
+        with self.store.transaction():
+            # operations journaled while pulling
+            if self.store.n_pending:
+                return False
+
+            self.store.replace_vocabulary(vocable_entry_documents)
+            self.store.replace_documents(self.training_chronic_collection._NAME, {document.pop(ID): document for document in training_chronic_documents})
+            self.store.replace_documents(self.language_metadata_collection._NAME, {document.pop(ID): document for document in language_metadata_documents})
+            self.store.replace_documents(self.vocable_schedule_collection._NAME, {document.pop(ID): document for document in vocable_schedule_documents})
+        return True
+
+    def remove_language_related_documents(self):
+        for collection in (self.vocabulary_collection, self.training_chronic_collection, self.language_metadata_collection, self.vocable_schedule_collection):
+            collection.remove_language_related_documents()
+
+    def _sync_periodically(self, sync_interval: float):
+        while not self._closed.wait(sync_interval):
+            self._sync_logging_errors()
+
+    def _sync_logging_errors(self):
+        try:
+            self.sync()
+        except PyMongoError as error:
+            logging.warning(f'Failed to sync {self.store.n_pending} journal operations of {self.user}: {error}')
+
+    def close(self):
+        """ Stops the sync thread, replays the pending operations, if possible, and closes the store,
+            operations failing to be replayed remaining pending; no-op for language-scoped handles """
+
+        if not self._owning:
+            return
+
+        self._closed.set()
+        if self._sync_thread is not None:
+            self._sync_thread.join()
+        self._sync_logging_errors()
+        self.store.close()
+
+    def __enter__(self) -> UserJournal:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
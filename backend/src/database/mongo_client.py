@@ -2,22 +2,53 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+import time
 
 from monostate import MonoState
 from pymongo import MongoClient
 
+from backend.src.database.command_monitoring import CommandMonitor
+from backend.src.database.connection_pool import PoolMonitor, PoolOptions, PoolStatistics
 from backend.src.utils.io import load_config_section
 
 
 class Client(MongoClient, MonoState):
-    def __init__(self, server_selection_timeout: int):
+    """ Process-wide client, whose connection pool is shared by all database handles
+
+        Args:
+            command_monitor: recording the command metrics, one without sinks, but exporting the pool
+                statistics alongside the command metrics, being employed if None """
+
+    def __init__(self, server_selection_timeout: int, pool_options: PoolOptions = PoolOptions(), command_monitor: CommandMonitor | None = None):
         MonoState.__init__(self)
+
+        self.pool_monitor = PoolMonitor()
+        self.command_monitor = command_monitor or CommandMonitor(pool_statistics=self.pool_monitor.statistics)
         MongoClient.__init__(
             self,
             host=self._client_endpoint(),
-            serverSelectionTimeoutMS=server_selection_timeout
+            serverSelectionTimeoutMS=server_selection_timeout,
+            event_listeners=[self.pool_monitor, self.command_monitor],
+            **pool_options.client_kwargs()
         )
 
+        self.pool_options = pool_options
+
+    @classmethod
+    def established(cls) -> Client | None:
+        """ Returns:
+                process-wide instance if having been instantiated successfully, None otherwise """
+
+        try:
+            instance = cls.instance()
+        except AttributeError:
+            return None
+
+        # read from __dict__, as MongoClient.__getattr__ returns databases
+        if instance.__dict__.get('pool_options') is None:
+            return None
+        return instance
+
     @staticmethod
     def _client_endpoint() -> str:
         """ Uses srv endpoint """
@@ -41,4 +72,36 @@ class Client(MongoClient, MonoState):
         """ Triggers errors.ServerSelectionTimeoutError in case of its
             foundation being present """
 
-        self.server_info()
\ No newline at end of file
+        self.server_info()
+
+    # ---------------
+    # Pool
+    # ---------------
+    @property
+    def pool_statistics(self) -> PoolStatistics:
+        return self.pool_monitor.statistics
+
+    def warm_up(self, timeout: float = 5.0) -> bool:
+        """ Establishes a connection by means of a ping, and waits for the min_pool_size
+            connections to be established by the pool in the background
+
+            Returns:
+                whether min_pool_size connections are open before timeout seconds having elapsed
+
+            Raises:
+                errors.ServerSelectionTimeoutError in case of the server being unreachable """
+
+        deadline = time.monotonic() + timeout
+        self.admin.command('ping')
+        while self.pool_statistics.n_open_connections < self.pool_options.min_pool_size:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def healthy(self) -> bool:
+        """ Returns:
+                whether a writable server is known to be reachable, as per the latest heartbeat of
+                the background server monitoring, hence without a round trip """
+
+        return self.topology_description.has_writable_server()
\ No newline at end of file
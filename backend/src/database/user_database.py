@@ -1,44 +1,150 @@
 from __future__ import annotations
 
 from abc import ABC
+from contextvars import ContextVar
 import datetime
-from itertools import starmap
-from typing import Iterator, TypedDict
-
-from typing_extensions import TypeAlias
-
-from backend.src.database._utils import ID, id_popped, UNIQUE_ID_FILTER
+from functools import wraps
+from typing import Callable, Iterable, Iterator, TypedDict, TypeVar
+
+from more_itertools import chunked
+from pymongo import MongoClient, ReturnDocument, UpdateOne
+
+from backend.src.database._mapping import (
+    DOCUMENT_ACCESS_EXCEPTIONS,
+    LanguageMetadataMapping,
+    LanguageScopedMapping,
+    ParaphraseIndexMapping,
+    Streak,
+    TrainingChronicMapping,
+    VocableScheduleMapping,
+    VocabularyChanges,
+    VocabularyMapping
+)
+from backend.src.database._utils import ID, UNIQUE_ID_FILTER
 from backend.src.database.extended_collection import ExtendedCollection
 from backend.src.database.extended_database import ExtendedDatabase
-from backend.src.types.vocable_entry import VocableEntry
+from backend.src.database.mongo_client import Client
+from backend.src.database.write_behind_buffer import WriteBehindBuffer
+from backend.src.types.session_checkpoint import SessionCheckpoint
+from backend.src.types.vocable_entry import BaseVocableEntry, the_stripped_meaning, VocableEntries
+
+
+_Function = TypeVar('_Function', bound=Callable)
 
 
 class UserDatabase(ExtendedDatabase):
-    def __init__(self, user: str, language: str = str()):
-        super().__init__(name=user)
+    """ Handle of the database of one user, scoped to one language, to be instantiated once per session,
+        whereby one process may serve multiple concurrent users, all handles sharing the connection
+        pool of one client
+
+        The handle instantiated last within the current context, that is thread or asyncio task,
+        is returned by instance and injected by receiver, unless a handle is passed explicitly
+
+        Args:
+            write_behind_buffer: buffer to be shared with another handle of the same session,
+                a dedicated one being created if None
+            current: whether to become the current handle of the current context """
+
+    def __init__(self, user: str, language: str = str(), client: MongoClient | None = None, write_behind_buffer: WriteBehindBuffer | None = None, current=True):
+        super().__init__(name=user, client=client)
 
         self.language = language
+        self.write_behind_buffer = write_behind_buffer if write_behind_buffer is not None else WriteBehindBuffer()
 
         self.vocabulary_collection = VocabularyCollection(self)
         self.training_chronic_collection = TrainingChronicCollection(self)
         self.language_metadata_collection = LanguageMetadataCollection(self)
+        self.vocable_schedule_collection = VocableScheduleCollection(self)
+        self.paraphrase_index_collection = ParaphraseIndexCollection(self)
 
         self._collections: list[_UserCollection] = [
             self.vocabulary_collection,
             self.training_chronic_collection,
-            self.language_metadata_collection
+            self.language_metadata_collection,
+            self.vocable_schedule_collection,
+            self.paraphrase_index_collection
         ]
 
+        if current:
+            _current_user_database.set(self)
+
     @property
     def user(self) -> str:
         return self.name
 
+    def for_language(self, language: str) -> UserDatabase:
+        """ Returns:
+                handle of the same user, client and write-behind buffer, scoped to language,
+                the current handle remaining unaltered """
+
+        return UserDatabase(self.user, language, client=self.client, write_behind_buffer=self.write_behind_buffer, current=False)
+
+    def close(self):
+        """ Flushes the pending updates, to be called at the end of the session, as
+            the write-behind buffer otherwise remains registered until interpreter exit """
+
+        self.write_behind_buffer.close()
+
+    def __enter__(self) -> UserDatabase:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # ---------------
+    # Current Handle
+    # ---------------
+    @classmethod
+    def instance(cls) -> UserDatabase:
+        """ Returns:
+                handle instantiated last within the current context
+
+            Raises:
+                AttributeError: if none instantiated yet """
+
+        try:
+            return _current_user_database.get()
+        except LookupError:
+            raise AttributeError(f"{cls.__name__} hasn't been instantiated within the current context yet")
+
+    @classmethod
+    def receiver(cls, f: _Function) -> _Function:
+        """ Function decorator, passing the current handle as kwarg 'user_database' to f,
+            unless passed explicitly """
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if kwargs.get('user_database') is None:
+                kwargs['user_database'] = cls.instance()
+            return f(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
     def remove_language_related_documents(self):
         for collection in self._collections:
             collection.remove_language_related_documents()
 
 
-class _UserCollection(ExtendedCollection, ABC):
+_current_user_database: ContextVar[UserDatabase] = ContextVar('current_user_database')
+
+
+_Method = TypeVar('_Method', bound=Callable)
+
+
+def _flushing_pending_writes(method: _Method) -> _Method:
+    """ Decorator for collection methods accessing the database directly, flushing the updates
+        pending within the write-behind buffer beforehand, in order for reads to reflect them
+        and writes to succeed them """
+
+    @wraps(method)
+    def wrapper(self: _UserCollection, *args, **kwargs):
+        self._user_database.write_behind_buffer.flush()
+        return method(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+class _UserCollection(ExtendedCollection, LanguageScopedMapping, ABC):
     def __init__(self, database: UserDatabase):
         super().__init__(database=database)
 
@@ -52,148 +158,396 @@ class _UserCollection(ExtendedCollection, ABC):
     def user(self) -> str:
         return self._user_database.user
 
+    @_flushing_pending_writes
     def remove_language_related_documents(self):
         self.delete_one(filter=self._language_id_filter)
 
-    @property
-    def _language_id_filter(self) -> dict:
-        return {ID: self.language}
 
+class VocabularyCollection(_UserCollection, VocabularyMapping):
+    """ {language: language,
+         vocable: target language token,
+         t: translation_field,
+         tf: times_faced,
+         s: score,
+         lfd: last_faced_date, as epoch day,
+         due: epoch day as of which the entry is due for training}
 
-_DOCUMENT_ACCESS_EXCEPTIONS = (KeyError, TypeError)
+        One document per entry, indexed by (language, vocable), uniquely, and by (language, due),
+        whereby entry updates and due entry queries don't scale with the vocabulary size
 
+        Supersedes the legacy layout of one document per language,
+            {_id: language, $target_language_token: {t, tf, s, lfd}},
+        whose documents are migrated upon the first read of their language, or at once by
+        means of migrate_language_documents """
 
-class _VocableDataCorpus(TypedDict):
-    t: str
-    tf: int
-    s: float
-    lfd: str | None
+    def __init__(self, database: UserDatabase):
+        super().__init__(database)
+
+        self._indexes_ensured = False
+        self._migrated_languages: set[str] = set()
+
+    @_flushing_pending_writes
+    def vocabulary_possessing_languages(self) -> set[str]:
+        return set(self.distinct('language')) | set(self.distinct(ID, filter=self._LEGACY_DOCUMENT_FILTER))
+
+    @_flushing_pending_writes
+    def entries(self) -> VocableEntries:
+        return VocableEntries.concatenated(self.query_entries())
+
+    # ---------------
+    # Queries
+    # ---------------
+    @_flushing_pending_writes
+    def vocables(self) -> list[str]:
+        """ Returns:
+                vocables of the current language, read from the (language, vocable) index """
+
+        self._ensure_migrated()
+        return [document['vocable'] for document in self.find(self._language_filter, projection={ID: False, 'vocable': True})]
+
+    @_flushing_pending_writes
+    def query_entries(self, vocables: Iterable[str] | None = None, due_only=False, today: int | None = None, page_size: int = VocabularyMapping._QUERY_PAGE_SIZE) -> Iterator[VocableEntries]:
+        """ Filters the entries server-side, by means of the (language, vocable) and (language, due)
+            indexes respectively, streaming them in batches of page_size
+
+            Args:
+                vocables: to be retrieved, all if None
+                due_only: whether to solely retrieve entries due for training, that is non-perfected ones
+                today: epoch day, wrt which the perfection is to be determined, defaulting to the one of today
+
+            Yields:
+                non-empty pages of up to page_size entries """
+
+        self._ensure_migrated()
+
+        entry_documents = self.find(self._entries_query(vocables, due_only, today), projection=self._ENTRY_PROJECTION, batch_size=page_size)
+        for page_documents in chunked(entry_documents, page_size):
+            yield self._to_entries(page_documents)
+
+    # ---------------
+    # Legacy Layout Migration
+    # ---------------
+    @_flushing_pending_writes
+    def migrate_language_documents(self):
+        """ Migrates the legacy language documents of all languages to entry documents """
+
+        self._ensure_indexes()
+        for language_document in list(self.find(self._LEGACY_DOCUMENT_FILTER)):
+            self._migrate(language_document)
+            self._migrated_languages.add(language_document[ID])
+
+    def migrate_last_faced_dates(self):
+        """ Converts the '%Y-%m-%d' last faced date strings of all languages to epoch days,
+            which is part of the migration of the legacy language documents """
+
+        self.migrate_language_documents()
+
+    def _ensure_migrated(self):
+        """ Migrates the legacy document of the current language, if existent, once per instance """
+
+        if self.language not in self._migrated_languages:
+            self._ensure_indexes()
+            if (language_document := self.find_one({ID: self.language})) is not None:
+                self._migrate(language_document)
+            self._migrated_languages.add(self.language)
+
+    def _ensure_indexes(self):
+        if not self._indexes_ensured:
+            for keys, options in self._INDEXES:
+                self.create_index(keys, **options)
+            self._indexes_ensured = True
+
+    def _migrate(self, language_document: dict):
+        """ Upserts the entry documents of language_document and deletes it subsequently,
+            thus being idempotent as well as resumable """
+
+        if upserts := self._migration_upserts(language_document):
+            self.bulk_write(upserts, ordered=False)
+        self.delete_one({ID: language_document[ID]})
+
+    # ---------------
+    # Entry Manipulation
+    # ---------------
+    @_flushing_pending_writes
+    def remove_language_related_documents(self):
+        self.delete_many(filter=self._language_filter)
+        self.delete_one(filter=self._language_id_filter)
+        # schedule outdated by the removal, which isn't recorded as vocabulary changes
+        self._user_database.vocable_schedule_collection.remove_language_related_documents()
+
+    @_flushing_pending_writes
+    def upsert_entry(self, entry: BaseVocableEntry):
+        self._ensure_indexes()
+        previous_document = self.find_one_and_update(
+            filter=self._entry_filter(entry.vocable),
+            update={'$set': self._entry_2_document(entry)},
+            projection={ID: False, 't': True},
+            upsert=True
+        )
 
+        if previous_document is None:
+            self._user_database.vocable_schedule_collection.record_added(entry.vocable)
 
-_VocableEntryDocument: TypeAlias = dict[str, _VocableDataCorpus]
+        if (previous_translation := self._translation(previous_document)) != entry.translation:
+            if previous_translation is not None:
+                self._paraphrase_index_collection.remove(entry.vocable, the_stripped_meaning(previous_translation))
+            self._paraphrase_index_collection.add(entry.vocable, entry.the_stripped_meaning)
 
+    @_flushing_pending_writes
+    def delete_entry(self, entry: BaseVocableEntry):
+        self.delete_one(filter=self._entry_filter(entry.vocable))
+        self._user_database.vocable_schedule_collection.record_deleted(entry.vocable)
+        self._paraphrase_index_collection.remove(entry.vocable, entry.the_stripped_meaning)
 
-class VocabularyCollection(_UserCollection):
-    """ {'_id': language,
-                 $target_language_token: {t: translation_field
-                                          tf: times_faced
-                                          s: score
-                                          lfd: last_faced_date}} """
+    def update_entry(self, vocable: str, new_score: float):
+        """ Buffered, coalescing the updates of repeatedly faced vocables """
 
-    @staticmethod
-    def _entry_2_document(entry: VocableEntry) -> _VocableEntryDocument:
-        return {
-            entry.vocable: {
-                't': entry.translation,
-                'tf': entry.times_faced,
-                's': entry.score,
-                'lfd': entry.last_faced_date
-            }
-        }
+        self._user_database.write_behind_buffer.update_one(
+            self,
+            filter=self._entry_filter(vocable),
+            update=self._entry_update(new_score)
+        )
 
-    @staticmethod
-    def _to_entry(vocable: str, entry_corpus: dict) -> VocableEntry:
-        return VocableEntry(
-            vocable=vocable,
-            translation=entry_corpus['t'],
-            times_faced=entry_corpus['tf'],
-            score=entry_corpus['s'],
-            last_faced_date=entry_corpus['lfd']
+    @_flushing_pending_writes
+    def alter_entry(self, old_vocable: str, altered_vocable_entry: BaseVocableEntry):
+        # delete old entry document regardless of whether the vocable has changed
+        previous_document = self.find_one_and_delete(
+            filter=self._entry_filter(old_vocable),
+            projection={ID: False, 't': True}
         )
+        if previous_document is not None:
+            self._user_database.vocable_schedule_collection.record_deleted(old_vocable)
+        if (previous_translation := self._translation(previous_document)) is not None:
+            self._paraphrase_index_collection.remove(old_vocable, the_stripped_meaning(previous_translation))
 
-    def vocabulary_possessing_languages(self) -> set[str]:
-        return set(self._ids())
+        self.upsert_entry(altered_vocable_entry)
 
-    def entries(self) -> Iterator[VocableEntry]:
-        vocable_entry_document: dict | None = self.find_one(self.language)
-        assert vocable_entry_document is not None
-        vocable_entry_documents = id_popped(vocable_entry_document)
-        return starmap(self._to_entry, vocable_entry_documents.items())
+    @property
+    def _paraphrase_index_collection(self) -> ParaphraseIndexCollection:
+        return self._user_database.paraphrase_index_collection
+
+
+class ParaphraseIndexCollection(_UserCollection, ParaphraseIndexMapping):
+    """ {language: language,
+         meaning: the-stripped translation,
+         vocables: [$vocable possessing meaning]}
+
+        Maintained by the VocabularyCollection upon each entry manipulation """
 
-    def upsert_entry(self, entry: VocableEntry):
+    def remove_language_related_documents(self):
+        self.delete_many(filter=self._language_filter)
+
+    def add(self, vocable: str, meaning: str):
         self.update_one(
-            filter=self._language_id_filter,
-            update={'$set': self._entry_2_document(entry)},
+            filter=self._meaning_filter(meaning),
+            update={'$addToSet': {'vocables': vocable}},
             upsert=True
         )
 
-    def delete_entry(self, entry: VocableEntry):
+    def remove(self, vocable: str, meaning: str):
         self.update_one(
-            filter=self._language_id_filter,
-            update={'$unset': self._entry_2_document(entry)}
+            filter=self._meaning_filter(meaning),
+            update={'$pull': {'vocables': vocable}}
         )
+        self.delete_one(filter=self._meaning_filter(meaning) | {'vocables': {'$size': 0}})
 
-    def update_entry(self, vocable: str, new_score: float):
-        self.find_one_and_update(
-            filter=self._language_id_filter | {vocable: {'$exists': True}},
-            update={
-                '$inc': {f'{vocable}.tf': 1},
-                '$set': {
-                    f'{vocable}.lfd': str(datetime.date.today()),
-                    f'{vocable}.s': new_score
-                }
-            }
-        )
+    def paraphrases(self) -> dict[str, list[str]]:
+        """ Returns:
+                Dict[meaning: [synonym_1, synonym_2, ..., synonym_n]]
 
-    def alter_entry(self, old_vocable: str, altered_vocable_entry: VocableEntry):
-        # delete old sub document corresponding to old_vocable regardless of whether the vocable,
-        # that is the sub document key has changed
-        self.find_one_and_update(
-            filter=self._language_id_filter,
-            update={'$unset': {old_vocable: 1}}
-        )
-        self.upsert_entry(altered_vocable_entry)
+                for n >= 2 vocables possessing the IDENTICAL meaning; builds the index
+                from the vocabulary if not having been built yet, regardless of documents
+                having been added in the meantime """
+
+        if self.find_one(filter=self._built_marker_filter) is None:
+            self._build()
+        return self._paraphrases(list(self.find(filter=self._paraphrases_filter, projection=self._PARAPHRASES_PROJECTION)))
+
+    def _build(self):
+        """ Upserts the index documents, being thus idempotent, and the built marker """
+
+        paraphrase_index_documents = self._paraphrase_index_documents(self._user_database.vocabulary_collection.entries())
 
+        self.create_index(self._INDEX, unique=True)
+        self.bulk_write(self._build_requests(paraphrase_index_documents), ordered=False)
 
-class TrainingChronicCollection(_UserCollection):
+
+class VocableScheduleCollection(_UserCollection, VocableScheduleMapping):
     """ {_id: language,
-                 $date: {$trainer_shortform: n_faced_items}} """
+                 schedule: {v: vocables,
+                            d: dues,
+                            e: eases,
+                            i: intervals,
+                            r: repetitions},
+                 added: [$vocable],
+                 deleted: [$vocable]}
 
-    def upsert_session_statistics(self, trainer_shortform: str, n_faced_items: int):
-        self._add_to_training_chronic(trainer_shortform, n_faced_items)
-        self._upsert_last_session_statistics(trainer_shortform, n_faced_items)
+        The vocabulary changes are recorded by the VocabularyCollection upon each entry manipulation """
+
+    def upsert_schedule(self, schedule_document: dict[str, list], reconciled_changes: VocabularyChanges | None = None):
+        """ Args:
+                reconciled_changes: vocabulary changes the schedule has been synchronized with, being
+                    pulled, whilst the ones recorded in the meantime are retained """
 
-    def _add_to_training_chronic(self, trainer_shortform: str, n_faced_items: int):
         self.update_one(
             filter=self._language_id_filter,
-            update={'$inc': {f'{datetime.date.today()}.{trainer_shortform}': n_faced_items}},
+            update=self._schedule_update(schedule_document, reconciled_changes or VocabularyChanges()),
             upsert=True
         )
 
+    def schedule(self) -> dict[str, list] | None:
+        return self.schedule_and_vocabulary_changes()[0]
+
+    def schedule_and_vocabulary_changes(self) -> tuple[dict[str, list] | None, VocabularyChanges]:
+        """ Returns:
+                stored schedule, None if not stored yet, vocabulary changes recorded since its persistence """
+
+        document = self.find_one(filter=self._language_id_filter)
+        return (document or {}).get('schedule'), VocabularyChanges.from_document(document)
+
+    def record_added(self, vocable: str):
+        self.update_one(filter=self._language_id_filter, update=self._vocable_added_update(vocable), upsert=True)
+
+    def record_deleted(self, vocable: str):
+        self.update_one(filter=self._language_id_filter, update=self._vocable_deleted_update(vocable), upsert=True)
+
+
+class TrainingChronicCollection(_UserCollection, TrainingChronicMapping):
+    """ {_id: language,
+                 $date: {$trainer_shortform: n_faced_items},
+                 weeks: {$iso_week: {$trainer_shortform: n_faced_items}},
+                 months: {$month: {$trainer_shortform: n_faced_items}},
+                 total: {$trainer_shortform: n_faced_items},
+                 streak: {length: int, longest: int, lastDate: $date}}
+
+        The rollups and the streak are maintained by the same pipeline update incrementing
+        the daily statistics, whereas the ones of documents preceding their introduction are
+        rebuilt server-side upon the first access of the language by the instance """
+
+    def __init__(self, database: UserDatabase):
+        super().__init__(database)
+
+        self._rollups_ensured_languages: set[str] = set()
+
+    def upsert_session_statistics(self, trainer_shortform: str, n_faced_items: int):
+        """ Flushes the write-behind buffer, comprising the vocabulary updates of the ending session,
+            the training chronic pipeline update, which isn't mergeable by the buffer, being written
+            within the very bulk write of the collection's buffered updates """
+
+        self._ensure_rollups()
+        self._upsert_last_session_statistics(trainer_shortform, n_faced_items)
+        self._user_database.write_behind_buffer.flush(
+            (self, UpdateOne(self._language_id_filter, self._training_chronic_update(trainer_shortform, n_faced_items), upsert=True))
+        )
+
     def _upsert_last_session_statistics(self, trainer_shortform: str, n_faced_items: int):
-        self.update_one(
+        self._user_database.write_behind_buffer.update_one(
+            self,
             filter=UNIQUE_ID_FILTER,
-            update={'$set': {'lastSession': {'trainer': trainer_shortform,
-                                             'nFacedItems': n_faced_items,
-                                             'date': str(datetime.date.today()),
-                                             'language': self.language}}},
+            update=self._last_session_statistics_update(trainer_shortform, n_faced_items),
             upsert=True
         )
 
+    @_flushing_pending_writes
     def last_session_statistics(self) -> LastSessionStatistics | None:
         try:
             return self.find_one(UNIQUE_ID_FILTER)['lastSession']  # type: ignore
-        except _DOCUMENT_ACCESS_EXCEPTIONS:
+        except DOCUMENT_ACCESS_EXCEPTIONS:
             return None
 
+    # ------------------
+    # Session Checkpoints
+    # ------------------
+    def upsert_session_checkpoint(self, trainer_shortform: str, checkpoint: SessionCheckpoint):
+        """ Buffered, coalescing the checkpoints persisted upon every faced item """
+
+        self._user_database.write_behind_buffer.update_one(
+            self,
+            filter=UNIQUE_ID_FILTER,
+            update={'$set': {self._session_checkpoint_field(trainer_shortform): checkpoint.to_document()}},
+            upsert=True
+        )
+
+    @_flushing_pending_writes
+    def session_checkpoint(self, trainer_shortform: str) -> SessionCheckpoint | None:
+        document = self.find_one(UNIQUE_ID_FILTER, projection={self._session_checkpoint_field(trainer_shortform): True})
+        return self._session_checkpoint(document, trainer_shortform)
+
+    @_flushing_pending_writes
+    def delete_session_checkpoint(self, trainer_shortform: str):
+        self.update_one(
+            filter=UNIQUE_ID_FILTER,
+            update={'$unset': {self._session_checkpoint_field(trainer_shortform): 1}}
+        )
+
     def upsert_language_placeholder_document(self, language: str):
         """ In order to persist language after selection however without having
             actually conducted any training actions on it yet """
 
         self.update_one(
             filter={ID: language},
-            update={'$set': {str(datetime.date.today()): None}},
+            update=self._language_placeholder_update(),
             upsert=True
         )
 
+    @_flushing_pending_writes
     def comprised_languages(self) -> set[str]:
         return set(self._ids()) - {'unique'}
 
+    @_flushing_pending_writes
     def training_chronic(self) -> TrainingChronic | None:
-        try:
-            return TrainingChronic(id_popped(self.find_one(self._language_id_filter)))  # type: ignore
-        except TypeError:
+        """ Returns:
+                entire daily statistics, preferably to be queried by means of daily_statistics """
+
+        if (document := self.find_one(self._language_id_filter, projection=self._DAILY_STATISTICS_PROJECTION)) is None:
             return None
+        return TrainingChronic(document)
+
+    # ------------------
+    # Rollups
+    # ------------------
+    def daily_statistics(self, first_date: datetime.date, last_date: datetime.date) -> TrainingChronic:
+        """ Returns:
+                statistics of the days within [first_date, last_date], filtered server-side """
+
+        return self._ranged_statistics(list(self.aggregate(self._ranged_statistics_pipeline(None, str(first_date), str(last_date)))))
+
+    def weekly_statistics(self, first_date: datetime.date, last_date: datetime.date) -> TrainingChronic:
+        """ Returns:
+                statistics of the ISO weeks, e.g. '2022-W11', comprising the days within [first_date, last_date] """
+
+        self._ensure_rollups()
+        return self._ranged_statistics(list(self.aggregate(self._ranged_statistics_pipeline(self._WEEKS, self._week_key(first_date), self._week_key(last_date)))))
+
+    def monthly_statistics(self, first_date: datetime.date, last_date: datetime.date) -> TrainingChronic:
+        """ Returns:
+                statistics of the months, e.g. '2022-03', comprising the days within [first_date, last_date] """
+
+        self._ensure_rollups()
+        return self._ranged_statistics(list(self.aggregate(self._ranged_statistics_pipeline(self._MONTHS, self._month_key(first_date), self._month_key(last_date)))))
+
+    def total_statistics(self) -> dict[str, int]:
+        self._ensure_rollups()
+        if (document := self.find_one(self._language_id_filter, projection={ID: False, self._TOTAL: True})) is None:
+            return {}
+        return document.get(self._TOTAL, {})
+
+    def streak(self, today: datetime.date | None = None) -> Streak | None:
+        """ Returns:
+                current streak, of length 0 if neither trained today nor yesterday, None if never trained """
+
+        self._ensure_rollups()
+        document = self.find_one(self._language_id_filter, projection={ID: False, self._STREAK: True})
+        return self._current_streak((document or {}).get(self._STREAK), today)
+
+    def _ensure_rollups(self, language: str | None = None):
+        """ Rebuilds the rollups and the streak of the document of language, defaulting to the
+            current one, if lacking them, by means of one conditional pipeline update, once per
+            instance and language """
+
+        if (language := language or self.language) not in self._rollups_ensured_languages:
+            self.update_one(filter=self._rollups_lacking_filter(language), update=self._rollups_rebuild_update())
+            self._rollups_ensured_languages.add(language)
 
 
 TrainingChronic = dict[str, dict[str, int]]
@@ -206,85 +560,92 @@ class LastSessionStatistics(TypedDict):
     language: str
 
 
-class LanguageMetadataCollection(_UserCollection):
+class LanguageMetadataCollection(_UserCollection, LanguageMetadataMapping):
     """ {_id: $language,
-                new_value: {$new_value: {playbackSpeed: float
-                                              use: bool}}
-                ttsEnabled: bool} """
+                accent: str,
+                playbackSpeed: {$language_identifier: float},
+                ttsEnabled: bool,
+                version: int}
+
+        Read through a cache shared by all instances, keyed by user and document id, whose documents are
+        loaded once by a projected find_one and written through by the upserts, which increment
+        the document version
+
+        Args:
+            cache_ttl: seconds after which cached documents are to be reloaded, never if None
+            version_validated: whether to compare the version of cached documents with the stored one
+                upon their first query by the instance, reloading them on deviation, thus reflecting
+                upserts of other processes at the expense of one version lookup per instance and document """
+
+    def __init__(self, database: UserDatabase, cache_ttl: float | None = None, version_validated=False):
+        super().__init__(database)
+
+        self._cache_ttl = cache_ttl
+        self._version_validated = version_validated
+        self._validated_document_ids: set[str] = set()
+
+    def _cached_document(self, document_id: str) -> dict:
+        cached_document = self._fresh_cached_document(document_id)
+
+        if cached_document is not None and self._requires_version_validation(document_id):
+            if not self._version_matches(cached_document, self.find_one(filter={ID: document_id}, projection=self._VERSION_PROJECTION)):
+                cached_document = None
+
+        if cached_document is None:
+            return self._cache(document_id, self.find_one(filter={ID: document_id}, projection=self._PROJECTION))
+        self._validated_document_ids.add(document_id)
+        return cached_document.document
+
+    def _upsert(self, document_id: str, fields: dict):
+        """ Writes fields through, caching the updated document """
+
+        self._cache(
+            document_id,
+            self.find_one_and_update(
+                filter={ID: document_id},
+                update=self._upsert_update(fields),
+                projection=self._PROJECTION,
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        )
+
+    def remove_language_related_documents(self):
+        super().remove_language_related_documents()
+        self._uncache_language_document()
 
     # ------------------
     # Accent
     # ------------------
     def upsert_accent(self, accent: str):
-        self.language_metadata_collection.update_one(
-            filter=self._language_id_filter,
-            update={'$set': {'accent': accent}},
-            upsert=True
-        )
+        self._upsert(self.language, {'accent': accent})
 
     def query_accent(self) -> str | None:
-        """ assumes existence of varietyIdentifier sub dict in case of
-            existence of language related collection """
-
-        try:
-            return self.find_one(filter=self._language_id_filter)['accent']  # type: ignore
-        except _DOCUMENT_ACCESS_EXCEPTIONS:
-            return None
+        return self._cached_document(self.language).get('accent')
 
     # ------------------
     # Playback Speed
     # ------------------
     def upsert_playback_speed(self, accent: str, playback_speed: float):
-        self.update_one(
-            filter=self._language_id_filter,
-            update={'$set': {f'playbackSpeed.{accent}': playback_speed}},
-            upsert=True
-        )
+        self._upsert(self.language, {f'playbackSpeed.{accent}': playback_speed})
 
     def query_playback_speed(self, accent: str) -> float | None:
-        try:
-            return self.find_one(filter=self._language_id_filter)['playbackSpeed'][accent]  # type: ignore
-        except _DOCUMENT_ACCESS_EXCEPTIONS:
-            return None
+        return self._playback_speed(self._cached_document(self.language), accent)
 
     # ------------------
     # Enablement
     # ------------------
     def upsert_tts_enablement(self, value: bool):
-        self.update_one(
-            filter=self._language_id_filter,
-            update={
-                '$set': {
-                    'ttsEnabled': value
-                }
-            },
-            upsert=True
-        )
+        self._upsert(self.language, {'ttsEnabled': value})
 
-    def query_tts_enablement(self):
-        try:
-            return self.find_one(filter=self._language_id_filter)['ttsEnabled']  # type: ignore
-        except _DOCUMENT_ACCESS_EXCEPTIONS:
-            return None
+    def query_tts_enablement(self) -> bool | None:
+        return self._cached_document(self.language).get('ttsEnabled')
 
     # ------------------
     # English Training
     # ------------------
-    _ENGLISH_TRAINING_FILTER = {ID: 'englishTraining'}
-
     def upsert_reference_language(self, reference_language: str):
-        self.update_one(
-            filter=self._ENGLISH_TRAINING_FILTER,
-            update={
-                '$set': {
-                    'referenceLanguage': reference_language
-                }
-            },
-            upsert=True
-        )
+        self._upsert(self._ENGLISH_TRAINING_ID, {'referenceLanguage': reference_language})
 
     def query_reference_language(self) -> str | None:
-        try:
-            return self.find_one(filter=self._ENGLISH_TRAINING_FILTER)['referenceLanguage']  # type: ignore
-        except _DOCUMENT_ACCESS_EXCEPTIONS:
-            return None
\ No newline at end of file
+        return self._cached_document(self._ENGLISH_TRAINING_ID).get('referenceLanguage')
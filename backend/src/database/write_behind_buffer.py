@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import atexit
+from dataclasses import dataclass
+import json
+import logging
+from threading import RLock, Timer
+
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError, ConnectionFailure, PyMongoError
+
+from backend.src.database.command_monitoring import tagged
+
+
+_MERGEABLE_OPERATORS = ('$inc', '$set', '$unset')
+
+_Update = dict[str, dict]
+_Key = tuple[str, str, bool]  # collection name, serialized filter, upsert
+
+
+@dataclass
+class WriteBehindStatistics:
+    """ n_flushed_updates: updates having been passed to the buffer and flushed since
+        n_written_updates: coalesced updates written by means of bulk writes
+        n_bulk_writes: bulk write round trips, one per collection and flush """
+
+    n_flushed_updates: int = 0
+    n_written_updates: int = 0
+    n_bulk_writes: int = 0
+
+    @property
+    def n_saved_operations(self) -> int:
+        return self.n_flushed_updates - self.n_written_updates
+
+    @property
+    def n_saved_round_trips(self) -> int:
+        return self.n_flushed_updates - self.n_bulk_writes
+
+
+@dataclass
+class _PendingUpdate:
+    collection: Collection
+    filter: dict
+    update: _Update
+    upsert: bool
+    n_coalesced: int = 1
+
+
+class WriteBehindBuffer:
+    """ Coalesces updates of identical collection, filter and upsert, by merging their $inc, $set
+        and $unset fields, and writes them by means of one unordered bulk write per collection, once
+        max_n_pending updates are pending, max_delay seconds after the first pending update,
+        upon flush calls, as well as at interpreter exit
+
+        Updates of different, yet not provably disjoint filters, targeting paths overlapping with
+        the ones of pending updates, as well as non-mergeable updates of identical filter, cause
+        a preceding flush, as the order of unordered bulk writes is not guaranteed
+
+        Updates failing to be written due to connection errors are retained, being written at least
+        once, and retried max_delay seconds after the failed flush. Updates rejected by the database,
+        on the other hand, are logged and dropped, as retrying them would fail likewise """
+
+    def __init__(self, max_n_pending: int = 256, max_delay: float = 5.0):
+        self._max_n_pending = max_n_pending
+        self._max_delay = max_delay
+
+        self._key_2_pending_update: dict[_Key, _PendingUpdate] = {}
+        self._lock = RLock()
+        self._timer: Timer | None = None
+
+        self.statistics = WriteBehindStatistics()
+
+        atexit.register(self._flush_at_exit)
+
+    @property
+    def n_pending(self) -> int:
+        return len(self._key_2_pending_update)
+
+    def update_one(self, collection: Collection, filter: dict, update: _Update, upsert=False):
+        if unmergeable_operators := update.keys() - set(_MERGEABLE_OPERATORS):
+            raise ValueError(f'Non-mergeable update operators {unmergeable_operators}')
+
+        key = (collection.full_name, json.dumps(filter, sort_keys=True, default=str), upsert)
+
+        with self._lock:
+            if self._overlaps_with_other_pending_updates(key, filter, update):
+                self.flush()
+
+            if (pending_update := self._key_2_pending_update.get(key)) is not None:
+                if (merged_update := _merged_update(pending_update.update, update)) is not None:
+                    pending_update.update = merged_update
+                    pending_update.n_coalesced += 1
+                else:
+                    self.flush()
+                    pending_update = None
+
+            if pending_update is None:
+                if (merged_update := _merged_update({}, update)) is None:
+                    raise ValueError(f'Update addressing overlapping paths {update}')
+                self._key_2_pending_update[key] = _PendingUpdate(collection, filter, merged_update, upsert)
+
+            if self.n_pending >= self._max_n_pending:
+                self.flush()
+            else:
+                self._arm_timer()
+
+    def _arm_timer(self):
+        if self._timer is None:
+            self._timer = Timer(self._max_delay, self._flush_on_timeout)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _overlaps_with_other_pending_updates(self, key: _Key, filter: dict, update: _Update) -> bool:
+        """ Returns:
+                whether update addresses paths overlapping with the ones of pending updates of the same
+                collection yet another filter, which is not disjoint with filter, thus possibly
+                targeting the same document """
+
+        paths = [path for fields in update.values() for path in fields]
+        return any(
+            pending_key != key and pending_key[0] == key[0] and not _filters_disjoint(filter, pending_update.filter) and _paths_overlap(path, pending_path)
+            for pending_key, pending_update in self._key_2_pending_update.items()
+            for fields in pending_update.update.values()
+            for pending_path in fields
+            for path in paths
+        )
+
+    # ---------------
+    # Flushing
+    # ---------------
+    @tagged
+    def flush(self, *accompanying_requests: tuple[Collection, UpdateOne]):
+        """ Writes the pending updates, holding the lock throughout, in order for flush calls
+            returning to guarantee the preceding updates having been written
+
+            Args:
+                accompanying_requests: collections and unbuffered requests thereof, e.g. pipeline
+                    updates, being written within the bulk write of the collection's pending updates
+                    rather than by a round trip of their own, thus not to rely on being ordered
+                    relative to them. Neither retained nor retried upon failing
+
+            Raises:
+                PyMongoError, after all collections' writes having been attempted, the timer being
+                re-armed if updates have been retained """
+
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            pending_updates, self._key_2_pending_update = self._key_2_pending_update, {}
+
+            collection_name_2_pending_updates: dict[str, list[tuple[_Key, _PendingUpdate]]] = {}
+            for key, pending_update in pending_updates.items():
+                collection_name_2_pending_updates.setdefault(key[0], []).append((key, pending_update))
+
+            collection_name_2_collection = {pending_update.collection.full_name: pending_update.collection for pending_update in pending_updates.values()}
+            collection_name_2_accompanying_requests: dict[str, list[UpdateOne]] = {}
+            for collection, request in accompanying_requests:
+                collection_name_2_collection.setdefault(collection.full_name, collection)
+                collection_name_2_accompanying_requests.setdefault(collection.full_name, []).append(request)
+
+            error: PyMongoError | None = None
+            for collection_name, collection in collection_name_2_collection.items():
+                try:
+                    self._bulk_write(
+                        collection,
+                        collection_name_2_pending_updates.get(collection_name, []),
+                        accompanying_requests=collection_name_2_accompanying_requests.get(collection_name, [])
+                    )
+                except PyMongoError as write_error:
+                    error = write_error
+            if error is not None:
+                if self._key_2_pending_update:
+                    self._arm_timer()
+                raise error
+
+    def _bulk_write(self, collection: Collection, keyed_pending_updates: list[tuple[_Key, _PendingUpdate]], accompanying_requests: list[UpdateOne]):
+        """ Args:
+                accompanying_requests: appended to the requests of the pending updates, not being
+                    accounted for by the statistics """
+
+        try:
+            collection.bulk_write(
+                [UpdateOne(pending_update.filter, pending_update.update, upsert=pending_update.upsert) for _, pending_update in keyed_pending_updates] + accompanying_requests,
+                ordered=False
+            )
+        except BulkWriteError as error:
+            write_errors = error.details.get('writeErrors', [])
+            for write_error in write_errors:
+                if write_error['index'] < len(keyed_pending_updates):
+                    logging.error(f'Dropping update {keyed_pending_updates[write_error["index"]][1].update} of {collection.full_name} rejected by the database: {write_error["errmsg"]}')
+                else:
+                    logging.error(f'Dropping request {accompanying_requests[write_error["index"] - len(keyed_pending_updates)]} of {collection.full_name} rejected by the database: {write_error["errmsg"]}')
+            self._record_bulk_write(keyed_pending_updates, written_indices=set(range(len(keyed_pending_updates))) - {write_error['index'] for write_error in write_errors})
+            return
+        except ConnectionFailure:
+            self._retain(keyed_pending_updates)
+            raise
+        except PyMongoError as error:
+            logging.error(f'Dropping {len(keyed_pending_updates) + len(accompanying_requests)} updates of {collection.full_name} rejected by the database: {error}')
+            raise
+        self._record_bulk_write(keyed_pending_updates, written_indices=set(range(len(keyed_pending_updates))))
+
+    def _retain(self, keyed_pending_updates: list[tuple[_Key, _PendingUpdate]]):
+        for key, pending_update in keyed_pending_updates:
+            self._key_2_pending_update.setdefault(key, pending_update)
+
+    def _record_bulk_write(self, keyed_pending_updates: list[tuple[_Key, _PendingUpdate]], written_indices: set[int]):
+        self.statistics.n_bulk_writes += 1
+        self.statistics.n_written_updates += len(written_indices)
+        self.statistics.n_flushed_updates += sum(keyed_pending_updates[i][1].n_coalesced for i in written_indices)
+
+    def close(self):
+        """ Flushes and unregisters the flushing at interpreter exit """
+
+        atexit.unregister(self._flush_at_exit)
+        self.flush()
+
+    def _flush_on_timeout(self):
+        try:
+            self.flush()
+        except PyMongoError as error:
+            logging.error(f'Failed to flush {self.n_pending} pending updates on timeout: {error}')
+
+    def _flush_at_exit(self):
+        try:
+            self.flush()
+        except PyMongoError as error:
+            logging.error(f'Failed to flush {self.n_pending} pending updates at exit: {error}')
+
+
+def _merged_update(update: _Update, subsequent_update: _Update) -> _Update | None:
+    """ Returns:
+            update equivalent to update followed by subsequent_update, None if not
+            expressible as such, that is if subsequent_update addresses one of the paths
+            of update by means of another operator or an overlapping path
+
+        >>> _merged_update({'$inc': {'hund.tf': 1}, '$set': {'hund.s': 2.5}}, {'$inc': {'hund.tf': 1}, '$set': {'hund.s': 3}})
+        {'$inc': {'hund.tf': 2}, '$set': {'hund.s': 3}}
+        >>> _merged_update({'$inc': {'hund.tf': 1}}, {'$set': {'hund': {}}}) """
+
+    merged = {operator: dict(fields) for operator, fields in update.items()}
+
+    for operator, fields in subsequent_update.items():
+        for path, value in fields.items():
+            for merged_operator, merged_fields in merged.items():
+                if any(_paths_overlap(path, merged_path) and (merged_path != path or merged_operator != operator) for merged_path in merged_fields):
+                    return None
+
+            merged_fields = merged.setdefault(operator, {})
+            merged_fields[path] = merged_fields.get(path, 0) + value if operator == '$inc' else value
+
+    return merged
+
+
+def _filters_disjoint(filter: dict, other_filter: dict) -> bool:
+    """ Returns:
+            whether filter and other_filter match distinct documents, by virtue of pinning one of
+            their common fields to different values by equality, as the unique keys of the
+            buffered collections do
+
+        >>> _filters_disjoint({'language': 'Swedish', 'vocable': 'hund'}, {'language': 'Swedish', 'vocable': 'katt'})
+        True
+        >>> _filters_disjoint({'vocable': 'hund'}, {'vocable': {'$in': ['hund', 'katt']}}), _filters_disjoint({'vocable': 'hund'}, {'language': 'Swedish'})
+        (False, False) """
+
+    return any(
+        not isinstance(value, dict) and not isinstance(other_filter[field], dict) and not field.startswith('$') and value != other_filter[field]
+        for field, value in filter.items()
+        if field in other_filter
+    )
+
+
+def _paths_overlap(path: str, other_path: str) -> bool:
+    """ >>> _paths_overlap('hund.tf', 'hund'), _paths_overlap('hund', 'hundar'), _paths_overlap('hund.s', 'hund.s')
+        (True, False, True) """
+
+    return path == other_path or path.startswith(f'{other_path}.') or other_path.startswith(f'{path}.')
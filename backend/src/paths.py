@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 
@@ -10,8 +11,32 @@ TOKEN_MAPS_DIR_PATH = DATA_DIR_PATH / 'token-maps'
 META_DATA_DIR_PATH = DATA_DIR_PATH / 'meta-data'
 
 
+def _user_cache_dir_path() -> Path:
+    return Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'lingularity'
+
+
+# data derived from the corpora, being computed upon first use and keyed by the corpus versions
+CACHE_DIR_PATH = Path(os.environ['LINGULARITY_CACHE_DIR']) if 'LINGULARITY_CACHE_DIR' in os.environ else _user_cache_dir_path()
+
+
 def corpora_path(language: str) -> Path:
     return CORPORA_DIR_PATH / f'{language}.txt'
 
 
+def sentence_difficulties_path(language: str, corpus_version: str) -> Path:
+    return CACHE_DIR_PATH / 'sentence-difficulties' / f'{language}-{corpus_version}.npy'
+
+
+def pivot_join_path(language_a: str, language_b: str, corpus_versions: tuple[str, str]) -> Path:
+    return CACHE_DIR_PATH / 'pivot-joins' / f'{language_a}-{language_b}-{"-".join(corpus_versions)}.npz'
+
+
+def length_index_path(language: str, index_name: str, corpus_version: str) -> Path:
+    return CACHE_DIR_PATH / 'length-indices' / f'{language}-{index_name}-{corpus_version}.npz'
+
+
+def filtered_sentence_indices_path(language: str, digest: str) -> Path:
+    return CACHE_DIR_PATH / 'filtered-sentence-indices' / f'{language}-{digest}.npy'
+
+
 RESOURCES_DIR_PATH = _ROOT / 'resources'
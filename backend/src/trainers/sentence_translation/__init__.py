@@ -1,29 +1,313 @@
 from __future__ import annotations
 
-from backend.src.trainers.trainer_backend import TrainerBackend
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
+import hashlib
+from tempfile import _TemporaryFileWrapper
+
+import numpy as np
+
+from backend.src.trainers.trainer_backend import DatabaseHandle, TrainerBackend
 from backend.src.components.tts import TTS
+from backend.src.paths import filtered_sentence_indices_path
 from backend.src.trainers.sentence_translation import modes
-from backend.src.types.bilingual_corpus import BilingualCorpus, SentencePair
+from backend.src.trainers.sentence_translation.response_evaluation import get_sentence_evaluation, SentenceEvaluation
+from backend.src.types.bilingual_corpus import BilingualCorpus, corpus_version, SentencePair
+from backend.src.types.session_checkpoint import SessionCheckpoint
+
+
+@dataclass(frozen=True)
+class PreparedSentencePair:
+    """ Forename converted sentence pair, together with the audio of its
+        learn language sentence, being downloaded in the background, if TTS enabled """
+
+    sentence_pair: list[str]
+    audio: Future[_TemporaryFileWrapper] | None
 
 
 class SentenceTranslationTrainerBackend(TrainerBackend[SentencePair, BilingualCorpus]):
-    def __init__(self, non_english_language: str, train_english: bool):
-        super().__init__(non_english_language, train_english)
+    # key of the trainer within the training chronic, under which its session checkpoints are stored as well
+    _SHORTFORM = 's'
+    # to be incremented on changes of the item filtering, invalidating
+    # previously stored session checkpoints
+    _FILTER_VERSION = modes.FILTER_VERSION
+    # number of faced items after which the session checkpoint is persisted anew
+    _CHECKPOINT_INTERVAL = 10
+    _N_AUDIO_DOWNLOAD_WORKERS = 4
+
+    def __init__(self, non_english_language: str, train_english: bool, reference_language: str | None = None, user_database: DatabaseHandle | None = None):
+        super().__init__(non_english_language, train_english, reference_language=reference_language, user_database=user_database)
+
+        # language whose token maps the modes are to be based on
+        self._non_english_language = non_english_language if reference_language is None else self.language
+
+        # languages whose corpora the training items are drawn from
+        self._corpus_languages = [non_english_language] if reference_language is None else [non_english_language, reference_language]
+        self._sentence_indices_digest: str | None = None
 
-        self._non_english_language = non_english_language
+        # position of the last persisted session checkpoint, None prior to the first session
+        self._persisted_position: int | None = None
 
-        self.tts: TTS | None = TTS.get_if_available_for(self.language)
+        self.tts: TTS | None = TTS.get_if_available_for(self.language, user_database=self._user_database)
         self.sentence_data_filter: modes.SentenceDataFilter = None  # type: ignore
 
+        self._prepared_items: deque[PreparedSentencePair] = deque()
+
+        # whether items are being retrieved by means of get_training_items within the
+        # current session, None prior to the first retrieval
+        self._batched_retrieval: bool | None = None
+
     @property
     def tts_available(self) -> bool:
         return self.tts is not None
 
-    def set_item_iterator(self):
+    @property
+    def _mode(self) -> str:
+        return modes.mode_name(self.sentence_data_filter)
+
+    def set_item_iterator(self, checkpoint: SessionCheckpoint | None = None):
+        """ Args:
+                checkpoint: session to be resumed, whose mode is adopted; the stored session
+                    of the current mode if None """
+
+        # adopt mode of session to be resumed
+        if checkpoint is not None:
+            self.sentence_data_filter = modes.get_sentence_data_filter(checkpoint.mode)
+        else:
+            checkpoint = self.stored_checkpoint()
+
         # get sentence data
         bilingual_corpus = self._get_bilingual_corpus()
 
-        # get mode filtered sentence data
-        filtered_sentence_data = self.sentence_data_filter(bilingual_corpus, self._non_english_language)
+        # get mode filtered sentence indices, restored if persisted for the session to be resumed
+        if checkpoint is None or (sentence_indices := self._restored_sentence_indices(checkpoint)) is None:
+            sentence_indices = self._filtered_sentence_indices(bilingual_corpus)
+            self._persist_sentence_indices(sentence_indices)
+
+        self._prepared_items.clear()
+        self._batched_retrieval = None
+
+        items = self._filtered_sentence_data(bilingual_corpus, sentence_indices)
+        if checkpoint is not None and self._resumable(checkpoint, n_items=len(items)):
+            self._set_item_iterator(items, seed=checkpoint.seed, position=checkpoint.position)
+        else:
+            self._set_item_iterator(items)
+        self._persisted_position = self._position
+
+    def _filtered_sentence_indices(self, bilingual_corpus: BilingualCorpus) -> np.ndarray:
+        sentence_indices_filter = modes.get_sentence_indices_filter(self.sentence_data_filter)
+        if (learn_language_indices := bilingual_corpus.learn_language_indices) is None:
+            return sentence_indices_filter(bilingual_corpus, self._non_english_language)
+
+        # apply mode to the learn language's own corpus, which the token maps refer to,
+        # and retain the pivot corpus rows originating from its retained sentences
+        retained_sentence_indices = sentence_indices_filter(BilingualCorpus(self._non_english_language), self._non_english_language)
+        return np.flatnonzero(np.isin(learn_language_indices, retained_sentence_indices))
+
+    @staticmethod
+    def _filtered_sentence_data(bilingual_corpus: BilingualCorpus, sentence_indices: np.ndarray) -> BilingualCorpus:
+        """ Returns:
+                bilingual_corpus itself if all of its sentences are retained """
+
+        if len(sentence_indices) == len(bilingual_corpus):
+            return bilingual_corpus
+
+        filtered_sentence_data = bilingual_corpus[sentence_indices]
+        if (learn_language_indices := bilingual_corpus.learn_language_indices) is not None:
+            filtered_sentence_data.learn_language_indices = learn_language_indices[sentence_indices]
+        return filtered_sentence_data
+
+    # -----------------
+    # Filtered Sentence Indices Persistence
+    # -----------------
+    def _sentence_indices_digest_of(self, sentence_indices: np.ndarray) -> str:
+        """ Returns:
+                digest of sentence_indices, the mode, the filter version and the versions of the
+                underlying corpora, thus changing along with any of them """
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(' '.join([self._mode, str(self._FILTER_VERSION), *map(corpus_version, self._corpus_languages)]).encode())
+        digest.update(sentence_indices.tobytes())
+        return digest.hexdigest()
+
+    def _persist_sentence_indices(self, sentence_indices: np.ndarray):
+        """ Persists sentence_indices to the local cache, replacing the ones of preceding
+            sessions of the language, whose stored checkpoint is superseded """
+
+        sentence_indices = np.ascontiguousarray(sentence_indices, dtype=np.int64)
+        self._sentence_indices_digest = self._sentence_indices_digest_of(sentence_indices)
+
+        if not (path := filtered_sentence_indices_path(self.language, self._sentence_indices_digest)).exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            for outdated_path in path.parent.glob(f'{self.language}-*.npy'):
+                outdated_path.unlink(missing_ok=True)
+            np.save(path, sentence_indices)
+
+    def _restored_sentence_indices(self, checkpoint: SessionCheckpoint) -> np.ndarray | None:
+        """ Returns:
+                persisted sentence indices of checkpoint, None if not persisted locally or not
+                matching the current mode, filter version and corpora """
+
+        if checkpoint.items_digest is None or checkpoint.mode != self._mode or checkpoint.filter_version != self._FILTER_VERSION:
+            return None
+
+        try:
+            sentence_indices = np.load(filtered_sentence_indices_path(self.language, checkpoint.items_digest))
+        except (OSError, ValueError):
+            return None
+
+        if self._sentence_indices_digest_of(sentence_indices) != checkpoint.items_digest:
+            return None
+
+        self._sentence_indices_digest = checkpoint.items_digest
+        return sentence_indices
+
+    def _item_order(self, items: BilingualCorpus, rng: np.random.Generator) -> np.ndarray:
+        if (item_order := modes.get_item_order(self.sentence_data_filter)) is not None:
+            return item_order(items, self._non_english_language, rng)
+        return super()._item_order(items, rng)
+
+    # -----------------
+    # Session Checkpoints
+    # -----------------
+    def checkpoint(self) -> SessionCheckpoint:
+        """ Excludes prepared, yet not retrieved items from the faced ones """
+
+        return SessionCheckpoint(
+            language=self.language,
+            mode=self._mode,
+            seed=self._seed,
+            position=self._position - len(self._prepared_items),
+            filter_version=self._FILTER_VERSION,
+            n_items=self.n_training_items,
+            items_digest=self._sentence_indices_digest
+        )
+
+    def _resumable(self, checkpoint: SessionCheckpoint, n_items: int) -> bool:
+        """ Returns:
+                whether checkpoint refers to the n_items current training items, with items left to be faced """
+
+        return checkpoint.language == self.language \
+            and checkpoint.mode == self._mode \
+            and checkpoint.filter_version == self._FILTER_VERSION \
+            and checkpoint.n_items == n_items \
+            and checkpoint.position < n_items
+
+    def persist_checkpoint(self):
+        checkpoint = self.checkpoint()
+        self._user_database.training_chronic_collection.upsert_session_checkpoint(self._SHORTFORM, checkpoint)
+        self._persisted_position = checkpoint.position
+
+    def stored_checkpoint(self) -> SessionCheckpoint | None:
+        return self._user_database.training_chronic_collection.session_checkpoint(self._SHORTFORM)
+
+    def _persist_checkpoint_periodically(self):
+        """ Persists the session checkpoint once _CHECKPOINT_INTERVAL items have been faced since
+            the last persistence, as well as upon the depletion of the items """
+
+        position = self._position - len(self._prepared_items)
+        if self._persisted_position is None or position == self._persisted_position:
+            return
+
+        if position - self._persisted_position >= self._CHECKPOINT_INTERVAL or position == self.n_training_items:
+            self.persist_checkpoint()
+
+    # -----------------
+    # Response Evaluation
+    # -----------------
+    @staticmethod
+    def get_response_evaluation(response: str, sentence_pair: SentencePair) -> SentenceEvaluation:
+        """ Grades response against the learn language sentence of sentence_pair, as served,
+            that is forename converted if applicable """
+
+        return get_sentence_evaluation(response, reference=sentence_pair[1])
+
+    # -----------------
+    # Training
+    # -----------------
+    def get_training_item(self) -> SentencePair | None:
+        """ Additionally persists the session checkpoint periodically, buffered by the write-behind buffer
+
+            Raises:
+                RuntimeError: if mixed with get_training_items within the session """
+
+        self._set_batched_retrieval(False)
+        item = super().get_training_item()
+        self._persist_checkpoint_periodically()
+        return item
+
+    # -----------------
+    # Batched Training
+    # -----------------
+    def get_training_items(self, n: int, look_ahead: int = 0) -> list[PreparedSentencePair]:
+        """ Args:
+                n: number of items to be returned
+                look_ahead: number of items to be kept prepared for the next call,
+                    whose audio downloads are carried out in the background meanwhile
+
+            Returns:
+                up to n prepared items, fewer in case of depleted iterator, the session
+                checkpoint being persisted periodically thereupon
+
+            Raises:
+                RuntimeError: if mixed with get_training_item within the session, which
+                    would bypass the prepared items """
+
+        self._set_batched_retrieval(True)
+        self._prepare_items(n)
+        items = [self._prepared_items.popleft() for _ in range(min(n, len(self._prepared_items)))]
+        self._prepare_items(look_ahead)
+        self._persist_checkpoint_periodically()
+        return items
+
+    def _prepare_items(self, n: int):
+        """ Tops up prepared items to n """
+
+        sentence_pairs: list[SentencePair] = []
+        for _ in range(n - len(self._prepared_items)):
+            if (sentence_pair := super().get_training_item()) is None:
+                break
+            sentence_pairs.append(sentence_pair)
+
+        for sentence_pair in self._forename_converted(sentence_pairs):
+            self._prepared_items.append(PreparedSentencePair(sentence_pair, audio=self._submit_audio_download(sentence_pair[1])))
+
+    def _set_batched_retrieval(self, batched: bool):
+        if self._batched_retrieval not in (None, batched):
+            raise RuntimeError('get_training_item and get_training_items are not to be mixed within a session')
+        self._batched_retrieval = batched
+
+    def _forename_converted(self, sentence_pairs: list[SentencePair]) -> list[list[str]]:
+        sentence_pair_lists: list[list[str]] = [list(map(str, sentence_pair)) for sentence_pair in sentence_pairs]
+        if self.forename_converter is None:
+            return sentence_pair_lists
+        return self.forename_converter.convert_batch(sentence_pair_lists)
+
+    def _submit_audio_download(self, text: str) -> Future[_TemporaryFileWrapper] | None:
+        if self.tts is None or not self.tts.enabled:
+            return None
+        return self._audio_download_executor.submit(self.tts.fetch_audio, text)
+
+    @cached_property
+    def _audio_download_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self._N_AUDIO_DOWNLOAD_WORKERS)
+
+    def close(self):
+        """ Persists the session checkpoint, if outdated, discards the prepared items, cancels
+            their pending audio downloads and shuts down the download workers """
+
+        if self._persisted_position is not None and self.checkpoint().position != self._persisted_position:
+            self.persist_checkpoint()
+
+        self._prepared_items.clear()
+        if '_audio_download_executor' in self.__dict__:
+            self._audio_download_executor.shutdown(wait=False, cancel_futures=True)
+            del self._audio_download_executor
+
+    def __enter__(self) -> SentenceTranslationTrainerBackend:
+        return self
 
-        self._set_item_iterator(items=filtered_sentence_data)
+    def __exit__(self, *args):
+        self.close()
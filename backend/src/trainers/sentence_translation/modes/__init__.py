@@ -1,9 +1,58 @@
+from __future__ import annotations
+
 from typing import Callable
 
+import numpy as np
 from typing_extensions import TypeAlias
 
 from backend.src.types.bilingual_corpus import BilingualCorpus
-from . import diction_expansion, random, simple
+from . import diction_expansion, difficulty, random, simple
 
 
 SentenceDataFilter: TypeAlias = Callable[[BilingualCorpus, str], BilingualCorpus]
+
+# Returns indices of the sentences retained by the respective SentenceDataFilter,
+# combinable with BilingualCorpus.sample_indices by means of its within parameter
+SentenceIndicesFilter: TypeAlias = Callable[[BilingualCorpus, str], np.ndarray]
+
+# Returns order in which the filtered sentence data is to be served, for modes
+# deviating from the default uniform shuffle
+ItemOrder: TypeAlias = Callable[[BilingualCorpus, str, np.random.Generator], np.ndarray]
+
+# to be incremented on changes of any of the filters' outputs
+FILTER_VERSION = 0
+
+
+def mode_name(sentence_data_filter: SentenceDataFilter) -> str:
+    """
+    >>> mode_name(diction_expansion.filter_sentence_data)
+    'diction_expansion' """
+
+    return sentence_data_filter.__module__.rsplit('.', 1)[-1]
+
+
+def get_sentence_data_filter(mode: str) -> SentenceDataFilter:
+    """ Inverse of mode_name """
+
+    return _MODE_NAME_2_SENTENCE_DATA_FILTER[mode]
+
+
+def get_sentence_indices_filter(sentence_data_filter: SentenceDataFilter) -> SentenceIndicesFilter:
+    return _MODE_NAME_2_SENTENCE_INDICES_FILTER[mode_name(sentence_data_filter)]
+
+
+def get_item_order(sentence_data_filter: SentenceDataFilter) -> ItemOrder | None:
+    return _MODE_NAME_2_ITEM_ORDER.get(mode_name(sentence_data_filter))
+
+
+_MODE_NAME_2_SENTENCE_DATA_FILTER: dict[str, SentenceDataFilter] = {
+    mode_name(module.filter_sentence_data): module.filter_sentence_data for module in (diction_expansion, difficulty, random, simple)
+}
+
+_MODE_NAME_2_SENTENCE_INDICES_FILTER: dict[str, SentenceIndicesFilter] = {
+    mode_name(module.filter_sentence_data): module.sentence_indices for module in (diction_expansion, difficulty, random, simple)
+}
+
+_MODE_NAME_2_ITEM_ORDER: dict[str, ItemOrder] = {
+    mode_name(difficulty.filter_sentence_data): difficulty.order_items
+}
@@ -1,12 +1,18 @@
 from itertools import chain
 from typing import Iterator
 
+import numpy as np
+
 from backend.src.types.bilingual_corpus import BilingualCorpus
 from backend.src.types.token_maps import get_token_maps
 
 
 def filter_sentence_data(sentence_data: BilingualCorpus, non_english_language: str) -> BilingualCorpus:
+    return sentence_data[sentence_indices(sentence_data, non_english_language)]
+
+
+def sentence_indices(sentence_data: BilingualCorpus, non_english_language: str) -> np.ndarray:
     sentence_indices_map, occurrences_map = get_token_maps(non_english_language)
 
     tokens: Iterator[str] = (token for token, n_occurrences in occurrences_map.items() if n_occurrences <= occurrences_map.occurrence_mean)
-    return sentence_data[list(set(chain.from_iterable(map(sentence_indices_map.__getitem__, tokens))))]  # type: ignore
+    return np.asarray(list(set(chain.from_iterable(map(sentence_indices_map.__getitem__, tokens)))), dtype=np.int64)
@@ -0,0 +1,23 @@
+import numpy as np
+
+from backend.src.types.bilingual_corpus import BilingualCorpus
+from backend.src.types.sentence_difficulties import ascending_order_with_jitter, get_sentence_difficulties
+
+
+def filter_sentence_data(sentence_data: BilingualCorpus, non_english_language: str) -> BilingualCorpus:
+    return sentence_data
+
+
+def sentence_indices(sentence_data: BilingualCorpus, non_english_language: str) -> np.ndarray:
+    return np.arange(len(sentence_data))
+
+
+def order_items(sentence_data: BilingualCorpus, non_english_language: str, rng: np.random.Generator) -> np.ndarray:
+    """ Returns:
+            sentence indices of ascending difficulty, jittered within difficulty buckets """
+
+    difficulties = get_sentence_difficulties(non_english_language)
+    if sentence_data.learn_language_indices is not None:
+        difficulties = difficulties[sentence_data.learn_language_indices]
+
+    return ascending_order_with_jitter(difficulties, rng)
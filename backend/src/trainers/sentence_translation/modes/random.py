@@ -1,5 +1,11 @@
+import numpy as np
+
 from backend.src.types.bilingual_corpus import BilingualCorpus
 
 
 def filter_sentence_data(sentence_data: BilingualCorpus, non_english_language: str) -> BilingualCorpus:
     return sentence_data
+
+
+def sentence_indices(sentence_data: BilingualCorpus, non_english_language: str) -> np.ndarray:
+    return np.arange(len(sentence_data))
@@ -1,17 +1,22 @@
 from collections import defaultdict
 from typing import Iterator
 
+import numpy as np
+
 from backend.src.types.bilingual_corpus import BilingualCorpus
 from backend.src.types.token_maps import get_token_maps, Token2ComprisingSentenceIndices, TokenOccurrencesMap
 from backend.src.utils import iterables
 
 
 def filter_sentence_data(sentence_data: BilingualCorpus, non_english_language: str) -> BilingualCorpus:
+    return sentence_data[sentence_indices(sentence_data, non_english_language)]
+
+
+def sentence_indices(sentence_data: BilingualCorpus, non_english_language: str) -> np.ndarray:
     sentence_indices_map, occurrences_map = get_token_maps(non_english_language)
 
     sentence_indices_with_comprising_occurrences = _sentence_indices_with_comprising_tokens(sentence_indices_map, occurrences_map)
-    sentence_indices = (sentence_index for sentence_index, comprising_occurrences in sentence_indices_with_comprising_occurrences if all((occurrence >= occurrences_map.occurrence_mean for occurrence in comprising_occurrences)))
-    return sentence_data[list(sentence_indices)]  # type: ignore
+    return np.asarray([sentence_index for sentence_index, comprising_occurrences in sentence_indices_with_comprising_occurrences if all((occurrence >= occurrences_map.occurrence_mean for occurrence in comprising_occurrences))], dtype=np.int64)
 
 
 def _sentence_indices_with_comprising_tokens(sentence_indices_map: Token2ComprisingSentenceIndices,
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum, auto
+from functools import lru_cache
+from itertools import zip_longest
+from typing import Iterable, NamedTuple
+
+from backend.src.utils.alignment import aligned_index_pairs, AlignedIndexPair
+from backend.src.utils.strings.edit_distance import bounded_edit_distance
+from backend.src.utils.strings.extraction import meaningful_tokens
+from backend.src.utils.strings.transformation import accent_stripped
+
+
+class TokenVerdict(Enum):
+    Correct = auto()
+    AccentError = auto()
+    AlmostCorrect = auto()
+    Wrong = auto()
+    Missing = auto()
+    Superfluous = auto()
+
+
+VERDICT_2_SCORE = {
+    TokenVerdict.Correct: 1.0,
+    TokenVerdict.AccentError: 0.75,
+    TokenVerdict.AlmostCorrect: 0.5,
+    TokenVerdict.Wrong: 0.0,
+    TokenVerdict.Missing: 0.0,
+    TokenVerdict.Superfluous: 0.0
+}
+
+
+class TokenEvaluation(NamedTuple):
+    response_token: str | None  # None if missing
+    reference_token: str | None  # None if superfluous
+    verdict: TokenVerdict
+
+
+@dataclass(frozen=True)
+class SentenceEvaluation:
+    """ token_evaluations: aligned response and reference tokens in reference order
+        score: mean token verdict score in [0, 1], superfluous tokens being penalized
+            by means of their contribution to the denominator """
+
+    token_evaluations: list[TokenEvaluation]
+    score: float
+
+
+class _Tokens(NamedTuple):
+    tokens: list[str]
+    normalized: list[str]  # lowercase, accent stripped
+
+
+def _tokens(sentence: str) -> _Tokens:
+    tokens = meaningful_tokens(sentence, apostrophe_splitting=True)
+    return _Tokens(tokens, [accent_stripped(token.lower()) for token in tokens])
+
+
+@lru_cache(maxsize=4096)
+def _reference_tokens(reference: str) -> _Tokens:
+    """ Cached as references are being graded repeatedly, e.g. on the re-scoring of sessions """
+
+    return _tokens(reference)
+
+
+def get_sentence_evaluation(response: str, reference: str) -> SentenceEvaluation:
+    """ Aligns the normalized response and reference tokens by means of the O(ND) diff, maximizing
+        the number of matching tokens, response tokens almost equal to a reference token being aligned
+        as the latter, pairs up the unmatched tokens in between matching ones as substitutions
+        and grades the aligned token pairs
+
+        >>> evaluation = get_sentence_evaluation('il gato mangia la farfala', 'Il gatto mangia la farfalla rara.')
+        >>> [verdict.name for *_, verdict in evaluation.token_evaluations]
+        ['Correct', 'AlmostCorrect', 'Correct', 'Correct', 'AlmostCorrect', 'Missing']
+        >>> evaluation.score
+        0.6666666666666666 """
+
+    response_tokens, reference_tokens = _tokens(response), _reference_tokens(reference)
+
+    token_evaluations = [
+        _token_evaluation(
+            None if i is None else response_tokens.tokens[i],
+            None if j is None else reference_tokens.tokens[j]
+        )
+        for i, j in _substitution_paired(
+            aligned_index_pairs(_alignment_keys(response_tokens.normalized, reference_tokens.normalized), reference_tokens.normalized, substitutions=False)
+        )
+    ]
+
+    return SentenceEvaluation(
+        token_evaluations,
+        score=sum(VERDICT_2_SCORE[evaluation.verdict] for evaluation in token_evaluations) / len(token_evaluations) if token_evaluations else 1.0
+    )
+
+
+def _alignment_keys(normalized_response_tokens: list[str], normalized_reference_tokens: list[str]) -> list[str]:
+    """ Returns:
+            normalized response tokens, the ones almost equal to a reference token replaced by it,
+            thus aligning misspelled tokens with their reference counterparts rather than with
+            whichever reference token happens to occupy their position
+
+        >>> _alignment_keys(['la', 'farfala', 'rossa'], ['la', 'farfalla', 'rara'])
+        ['la', 'farfalla', 'rossa'] """
+
+    reference_token_set = set(normalized_reference_tokens)
+    return [
+        token if token in reference_token_set else next(
+            (reference_token for reference_token in normalized_reference_tokens if _almost_correct(token, reference_token)),
+            token
+        )
+        for token in normalized_response_tokens
+    ]
+
+
+def _substitution_paired(aligned_pairs: list[AlignedIndexPair]) -> list[AlignedIndexPair]:
+    """ Returns:
+            aligned_pairs, the unmatched indices in between matching ones being paired up in order
+
+        >>> _substitution_paired([(0, 0), (None, 1), (None, 2), (1, None), (2, 3)])
+        [(0, 0), (1, 1), (None, 2), (2, 3)] """
+
+    paired: list[AlignedIndexPair] = []
+    unmatched_a: list[int] = []
+    unmatched_b: list[int] = []
+
+    def pair_up_unmatched():
+        paired.extend(zip_longest(unmatched_a, unmatched_b))
+        unmatched_a.clear()
+        unmatched_b.clear()
+
+    for i, j in aligned_pairs:
+        if i is None:
+            unmatched_b.append(j)  # type: ignore[arg-type]
+        elif j is None:
+            unmatched_a.append(i)
+        else:
+            pair_up_unmatched()
+            paired.append((i, j))
+    pair_up_unmatched()
+
+    return paired
+
+
+def get_sentence_evaluations(responses: Iterable[str], references: Iterable[str]) -> list[SentenceEvaluation]:
+    """ Batch counterpart of get_sentence_evaluation, grading responses against the references
+        of corresponding index, e.g. of logged sessions to be re-scored
+
+        >>> [evaluation.score for evaluation in get_sentence_evaluations(['Ciao!', ''], ['Ciao.', 'Ciao.'])]
+        [1.0, 0.0] """
+
+    return list(map(get_sentence_evaluation, responses, references))
+
+
+# ---------------
+# Token Verdicts
+# ---------------
+_TOLERATED_CHAR_DEVIATIONS_PER_TOKEN = 1
+_MIN_CHAR_DEVIATION_TOLERATING_TOKEN_LENGTH = 4
+
+
+def _token_evaluation(response_token: str | None, reference_token: str | None) -> TokenEvaluation:
+    if response_token is None:
+        verdict = TokenVerdict.Missing
+    elif reference_token is None:
+        verdict = TokenVerdict.Superfluous
+    elif (lowercase_response_token := response_token.lower()) == (lowercase_reference_token := reference_token.lower()):
+        verdict = TokenVerdict.Correct
+    elif accent_stripped(lowercase_response_token) == accent_stripped(lowercase_reference_token):
+        verdict = TokenVerdict.AccentError
+    elif _almost_correct(lowercase_response_token, lowercase_reference_token):
+        verdict = TokenVerdict.AlmostCorrect
+    else:
+        verdict = TokenVerdict.Wrong
+    return TokenEvaluation(response_token, reference_token, verdict)
+
+
+def _almost_correct(response_token: str, reference_token: str) -> bool:
+    if len(reference_token) < _MIN_CHAR_DEVIATION_TOLERATING_TOKEN_LENGTH:
+        return False
+    return bounded_edit_distance(response_token, reference_token, k=_TOLERATED_CHAR_DEVIATIONS_PER_TOKEN) <= _TOLERATED_CHAR_DEVIATIONS_PER_TOKEN
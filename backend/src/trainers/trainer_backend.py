@@ -2,32 +2,64 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 import random
-from typing import Callable, Generic, Iterator, TypeVar
+from typing import Callable, Generic, Iterator, TypeVar, Union
 
 import numpy as np
+from typing_extensions import TypeAlias
 
 from backend.src.components.forename_convertor import ForenameConvertor
+from backend.src.database.journal import UserJournal
 from backend.src.database.user_database import UserDatabase
 from backend.src.string_resources import string_resources
 from backend.src.types.bilingual_corpus import BilingualCorpus, SentencePair
-from backend.src.types.vocable_entry import VocableEntries, VocableEntry
+from backend.src.types.vocable_entry import VocableEntries, VocableEntryRow
 
 
-_TrainingItem = TypeVar('_TrainingItem', SentencePair, VocableEntry)
+_TrainingItem = TypeVar('_TrainingItem', SentencePair, VocableEntryRow)
 _TrainingItems = TypeVar('_TrainingItems', BilingualCorpus, VocableEntries)
 
+# handle of the session, either of the remote database or of the offline-first journal thereof
+DatabaseHandle: TypeAlias = Union[UserDatabase, UserJournal]
+
 
 class TrainerBackend(ABC, Generic[_TrainingItem, _TrainingItems]):
+    # key of the trainer within the training chronic
+    _SHORTFORM: str
+
     @UserDatabase.receiver
-    def __init__(self, non_english_language: str, train_english: bool, user_database: UserDatabase):
-        self.language = [non_english_language, string_resources['english']][train_english]
-        user_database.language = self.language
+    def __init__(self, non_english_language: str, train_english: bool, user_database: DatabaseHandle | None = None, reference_language: str | None = None):
+        """ Args:
+                reference_language: non-english language taking the place of english, resulting in the
+                    training on the pivot corpus of non_english_language and reference_language, with
+                    train_english determining which one of them is to be learned
+                user_database: handle of the session, of which one scoped to the training language is derived,
+                    the current UserDatabase if None """
+
+        self._get_bilingual_corpus: Callable[[], BilingualCorpus]
+
+        if reference_language is None:
+            self.language = [non_english_language, string_resources['english']][train_english]
+            self._get_bilingual_corpus = lambda: BilingualCorpus(non_english_language, train_english=train_english)
+        else:
+            self.language = [non_english_language, reference_language][train_english]
+            pivot_reference_language = [reference_language, non_english_language][train_english]
+            self._get_bilingual_corpus = lambda: BilingualCorpus.pivot(pivot_reference_language, learn_language=self.language)
+
+        assert user_database is not None  # injected by the receiver
+        self._user_database: DatabaseHandle = user_database.for_language(self.language)
 
         self._item_iterator: Iterator[_TrainingItem]
-        self._get_bilingual_corpus: Callable[[], BilingualCorpus] = lambda: BilingualCorpus(non_english_language, train_english=train_english)
         self.n_training_items: int
 
-        self.forename_converter: ForenameConvertor | None = ForenameConvertor.get_if_available_for(self.language, train_english=train_english)
+        self._seed: int
+        self._position: int
+        self._items: _TrainingItems
+        self._order: np.ndarray
+
+        # default forenames solely to be found in english sentences
+        self.forename_converter: ForenameConvertor | None = None
+        if reference_language is None:
+            self.forename_converter = ForenameConvertor.get_if_available_for(self.language, train_english=train_english)
 
     # ----------------
     # Pre Training
@@ -36,18 +68,29 @@ class TrainerBackend(ABC, Generic[_TrainingItem, _TrainingItems]):
     def set_item_iterator(self):
         """ Sets item iterator, n training items """
 
-    def _set_item_iterator(self, items: _TrainingItems):
+    def _set_item_iterator(self, items: _TrainingItems, seed: int | None = None, position: int = 0):
+        """ Args:
+                seed: seed determining the item order, a random one if None
+                position: number of items of the item order to be skipped """
+
         self.n_training_items = len(items)
+        self._seed = random.getrandbits(32) if seed is None else seed
+        self._position = position
         self._item_iterator = self._get_item_iterator(items)
 
-    @staticmethod
-    def _get_item_iterator(items: _TrainingItems) -> Iterator[_TrainingItem]:
-        if isinstance(items, np.ndarray):
-            np.random.shuffle(items)
-        else:
-            random.shuffle(items)
+    def _get_item_iterator(self, items: _TrainingItems) -> Iterator[_TrainingItem]:
+        """ Returns:
+                iterator over the seed-determined item order, starting
+                at the current position """
+
+        self._items, self._order = items, self._item_order(items, np.random.default_rng(self._seed))
+        return (items[i] for i in self._order[self._position:])
+
+    def _item_order(self, items: _TrainingItems, rng: np.random.Generator) -> np.ndarray:
+        """ Returns:
+                indices, in the order of which items are to be served """
 
-        return iter(items)  # type: ignore
+        return rng.permutation(len(items))
 
     # -----------------
     # Training
@@ -56,4 +99,12 @@ class TrainerBackend(ABC, Generic[_TrainingItem, _TrainingItems]):
         """ Returns:
                  None in case of depleted iterator """
 
-        return next(self._item_iterator, None)
+        if (item := next(self._item_iterator, None)) is not None:
+            self._position += 1
+        return item
+
+    def upcoming_items(self, n: int) -> list[_TrainingItem]:
+        """ Returns:
+                up to n items to be served next, without advancing the item iterator """
+
+        return [self._items[i] for i in self._order[self._position:self._position + n]]
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from backend.src.trainers.trainer_backend import TrainerBackend
 
 
@@ -1,24 +1,88 @@
-from collections import defaultdict
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import cached_property
+import math
+from threading import Condition, Lock
 from typing import Iterable, Iterator
 
 import numpy as np
 
-from backend.src.database.user_database import UserDatabase
-from backend.src.trainers.trainer_backend import TrainerBackend
+from backend.src.database.user_database import UserDatabase, VocabularyChanges
+from backend.src.trainers.trainer_backend import DatabaseHandle, TrainerBackend
+from backend.src.trainers.vocable_trainer.response_evaluation import get_response_evaluation, ResponseEvaluation
+from backend.src.trainers.vocable_trainer.scheduler import VocableScheduler
 from backend.src.types.bilingual_corpus import BilingualCorpus
 from backend.src.types.token_maps import get_token_sentence_indices_map, Token2ComprisingSentenceIndices
-from backend.src.types.vocable_entry import is_perfected, VocableEntries, VocableEntry
+from backend.src.types.vocable_entry import VocableEntries, VocableEntryRow
+from backend.src.utils.date import epoch_day_now, today_epoch_day
+
+
+@dataclass
+class PrefetchStatistics:
+    """ n_hits: related sentence queries of vocables either cached or anticipated by a prefetch,
+            including the ones waiting for a prefetch in progress and the ones resolved
+            ahead of their prefetch not started yet
+        n_misses: related sentence queries of unanticipated vocables, resolved upon them
+        n_prefetched: vocables resolved in the background within the session having
+            submitted them, stale results being discarded
+        n_wasted: prefetched vocables evicted from the cache or discarded at
+            session reset without having been queried """
 
+    n_hits: int = 0
+    n_misses: int = 0
+    n_prefetched: int = 0
+    n_wasted: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        if not (n_queries := self.n_hits + self.n_misses):
+            return 0.0
+        return self.n_hits / n_queries
 
-class VocableTrainerBackend(TrainerBackend[VocableEntry, VocableEntries]):
-    def __init__(self, non_english_language: str, train_english: bool):
-        super().__init__(non_english_language, train_english)
+
+class VocableTrainerBackend(TrainerBackend[VocableEntryRow, VocableEntries]):
+    _SHORTFORM = 'v'
+    _N_PREFETCH_ITEMS = 3
+    _RELATED_SENTENCE_INDICES_CACHE_SIZE = 1024
+    # number of vocables per prefetch submitted at session start, bounding the
+    # time a query has to wait for the resolution of the one comprising it
+    _SESSION_PREFETCH_CHUNK_SIZE = 16
+
+    def __init__(self, non_english_language: str, train_english: bool, user_database: DatabaseHandle | None = None):
+        super().__init__(non_english_language, train_english, user_database=user_database)
 
         self._sentence_data: BilingualCorpus = self._get_bilingual_corpus()
         self._token_2_sentence_indices: Token2ComprisingSentenceIndices = get_token_sentence_indices_map(self.language, load_normalizer=True)
 
+        self.scheduler: VocableScheduler = None  # type: ignore
+        # vocabulary changes the scheduler has been synchronized with, to be pulled upon its persistence
+        self._reconciled_vocabulary_changes = VocabularyChanges()
+        self._vocable_2_entry: dict[str, VocableEntryRow] = {}
+
         self.paraphrases: dict[str, list[str]] = None  # type: ignore
-        self.new_vocable_entries: VocableEntries = []
+        self.new_vocable_entries: list[VocableEntryRow] = []
+
+        # session-wise LRU cache of the sentence indices comprising the respective vocable,
+        # written to by the prefetch worker as well
+        self._vocable_2_related_sentence_indices: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._cache_lock = Lock()
+        # serializes the resolutions of the prefetch worker and the ones carried out upon
+        # queries, as spaCy models aren't to be shared between threads, see _resolution_turn
+        self._resolution_condition = Condition()
+        self._resolution_in_progress = False
+        self._n_waiting_query_resolutions = 0
+        # incremented upon session resets, by means of which results of prefetches
+        # submitted in preceding sessions are discarded
+        self._generation = 0
+        self._pending_prefetches: dict[str, Future[dict[str, np.ndarray]]] = {}
+        self._unqueried_prefetched_vocables: set[str] = set()
+        self.prefetch_statistics = PrefetchStatistics()
+
+        self._rng = np.random.default_rng()
 
     @property
     def new_vocable_entries_available(self) -> bool:
@@ -28,47 +92,294 @@ class VocableTrainerBackend(TrainerBackend[VocableEntry, VocableEntries]):
     # Pre Training
     # ---------------
     def set_item_iterator(self):
-        """ Additionally sets paraphrases, new_vocable_entries iterator """
+        """ Additionally sets scheduler, paraphrases, new_vocable_entries iterator
+
+            Sessions are resumed by means of the persisted schedule rather than by
+            session checkpoints, the entries faced before having been rescheduled """
+
+        self.scheduler, self._reconciled_vocabulary_changes = self._synchronized_scheduler(user_database=self._user_database)
 
-        vocable_entries_to_be_trained = list(self._vocable_entries_to_be_trained())
+        # solely fetch the entries due for training
+        vocable_entries_to_be_trained = self._queried_entries(self.scheduler.due_vocables(_session_end()), user_database=self._user_database)
+        self._vocable_2_entry = {entry.vocable: entry for entry in vocable_entries_to_be_trained}
 
-        self.paraphrases = self._find_paraphrases(vocable_entries_to_be_trained)
-        self.new_vocable_entries = list(filter(lambda entry: entry.is_new, vocable_entries_to_be_trained))
+        self.paraphrases = self._paraphrases(user_database=self._user_database)
+        self.new_vocable_entries = [entry for entry in vocable_entries_to_be_trained if entry.is_new]
+        self._reset_related_sentence_indices_cache()
         self._set_item_iterator(vocable_entries_to_be_trained)
+        self._prefetch_related_sentence_indices()
+        self._prefetch_session_related_sentence_indices()
+
+    def _get_item_iterator(self, items: VocableEntries) -> Iterator[VocableEntryRow]:
+        """ Yields:
+                entries in the order determined by the scheduler until none is due by the end
+                of the day, including failed ones becoming due again during the session, which
+                are served ahead of their due time once no other entries are left """
+
+        while (vocable := self.scheduler.pop_due(_session_end())) is not None:
+            if (entry := self._entry(vocable)) is not None:
+                yield entry
+
+    def _entry(self, vocable: str) -> VocableEntryRow | None:
+        """ Fetches entries becoming due during the session, e.g. relearning ones of a
+            previous session, upon their first access
+
+            Returns:
+                None if vocable has been deleted in the meantime, being unscheduled thereupon """
+
+        if (entry := self._vocable_2_entry.get(vocable)) is None:
+            if not (entries := self._queried_entries([vocable], user_database=self._user_database)):
+                self.scheduler.unschedule(vocable)
+                return None
+            entry = self._vocable_2_entry[vocable] = entries[0]
+        return entry
 
     @staticmethod
     @UserDatabase.receiver
-    def _vocable_entries_to_be_trained(user_database: UserDatabase) -> Iterator[VocableEntry]:
-        return filter(
-                is_perfected,
-                user_database.vocabulary_collection.entries()
-            )
+    def _queried_entries(vocables: list[str], user_database: DatabaseHandle) -> VocableEntries:
+        return VocableEntries.concatenated(user_database.vocabulary_collection.query_entries(vocables=vocables))
 
     @staticmethod
-    def _find_paraphrases(vocable_entries: Iterable[VocableEntry]) -> dict[str, list[str]]:
+    @UserDatabase.receiver
+    def _synchronized_scheduler(user_database: DatabaseHandle) -> tuple[VocableScheduler, VocabularyChanges]:
         """ Returns:
-                Dict[english_meaning: [synonym_1, synonym_2, ..., synonym_n]]
+                stored scheduler, synchronized with the vocabulary changes recorded since its persistence,
+                thus solely querying the entries of added vocables; scheduler of the entire vocabulary
+                if none stored yet,
+                vocabulary changes reconciled thereby """
 
-                for n >= 2 paraphrases contained within retrieved vocable entries possessing the IDENTICAL
-                english the-stripped meaning"""
+        schedule_document, vocabulary_changes = user_database.vocable_schedule_collection.schedule_and_vocabulary_changes()
 
-        meaning_2_vocables = defaultdict(list)
+        if schedule_document is None:
+            scheduler = VocableScheduler()
+            for page in user_database.vocabulary_collection.query_entries():
+                scheduler.schedule_unscheduled(page)
+            return scheduler, vocabulary_changes
 
-        for entry in vocable_entries:
-            meaning_2_vocables[entry.the_stripped_meaning].append(entry.vocable)
+        scheduler = VocableScheduler.from_document(schedule_document)
+        for vocable in vocabulary_changes.deleted:
+            scheduler.unschedule(vocable)
+        if vocabulary_changes.added:
+            for page in user_database.vocabulary_collection.query_entries(vocables=vocabulary_changes.added):
+                scheduler.schedule_unscheduled(page)
 
-        return {meaning: synonyms for meaning, synonyms in meaning_2_vocables.items() if len(synonyms) >= 2}
+        return scheduler, vocabulary_changes
+
+    @staticmethod
+    @UserDatabase.receiver
+    def _paraphrases(user_database: DatabaseHandle) -> dict[str, list[str]]:
+        """ Returns:
+                Dict[the-stripped meaning: [synonym_1, synonym_2, ..., synonym_n]]
+
+                for n >= 2 vocables of the entire vocabulary possessing the IDENTICAL meaning """
+
+        return user_database.paraphrase_index_collection.paraphrases()
 
     # ---------------
     # Training
     # ---------------
+    def get_training_item(self) -> VocableEntryRow | None:
+        """ Additionally triggers the background resolution of the related sentences
+            of the upcoming items """
+
+        item = super().get_training_item()
+        self._prefetch_related_sentence_indices()
+        return item
+
+    def upcoming_items(self, n: int) -> list[VocableEntryRow]:
+        return [entry for vocable in self.scheduler.upcoming(n, _session_end()) if (entry := self._entry(vocable)) is not None]
+
+    def get_response_evaluation(self, response: str, entry: VocableEntryRow, vocable_identification_aid='') -> tuple[str, ResponseEvaluation]:
+        """ Evaluates response to the translation of entry and reschedules entry accordingly
+
+            Returns:
+                processed response, evaluation """
+
+        response, evaluation = get_response_evaluation(response, entry.vocable, vocable_identification_aid=vocable_identification_aid)
+        self.register_response_evaluation(entry, evaluation)
+        return response, evaluation
+
+    def register_response_evaluation(self, entry: VocableEntryRow, evaluation: ResponseEvaluation):
+        """ Reschedules entry, accounting for entries becoming due again during the session
+            by n_training_items """
+
+        self.scheduler.update(entry.vocable, evaluation, now=epoch_day_now())
+        if self.scheduler.state(entry.vocable).due <= _session_end():
+            self.n_training_items += 1
+
+    def persist_schedule(self):
+        self._user_database.vocable_schedule_collection.upsert_schedule(self.scheduler.to_document(), reconciled_changes=self._reconciled_vocabulary_changes)
+        self._reconciled_vocabulary_changes = VocabularyChanges()
+
     def related_sentence_pairs(self, entry: str, n: int) -> list[tuple[str, str]]:
-        if (sentence_indices := self._token_2_sentence_indices.comprising_sentence_indices(entry)) is None:
-            return []
+        """ Waits for the prefetch comprising entry if in progress, whilst resolving entry
+            right away if not cached and its prefetch not started yet, rather than
+            waiting for the ones queued ahead of it
+
+            Returns:
+                up to n distinct sentence pairs comprising entry, sampled in O(n) """
+
+        if (pending_prefetch := self._pending_prefetches.pop(entry, None)) is not None and pending_prefetch.running():
+            pending_prefetch.result()
+
+        if (sentence_indices := self._cached_related_sentence_indices(entry)) is not None or pending_prefetch is not None:
+            self.prefetch_statistics.n_hits += 1
+        else:
+            self.prefetch_statistics.n_misses += 1
+
+        if sentence_indices is None:
+            sentence_indices = self.resolve_related_sentence_indices([entry])[entry]
+
+        return self._sentence_data[sentence_indices[_sample_without_replacement(len(sentence_indices), n, self._rng)]].tolist()
+
+    def resolve_related_sentence_indices(self, vocables: Iterable[str], prefetch=False, generation: int | None = None) -> dict[str, np.ndarray]:
+        """ Caches the sentence indices comprising the respective vocables for the
+            remainder of the session, e.g. for the ones of all vocable entries at session start
+
+            Args:
+                generation: session generation the resolution has been submitted in, its results
+                    being discarded if stale; the current one if None
+
+            Returns:
+                sentence indices of the vocables, irrespective of their remaining in the cache """
+
+        vocables = list(vocables)
+        with self._resolution_turn(prefetch):
+            with self._cache_lock:
+                if generation is None:
+                    generation = self._generation
+                vocable_2_sentence_indices = {
+                    vocable: cached_sentence_indices for vocable in vocables
+                    if (cached_sentence_indices := self._vocable_2_related_sentence_indices.get(vocable)) is not None
+                }
+            unresolved_vocables = [vocable for vocable in dict.fromkeys(vocables) if vocable not in vocable_2_sentence_indices]
+
+            for vocable, sentence_indices in zip(unresolved_vocables, self._token_2_sentence_indices.comprising_sentence_indices_batch(unresolved_vocables)):
+                vocable_2_sentence_indices[vocable] = np.asarray(sentence_indices or [], dtype=np.int64)
+                self._cache_related_sentence_indices(vocable, vocable_2_sentence_indices[vocable], prefetch=prefetch, generation=generation)
+
+        return vocable_2_sentence_indices
+
+    @contextmanager
+    def _resolution_turn(self, prefetch: bool):
+        """ Grants exclusive resolution, whereby resolutions carried out upon queries take
+            precedence over waiting prefetches, thus awaiting at most the one in progress """
+
+        with self._resolution_condition:
+            if not prefetch:
+                self._n_waiting_query_resolutions += 1
+            self._resolution_condition.wait_for(lambda: not self._resolution_in_progress and (not prefetch or not self._n_waiting_query_resolutions))
+            if not prefetch:
+                self._n_waiting_query_resolutions -= 1
+            self._resolution_in_progress = True
+        try:
+            yield
+        finally:
+            with self._resolution_condition:
+                self._resolution_in_progress = False
+                self._resolution_condition.notify_all()
+
+    # ---------------
+    # Related Sentence Indices Cache
+    # ---------------
+    def _cached_related_sentence_indices(self, vocable: str) -> np.ndarray | None:
+        with self._cache_lock:
+            if (sentence_indices := self._vocable_2_related_sentence_indices.get(vocable)) is not None:
+                self._vocable_2_related_sentence_indices.move_to_end(vocable)
+                self._unqueried_prefetched_vocables.discard(vocable)
+            return sentence_indices
+
+    def _cache_related_sentence_indices(self, vocable: str, sentence_indices: np.ndarray, prefetch: bool, generation: int):
+        with self._cache_lock:
+            if generation != self._generation:
+                return
+
+            self._vocable_2_related_sentence_indices[vocable] = sentence_indices
+            if prefetch:
+                self._unqueried_prefetched_vocables.add(vocable)
+                self.prefetch_statistics.n_prefetched += 1
+
+            while len(self._vocable_2_related_sentence_indices) > self._RELATED_SENTENCE_INDICES_CACHE_SIZE:
+                evicted_vocable, _ = self._vocable_2_related_sentence_indices.popitem(last=False)
+                if evicted_vocable in self._unqueried_prefetched_vocables:
+                    self._unqueried_prefetched_vocables.remove(evicted_vocable)
+                    self.prefetch_statistics.n_wasted += 1
+
+    def _reset_related_sentence_indices_cache(self):
+        for pending_prefetch in self._pending_prefetches.values():
+            pending_prefetch.cancel()
+        self._pending_prefetches.clear()
+
+        with self._cache_lock:
+            self._generation += 1
+            self.prefetch_statistics.n_wasted += len(self._unqueried_prefetched_vocables)
+            self._unqueried_prefetched_vocables.clear()
+            self._vocable_2_related_sentence_indices.clear()
+
+    # ---------------
+    # Prefetching
+    # ---------------
+    def _prefetch_related_sentence_indices(self):
+        """ Submits the resolution of the related sentence indices of the upcoming,
+            neither cached nor already pending vocables to the prefetch worker """
+
+        self._pending_prefetches = {vocable: future for vocable, future in self._pending_prefetches.items() if not future.done()}
+
+        with self._cache_lock:
+            vocables = [
+                entry.vocable for entry in self.upcoming_items(self._N_PREFETCH_ITEMS)
+                if entry.vocable not in self._vocable_2_related_sentence_indices and entry.vocable not in self._pending_prefetches
+            ]
+
+        self._submit_prefetch(vocables)
+
+    def _prefetch_session_related_sentence_indices(self):
+        """ Submits the resolution of the related sentence indices of the session's vocables,
+            up to the cache size, in the order they're to be served, as chunks to the prefetch
+            worker, queued behind the one of the upcoming vocables """
+
+        vocables = [vocable for vocable in self.scheduler.upcoming(self._RELATED_SENTENCE_INDICES_CACHE_SIZE, _session_end()) if vocable not in self._pending_prefetches]
+        for i in range(0, len(vocables), self._SESSION_PREFETCH_CHUNK_SIZE):
+            self._submit_prefetch(vocables[i:i + self._SESSION_PREFETCH_CHUNK_SIZE])
+
+    def _submit_prefetch(self, vocables: list[str]):
+        if vocables:
+            future = self._prefetch_executor.submit(self.resolve_related_sentence_indices, vocables, prefetch=True, generation=self._generation)
+            self._pending_prefetches.update(dict.fromkeys(vocables, future))
+
+    @cached_property
+    def _prefetch_executor(self) -> ThreadPoolExecutor:
+        # single worker, resolutions being serialized by _resolution_turn anyway
+        return ThreadPoolExecutor(max_workers=1)
+
+
+def _session_end() -> float:
+    """ Returns:
+            latest fractional epoch day of today, up to which due entries are served within the session """
+
+    return math.nextafter(today_epoch_day() + 1, 0)
+
+
+def _sample_without_replacement(population_size: int, n: int, rng: np.random.Generator) -> np.ndarray:
+    """ Floyd's algorithm, requiring, as opposed to a shuffle of the population,
+        solely O(n) time and memory
+
+        Returns:
+            min(n, population_size) distinct indices of [0, population_size) in random order
+
+        >>> rng = np.random.default_rng(69)
+        >>> sample = _sample_without_replacement(10_000_000, 5, rng)
+        >>> len(sample), len(set(sample.tolist())), bool(all((0 <= sample) & (sample < 10_000_000)))
+        (5, 5, True)
+        >>> sorted(_sample_without_replacement(3, 5, rng).tolist())
+        [0, 1, 2] """
 
-        nd_sentence_indices = np.asarray(sentence_indices)
-        np.random.shuffle(nd_sentence_indices)
+    n = min(n, population_size)
 
-        assert nd_sentence_indices is not None
+    sample: dict[int, None] = {}
+    for upper_bound, drawn in enumerate(rng.integers(0, np.arange(population_size - n, population_size) + 1).tolist(), start=population_size - n):
+        sample[drawn if drawn not in sample else upper_bound] = None
 
-        return self._sentence_data[nd_sentence_indices[:n]].tolist()
+    indices = np.fromiter(sample, dtype=np.int64, count=n)
+    rng.shuffle(indices)
+    return indices
@@ -1,8 +1,13 @@
-from typing import Tuple
+from __future__ import annotations
 
 from enum import Enum, auto
+from functools import lru_cache
+from itertools import repeat
+from typing import Iterable, NamedTuple, Tuple
+
 from unidecode import unidecode
 
+from backend.src.utils.strings.edit_distance import bounded_edit_distance
 from backend.src.utils.strings.extraction import article_stripped_noun
 
 
@@ -27,6 +32,19 @@ EVALUATION_2_SCORE = {
 }
 
 
+class _GroundTruthForms(NamedTuple):
+    accent_stripped: str
+    article_stripped_noun: str | None
+    tokens: list[str]
+
+
+@lru_cache(maxsize=4096)
+def _ground_truth_forms(ground_truth: str) -> _GroundTruthForms:
+    """ Normalized forms of ground truths, cached as being graded repeatedly """
+
+    return _GroundTruthForms(unidecode(ground_truth), article_stripped_noun(ground_truth), ground_truth.split(' '))
+
+
 def get_response_evaluation(response: str, ground_truth: str, vocable_identification_aid='') -> Tuple[str, ResponseEvaluation]:
     response, evaluation = response.strip(' '), None
 
@@ -34,20 +52,21 @@ def get_response_evaluation(response: str, ground_truth: str, vocable_identifica
         evaluation = ResponseEvaluation.NoResponse
     else:
         response = vocable_identification_aid + response
+        ground_truth_forms = _ground_truth_forms(ground_truth)
 
         if response == ground_truth:
             evaluation = ResponseEvaluation.Correct
 
-        elif unidecode(response) == unidecode(ground_truth):
+        elif unidecode(response) == ground_truth_forms.accent_stripped:
             evaluation = ResponseEvaluation.AccentError
 
-        elif _article_missing(response, ground_truth):
+        elif _article_missing(response, ground_truth_forms):
             evaluation = ResponseEvaluation.MissingArticle
 
-        elif _wrong_article(response, ground_truth):
+        elif _wrong_article(response, ground_truth_forms):
             evaluation = ResponseEvaluation.WrongArticle
 
-        elif _almost_correct(response, ground_truth):
+        elif _almost_correct(response, ground_truth_forms):
             evaluation = ResponseEvaluation.AlmostCorrect
 
         else:
@@ -56,64 +75,63 @@ def get_response_evaluation(response: str, ground_truth: str, vocable_identifica
     return response, evaluation
 
 
+def get_response_evaluations(responses: Iterable[str], ground_truths: Iterable[str], vocable_identification_aids: Iterable[str] | None = None) -> list[Tuple[str, ResponseEvaluation]]:
+    """ Batch counterpart of get_response_evaluation, grading responses against the ground truths
+        of corresponding index, e.g. of imported answer logs
+
+        >>> [evaluation for _, evaluation in get_response_evaluations(['scopar', 'scopare', ''], ['scopare'] * 3)]
+        [<ResponseEvaluation.AlmostCorrect: 5>, <ResponseEvaluation.Correct: 7>, <ResponseEvaluation.NoResponse: 1>]
+
+        Raises:
+            ValueError: on the arguments differing in length """
+
+    responses, ground_truths = list(responses), list(ground_truths)
+    lengths = {len(responses), len(ground_truths)}
+    if vocable_identification_aids is not None:
+        vocable_identification_aids = list(vocable_identification_aids)
+        lengths.add(len(vocable_identification_aids))
+    if len(lengths) > 1:
+        raise ValueError(f'Arguments differing in length: {sorted(lengths)}')
+
+    return list(
+        map(
+            get_response_evaluation,
+            responses,
+            ground_truths,
+            vocable_identification_aids if vocable_identification_aids is not None else repeat('')
+        )
+    )
+
+
 # ---------------
 # Article related
 # ---------------
-def _wrong_article(response: str, ground_truth: str) -> bool:
-    contained_nouns = list(map(article_stripped_noun, [response, ground_truth]))
-    return len(set(contained_nouns)) == 1 and contained_nouns[0] is not None
+def _wrong_article(response: str, ground_truth_forms: _GroundTruthForms) -> bool:
+    return ground_truth_forms.article_stripped_noun is not None and article_stripped_noun(response) == ground_truth_forms.article_stripped_noun
 
 
-def _article_missing(response: str, ground_truth: str) -> bool:
-    return article_stripped_noun(ground_truth) == response
+def _article_missing(response: str, ground_truth_forms: _GroundTruthForms) -> bool:
+    return ground_truth_forms.article_stripped_noun == response
 
 
 # ---------------
 # Almost Correct
 # ---------------
-def _almost_correct(response: str, ground_truth: str) -> bool:
-    TOLERATED_CHAR_DEVIATIONS_PER_TOKEN = 1
+_TOLERATED_CHAR_DEVIATIONS_PER_TOKEN = 1
+
 
+def _almost_correct(response: str, ground_truth_forms: _GroundTruthForms) -> bool:
     response_tokens = response.split(' ')
-    ground_truth_tokens = ground_truth.split(' ')
 
-    if len(response_tokens) != len(ground_truth_tokens):
+    if len(response_tokens) != len(ground_truth_forms.tokens):
         return False
 
-    for response_token, ground_truth_token, in zip(response_tokens, ground_truth_tokens):
-        n_char_deviations = _n_char_deviations(response_token, ground_truth_token)
-        if n_char_deviations > TOLERATED_CHAR_DEVIATIONS_PER_TOKEN or n_char_deviations == TOLERATED_CHAR_DEVIATIONS_PER_TOKEN and not _char_deviation_tolerated(ground_truth_token):
+    for response_token, ground_truth_token in zip(response_tokens, ground_truth_forms.tokens):
+        n_tolerated_char_deviations = _TOLERATED_CHAR_DEVIATIONS_PER_TOKEN if _char_deviation_tolerated(ground_truth_token) else 0
+        if bounded_edit_distance(response_token, ground_truth_token, k=n_tolerated_char_deviations) > n_tolerated_char_deviations:
             return False
     return True
 
 
 def _char_deviation_tolerated(ground_truth: str) -> bool:
     return len(ground_truth) >= 4
-
-
-def _n_char_deviations(response: str, ground_truth: str) -> int:
-    n_deviations = 0
-
-    adjusted_response = response
-    for i in range(len(ground_truth)):
-
-        # exit if i has exceeded length of adjusted response
-        if i == len(adjusted_response):
-            n_deviations += len(ground_truth) - len(response)
-            break
-
-        elif adjusted_response[i] != ground_truth[i]:
-            n_deviations += 1
-
-            # new_value covering of cases in which one character has been omitted,
-            # such as in sopare <-> scopare
-            if len(ground_truth) > len(adjusted_response) and adjusted_response[i] == ground_truth[i+1]:
-                adjusted_response = adjusted_response[:i] + ' ' + adjusted_response[i:]
-
-            # new_value covering of cases in which character has been incorrectly inserted,
-            # such as in scopaare <-> scopare
-            elif len(adjusted_response) > len(ground_truth) and adjusted_response[i+1] == ground_truth[i]:
-                adjusted_response = adjusted_response[:i] + adjusted_response[i + 1:]
-                i -= 1
-
-    return n_deviations
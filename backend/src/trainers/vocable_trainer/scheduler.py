@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from heapq import heapify, heappop, heappush
+from typing import Iterable
+
+import numpy as np
+
+from backend.src.trainers.vocable_trainer.response_evaluation import ResponseEvaluation
+from backend.src.types.vocable_entry import VocableEntries
+from backend.src.utils.date import today_epoch_day
+
+
+# SM-2 response quality in [0, 5], responses of quality < 3 being regarded as failures
+_EVALUATION_2_QUALITY = {
+    ResponseEvaluation.NoResponse: 0,
+    ResponseEvaluation.Wrong: 1,
+    ResponseEvaluation.WrongArticle: 2,
+    ResponseEvaluation.MissingArticle: 3,
+    ResponseEvaluation.AlmostCorrect: 3,
+    ResponseEvaluation.AccentError: 4,
+    ResponseEvaluation.Correct: 5
+}
+
+_MIN_QUALITY_PASSED = 3
+_INITIAL_EASE = 2.5
+_MIN_EASE = 1.3
+
+# fractional epoch days after which failed entries become due again
+_RELEARNING_DELAY = 5 / (24 * 60)
+
+# interval assigned to entries having been perfected prior to their scheduling
+_PERFECTED_ENTRY_INTERVAL = 50
+
+
+@dataclass
+class SchedulingState:
+    due: float  # epoch day, fractional for relearning entries
+    ease: float
+    interval: int  # days
+    repetitions: int  # consecutive passed responses
+
+
+_HeapItem = tuple[float, float, int, str]  # due, ease, generation, vocable
+
+
+class VocableScheduler:
+    """ SM-2 spaced repetition scheduler, maintaining a min-heap keyed by (due, ease),
+        thus serving due entries of lower ease first
+
+        Re-scheduled entries are pushed anew, whilst their outdated heap items are
+        lazily discarded upon surfacing, rendering both next-item retrieval and
+        re-insertion O(log n); heap items are told apart from outdated ones by the
+        generation of their vocable, incremented upon each scheduling thereof """
+
+    def __init__(self, vocable_2_state: dict[str, SchedulingState] | None = None, heap: list[_HeapItem] | None = None):
+        """ Args:
+                heap: valid heap of the items corresponding to vocable_2_state, built if not passed """
+
+        self._vocable_2_state: dict[str, SchedulingState] = vocable_2_state or {}
+
+        # retained upon unscheduling, such that the heap items of a vocable scheduled anew
+        # thereafter aren't mistaken for current ones; 0 if not scheduled since instantiation
+        self._vocable_2_generation: dict[str, int] = {}
+
+        if heap is None:
+            heap = [(state.due, state.ease, 0, vocable) for vocable, state in self._vocable_2_state.items()]
+            heapify(heap)
+        self._heap: list[_HeapItem] = heap
+
+    def __len__(self) -> int:
+        return len(self._vocable_2_state)
+
+    def __contains__(self, vocable: str) -> bool:
+        return vocable in self._vocable_2_state
+
+    def state(self, vocable: str) -> SchedulingState:
+        return self._vocable_2_state[vocable]
+
+    # ----------------
+    # Synchronization
+    # ----------------
+    def synchronize(self, vocable_entries: VocableEntries):
+        """ Schedules vocable entries not scheduled yet, in accordance with their perfection,
+            and unschedules vocables no longer present in vocable_entries """
+
+        self.retain(vocable_entries.vocables)
+        self.schedule_unscheduled(vocable_entries)
+
+    def retain(self, vocables: Iterable[str]):
+        """ Unschedules vocables not comprised by vocables """
+
+        if removed_vocables := self._vocable_2_state.keys() - set(vocables):
+            for vocable in removed_vocables:
+                del self._vocable_2_state[vocable]
+
+    def unschedule(self, vocable: str):
+        """ Unschedules vocable, its heap items being discarded upon surfacing """
+
+        self._vocable_2_state.pop(vocable, None)
+
+    def schedule_unscheduled(self, vocable_entries: VocableEntries):
+        """ Schedules the ones of vocable_entries not scheduled yet, in accordance with their perfection """
+
+        unscheduled_entries = vocable_entries[
+            np.fromiter((vocable not in self._vocable_2_state for vocable in vocable_entries.vocables), dtype=bool, count=len(vocable_entries))
+        ]
+        today = today_epoch_day()
+
+        for entry, perfected in zip(unscheduled_entries, unscheduled_entries.perfected_mask(today).tolist()):
+            if perfected:
+                state = SchedulingState(due=entry.last_faced_date + _PERFECTED_ENTRY_INTERVAL, ease=_INITIAL_EASE, interval=_PERFECTED_ENTRY_INTERVAL, repetitions=2)  # type: ignore
+            else:
+                state = SchedulingState(due=today if entry.is_new else entry.last_faced_date, ease=_INITIAL_EASE, interval=0, repetitions=0)  # type: ignore
+            self._schedule(entry.vocable, state)
+
+    # ----------------
+    # Retrieval
+    # ----------------
+    def pop_due(self, now: float) -> str | None:
+        """ Returns:
+                vocable of smallest (due, ease) being due at now, None if none due """
+
+        while self._heap and self._heap[0][0] <= now:
+            if self._is_current(item := heappop(self._heap)):
+                return item[-1]
+        return None
+
+    def upcoming(self, n: int, now: float) -> list[str]:
+        """ Returns:
+                up to n vocables, due at now, in the order they'd be popped, without popping them;
+                obtained by means of a best-first traversal of the heap in O(n log n) """
+
+        upcoming: list[str] = []
+
+        candidates: list[tuple[_HeapItem, int]] = [(self._heap[0], 0)] if self._heap else []
+        while candidates and len(upcoming) < n:
+            item, i = heappop(candidates)
+            if item[0] > now:
+                break
+            if self._is_current(item):
+                upcoming.append(item[-1])
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(self._heap):
+                    heappush(candidates, (self._heap[child], child))
+
+        return upcoming
+
+    def due_vocables(self, now: float) -> list[str]:
+        """ Returns:
+                vocables due at now, in heap order; visits solely heap items due at now """
+
+        due_vocables: list[str] = []
+
+        stack = [0] if self._heap else []
+        while stack:
+            i = stack.pop()
+            if (item := self._heap[i])[0] > now:
+                continue
+            if self._is_current(item):
+                due_vocables.append(item[-1])
+            stack.extend(child for child in (2 * i + 1, 2 * i + 2) if child < len(self._heap))
+
+        return due_vocables
+
+    def _is_current(self, item: _HeapItem) -> bool:
+        *_, generation, vocable = item
+        return vocable in self._vocable_2_state and self._vocable_2_generation.get(vocable, 0) == generation
+
+    # ----------------
+    # Updating
+    # ----------------
+    def update(self, vocable: str, evaluation: ResponseEvaluation, now: float):
+        """ Reschedules vocable in accordance with SM-2, with failed entries becoming due
+            again after _RELEARNING_DELAY, that is possibly within the same session """
+
+        state = self._vocable_2_state[vocable]
+        quality = _EVALUATION_2_QUALITY[evaluation]
+
+        ease = max(_MIN_EASE, state.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+        if quality < _MIN_QUALITY_PASSED:
+            self._schedule(vocable, SchedulingState(due=now + _RELEARNING_DELAY, ease=ease, interval=0, repetitions=0))
+        else:
+            interval = [1, 6][state.repetitions] if state.repetitions < 2 else round(state.interval * state.ease)
+            self._schedule(vocable, SchedulingState(due=int(now) + interval, ease=ease, interval=interval, repetitions=state.repetitions + 1))
+
+    def _schedule(self, vocable: str, state: SchedulingState):
+        self._vocable_2_state[vocable] = state
+        generation = self._vocable_2_generation[vocable] = self._vocable_2_generation.get(vocable, 0) + 1
+        heappush(self._heap, (state.due, state.ease, generation, vocable))
+
+    # ----------------
+    # Persistence
+    # ----------------
+    def to_document(self) -> dict[str, list]:
+        """ Returns:
+                parallel state field lists in heap order, outdated heap items excluded """
+
+        self._heap = [(state.due, state.ease, self._vocable_2_generation.get(vocable, 0), vocable) for vocable, state in self._vocable_2_state.items()]
+        heapify(self._heap)
+
+        states = [self._vocable_2_state[vocable] for *_, vocable in self._heap]
+        return {
+            'v': [vocable for *_, vocable in self._heap],
+            'd': [state.due for state in states],
+            'e': [state.ease for state in states],
+            'i': [state.interval for state in states],
+            'r': [state.repetitions for state in states]
+        }
+
+    @classmethod
+    def from_document(cls, document: dict[str, list]) -> VocableScheduler:
+        """ Restores the heap as it is, without re-heapifying, the generations of
+            all vocables starting anew """
+
+        vocable_2_state = {
+            vocable: SchedulingState(due, ease, interval, repetitions)
+            for vocable, due, ease, interval, repetitions in _zipped(document, keys='vdeir')
+        }
+        return cls(vocable_2_state, heap=[(due, ease, 0, vocable) for due, ease, vocable in _zipped(document, keys='dev')])
+
+
+def _zipped(document: dict[str, list], keys: Iterable[str]) -> Iterable[tuple]:
+    return zip(*(document[key] for key in keys))
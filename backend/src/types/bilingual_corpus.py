@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import collections
+from collections import defaultdict
 from functools import cached_property
 from typing import Callable, Counter, Iterable, Iterator, Sequence
 
@@ -10,7 +11,7 @@ from tqdm import tqdm
 from typing_extensions import TypeAlias
 
 from backend.src.components.forename_convertor import DEFAULT_FORENAMES
-from backend.src.paths import corpora_path
+from backend.src.paths import corpora_path, length_index_path, pivot_join_path
 from backend.src.utils import iterables
 from backend.src.utils.io import PathLike, read_mmapped
 from backend.src.utils.iterables import intersection
@@ -23,6 +24,7 @@ from backend.src.utils.strings.transformation import special_characters_stripped
 # TODO: move mining related stuff to Miner
 
 SentencePair: TypeAlias = Sequence[str]
+LengthRange: TypeAlias = tuple[int, int]
 
 
 def percentage_sliced(ndarray: np.ndarray, percentage: float) -> np.ndarray:
@@ -37,12 +39,88 @@ def bilaterally_present_quote_stripped(sentence_pair: SentencePair) -> tuple[str
     return stripped(sentence_pair[0]), stripped(sentence_pair[1])
 
 
+class LengthIndex:
+    """ Sentence indices grouped into contiguous length buckets by sorting them with respect to
+        the lengths of their sentences, enabling the retrieval of the entirety of indices within
+        a length range by means of binary search
+
+    >>> length_index = LengthIndex.of_lengths(np.asarray([5, 2, 9, 2, 7]))
+    >>> length_index.indices((2, 5)).tolist()
+    [1, 3, 0]
+    >>> length_index.indices((8, 100)).tolist()
+    [2] """
+
+    def __init__(self, sorted_indices: np.ndarray, sorted_lengths: np.ndarray):
+        self._sorted_indices: np.ndarray = sorted_indices
+        self._sorted_lengths: np.ndarray = sorted_lengths
+
+    @classmethod
+    def of_lengths(cls, lengths: np.ndarray) -> LengthIndex:
+        sorted_indices = np.argsort(lengths, kind='stable')
+        return cls(sorted_indices, lengths[sorted_indices])
+
+    def save(self, file_path: PathLike):
+        np.savez(file_path, indices=self._sorted_indices, lengths=self._sorted_lengths)
+
+    @classmethod
+    def load(cls, file_path: PathLike) -> LengthIndex:
+        with np.load(file_path) as arrays:
+            return cls(arrays['indices'], arrays['lengths'])
+
+    def indices(self, length_range: LengthRange) -> np.ndarray:
+        """ Args:
+                length_range: inclusive (min_length, max_length)
+
+            Returns:
+                view onto the indices of sentences within length_range, unordered """
+
+        start = int(np.searchsorted(self._sorted_lengths, length_range[0], side='left'))
+        stop = int(np.searchsorted(self._sorted_lengths, length_range[1], side='right'))
+        return self._sorted_indices[start:stop]
+
+
+def corpus_version(language: str) -> str:
+    """ Returns:
+            identifier of the current state of the corpus of language, derived from the size and
+            modification time of its file, by which data derived from the corpus is keyed """
+
+    stat = corpora_path(language).stat()
+    return f'{stat.st_size:x}{stat.st_mtime_ns:x}'
+
+
+def english_pivot_join(english_sentences_a: np.ndarray, english_sentences_b: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """ Hash join in O(n + m) of two english corpora on identical sentences
+
+        Returns:
+            row indices (indices_a, indices_b) such that
+            english_sentences_a[indices_a] == english_sentences_b[indices_b],
+            ordered by indices_a
+
+    >>> english_pivot_join(np.asarray(['Hi.', 'Go.', 'Run!']), np.asarray(['Run!', 'Hi.', 'Hi.', 'Stop.']))
+    (array([0, 0, 2]), array([1, 2, 0])) """
+
+    sentence_2_indices_b: defaultdict[str, list[int]] = defaultdict(list)
+    for index_b, sentence in enumerate(english_sentences_b.tolist()):
+        sentence_2_indices_b[sentence].append(index_b)
+
+    indices_a: list[int] = []
+    indices_b: list[int] = []
+    for index_a, sentence in enumerate(english_sentences_a.tolist()):
+        for index_b in sentence_2_indices_b.get(sentence, ()):
+            indices_a.append(index_a)
+            indices_b.append(index_b)
+
+    return np.asarray(indices_a, dtype=np.int64), np.asarray(indices_b, dtype=np.int64)
+
+
 class BilingualCorpus(np.ndarray):
     """ np.ndarray[tuple[str, str]] of shape=(N_SENTENCES, 2)
 
         with:
             BilingualCorpus[:, 0] = REFERENCE LANGUAGE (english if _train_english False, else non-english-language)
-            BilingualCorpus[:, 1] = LEARN LANGUAGE (vice-versa) """
+            BilingualCorpus[:, 1] = LEARN LANGUAGE (vice-versa)
+
+        Pivot corpora, pairing two non-english languages, see BilingualCorpus.pivot """
 
     def __new__(cls, language: str, train_english=False) -> BilingualCorpus:
         obj = cls._load(
@@ -51,12 +129,54 @@ class BilingualCorpus(np.ndarray):
         )\
             .view(cls)
         obj._train_english = train_english
+        obj._language = language
         return obj
 
     def __array_finalize__(self, obj, *args, **kwargs):
         if obj is not None:
             self._train_english: bool = getattr(obj, '_train_english', None)  # type: ignore
 
+        # not inherited, since rows of derived arrays don't necessarily correspond to the ones of obj
+        self.learn_language_indices: np.ndarray | None = None
+
+        # language of the entire corpus file self corresponds to, None for derived arrays and pivot corpora
+        self._language: str | None = None
+
+    @classmethod
+    def pivot(cls, reference_language: str, learn_language: str) -> BilingualCorpus:
+        """ Joins the corpora of two non-english languages on identical english sentences,
+            with the reference language taking the place of english, that is the one of
+            english_corpus
+
+            The join row indices are cached per language pair and versions of both corpora,
+            whilst learn_language_indices is set to the row indices within the learn language's
+            own corpus, enabling the application of learn language token maps """
+
+        languages = sorted([reference_language, learn_language])
+        corpora = [cls(language) for language in languages]
+
+        if (path := pivot_join_path(languages[0], languages[1], corpus_versions=(corpus_version(languages[0]), corpus_version(languages[1])))).exists():
+            with np.load(path) as join_indices:
+                row_indices = [join_indices['a'], join_indices['b']]
+        else:
+            row_indices = list(english_pivot_join(*(corpus.english_corpus for corpus in corpora)))
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            for outdated_path in path.parent.glob(f'{languages[0]}-{languages[1]}-*.npz'):
+                outdated_path.unlink(missing_ok=True)
+            np.savez(path, a=row_indices[0], b=row_indices[1])
+
+        reference_position, learn_position = languages.index(reference_language), languages.index(learn_language)
+
+        obj = np.column_stack([
+            corpora[reference_position].non_english_corpus[row_indices[reference_position]],
+            corpora[learn_position].non_english_corpus[row_indices[learn_position]]
+        ])\
+            .view(cls)
+        obj._train_english = False
+        obj.learn_language_indices = row_indices[learn_position]
+        return obj
+
     @staticmethod
     def _load(path: PathLike, train_english: bool) -> np.ndarray:
         def cleaned_sentence_pairs() -> Iterator[SentencePair]:
@@ -98,8 +218,18 @@ class BilingualCorpus(np.ndarray):
 
             equals: np.ndarray[str] """
 
-        def __new__(cls, data: np.ndarray):
-            return data.view(BilingualCorpus.Corpus)
+        def __new__(cls, data: np.ndarray, length_index_key: tuple[str, str] | None = None):
+            """ Args:
+                    length_index_key: (language, column name) of the corpus file column data corresponds to,
+                        under which the length indices are persisted, None for them to be computed upon each
+                        instantiation """
+
+            obj = data.view(BilingualCorpus.Corpus)
+            obj._length_index_key = length_index_key
+            return obj
+
+        def __array_finalize__(self, obj, *args, **kwargs):
+            self._length_index_key: tuple[str, str] | None = None
 
         @cached_property
         def employs_latin_script(self) -> bool:
@@ -138,13 +268,107 @@ class BilingualCorpus(np.ndarray):
 
             return str().join(sorted(characters))
 
+        @cached_property
+        def char_lengths(self) -> np.ndarray:
+            return np.char.str_len(self)
+
+        @cached_property
+        def token_counts(self) -> np.ndarray:
+            return np.char.count(self, ' ') + 1
+
+        @cached_property
+        def char_length_index(self) -> LengthIndex:
+            return self._length_index('char-lengths', lambda: self.char_lengths)
+
+        @cached_property
+        def token_count_index(self) -> LengthIndex:
+            return self._length_index('token-counts', lambda: self.token_counts)
+
+        def _length_index(self, name: str, get_lengths: Callable[[], np.ndarray]) -> LengthIndex:
+            """ Returns:
+                    length index, loaded from the cache if persisted for the current corpus version,
+                    otherwise built and persisted, replacing the ones of outdated versions """
+
+            if self._length_index_key is None:
+                return LengthIndex.of_lengths(get_lengths())
+
+            language, column_name = self._length_index_key
+            if (path := length_index_path(language, f'{column_name}-{name}', corpus_version(language))).exists():
+                return LengthIndex.load(path)
+
+            length_index = LengthIndex.of_lengths(get_lengths())
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            for outdated_path in path.parent.glob(f'{language}-{column_name}-{name}-*.npz'):
+                outdated_path.unlink(missing_ok=True)
+            length_index.save(path)
+
+            return length_index
+
     @cached_property
     def english_corpus(self) -> Corpus:
-        return self.Corpus(self[:, int(self._train_english)])
+        return self.Corpus(self[:, int(self._train_english)], length_index_key=self._column_length_index_key('english'))
 
     @cached_property
     def non_english_corpus(self) -> Corpus:
-        return self.Corpus(self[:, int(not self._train_english)])
+        return self.Corpus(self[:, int(not self._train_english)], length_index_key=self._column_length_index_key('non-english'))
+
+    def _column_length_index_key(self, column_name: str) -> tuple[str, str] | None:
+        return None if self._language is None else (self._language, column_name)
+
+    # -------------------
+    # Length constrained sampling
+    # -------------------
+    def sample(self,
+               k: int,
+               char_length_range: LengthRange | None = None,
+               token_count_range: LengthRange | None = None,
+               english=False,
+               within: np.ndarray | None = None,
+               rng: np.random.Generator | None = None) -> BilingualCorpus:
+        """ Returns:
+                up to k randomly drawn, distinct sentence pairs, see sample_indices """
+
+        return self[self.sample_indices(k, char_length_range, token_count_range, english, within, rng)]
+
+    def sample_indices(self,
+                       k: int,
+                       char_length_range: LengthRange | None = None,
+                       token_count_range: LengthRange | None = None,
+                       english=False,
+                       within: np.ndarray | None = None,
+                       rng: np.random.Generator | None = None) -> np.ndarray:
+        """ Args:
+                k: number of indices to be drawn
+                char_length_range, token_count_range: inclusive length ranges the sentences
+                    have to lie within
+                english: whether the ranges refer to the english instead of the non-english sentences
+                within: sentence indices, e.g. the ones retained by a mode filter, to which the
+                    drawn ones are to be restricted
+                rng: generator to draw with
+
+            Returns:
+                up to k distinct sentence indices, drawn in O(k) if a single range
+                and no within indices passed, otherwise requiring an intersection of
+                the respective index arrays """
+
+        corpus = [self.non_english_corpus, self.english_corpus][english]
+        rng = rng or np.random.default_rng()
+
+        if char_length_range is not None:
+            candidates = corpus.char_length_index.indices(char_length_range)
+            if token_count_range is not None:
+                candidate_token_counts = corpus.token_counts[candidates]
+                candidates = candidates[(candidate_token_counts >= token_count_range[0]) & (candidate_token_counts <= token_count_range[1])]
+        elif token_count_range is not None:
+            candidates = corpus.token_count_index.indices(token_count_range)
+        else:
+            candidates = np.arange(len(self))
+
+        if within is not None:
+            candidates = np.intersect1d(candidates, within)
+
+        return rng.choice(candidates, size=min(k, len(candidates)), replace=False)
 
     # -------------------
     # Translation query
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import numpy as np
+
+from backend.src.paths import sentence_difficulties_path
+from backend.src.types.bilingual_corpus import BilingualCorpus, corpus_version
+from backend.src.types.token_maps import get_token_maps, Token2ComprisingSentenceIndices, TokenOccurrencesMap
+
+
+_RARITY_WEIGHT = 0.5
+_LENGTH_WEIGHT = 0.25
+_TOKEN_COUNT_WEIGHT = 0.25
+
+
+def get_sentence_difficulties(language: str) -> np.ndarray:
+    """ Args:
+            language: non-english language
+
+        Returns:
+            float32 array of shape=(len(BilingualCorpus(language)),), loaded if previously
+            persisted for the current corpus version, otherwise computed and persisted, replacing
+            the ones of outdated versions """
+
+    if (path := sentence_difficulties_path(language, corpus_version(language))).exists():
+        return np.load(path)
+
+    difficulties = compute_sentence_difficulties(BilingualCorpus(language).non_english_corpus, *get_token_maps(language))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for outdated_path in path.parent.glob(f'{language}-*.npy'):
+        outdated_path.unlink(missing_ok=True)
+    np.save(path, difficulties)
+
+    return difficulties
+
+
+def compute_sentence_difficulties(sentences: np.ndarray,
+                                  sentence_indices_map: Token2ComprisingSentenceIndices,
+                                  occurrences_map: TokenOccurrencesMap) -> np.ndarray:
+    """ Returns:
+            float32 array of weighted sum of the [0, 1]-normalized
+                mean token rarity, that is the mean negative log relative token occurrence,
+                character length and
+                token count
+            of the sentences
+
+        >>> sentences = np.asarray(['Ciao.', 'Ciao, come stai?', 'Il gatto mangia la farfalla rara.'])
+        >>> sentence_indices_map = {'ciao': [0, 1], 'come': [1], 'stai': [1], 'gatto': [2], 'farfalla': [2]}
+        >>> occurrences_map = {'ciao': 100, 'come': 50, 'stai': 50, 'gatto': 10, 'farfalla': 1}
+        >>> difficulties = compute_sentence_difficulties(sentences, sentence_indices_map, occurrences_map)
+        >>> difficulties.dtype, bool(difficulties[0] < difficulties[1] < difficulties[2])
+        (dtype('float32'), True) """
+
+    n_sentences = len(sentences)
+
+    # flatten map into parallel (sentence index, token rarity) arrays
+    tokens = [token for token in sentence_indices_map.keys() if occurrences_map.get(token)]
+    sentence_indices_per_token = [np.asarray(sentence_indices_map[token], dtype=np.int64) for token in tokens]
+    token_rarities = -np.log(np.asarray([occurrences_map[token] for token in tokens], dtype=np.float64) / max(occurrences_map.values(), default=1))
+
+    if tokens:
+        sentence_indices = np.concatenate(sentence_indices_per_token)
+        rarities = np.repeat(token_rarities, list(map(len, sentence_indices_per_token)))
+    else:
+        sentence_indices, rarities = np.empty(0, dtype=np.int64), np.empty(0)
+
+    n_rated_tokens = np.bincount(sentence_indices, minlength=n_sentences)[:n_sentences]
+    rarity_sums = np.bincount(sentence_indices, weights=rarities, minlength=n_sentences)[:n_sentences]
+    mean_rarities = np.divide(rarity_sums, n_rated_tokens, out=np.zeros(n_sentences), where=n_rated_tokens > 0)
+
+    lengths = np.char.str_len(sentences.astype(str))
+    token_counts = np.char.count(sentences.astype(str), ' ') + 1
+
+    return (
+        _RARITY_WEIGHT * _normalized(mean_rarities)
+        + _LENGTH_WEIGHT * _normalized(lengths)
+        + _TOKEN_COUNT_WEIGHT * _normalized(token_counts)
+    )\
+        .astype(np.float32)
+
+
+def _normalized(values: np.ndarray) -> np.ndarray:
+    """ Min-max normalization to [0, 1]
+
+        >>> _normalized(np.asarray([2, 4, 6]))
+        array([0. , 0.5, 1. ]) """
+
+    values = values.astype(np.float64)
+    if not len(values) or (value_range := values.max() - values.min()) == 0:
+        return np.zeros_like(values)
+    return (values - values.min()) / value_range
+
+
+def ascending_order_with_jitter(difficulties: np.ndarray, rng: np.random.Generator, n_buckets=20) -> np.ndarray:
+    """ Returns:
+            indices of difficulties partitioned into n_buckets equally sized buckets
+            of ascending difficulty, shuffled within each bucket;
+            obtained by means of argpartition, avoiding a full sort
+
+        >>> order = ascending_order_with_jitter(np.arange(100, dtype=np.float32), np.random.default_rng(69), n_buckets=4)
+        >>> [sorted(order[i: i + 25]) == list(range(i, i + 25)) for i in range(0, 100, 25)]
+        [True, True, True, True] """
+
+    bucket_bounds = np.linspace(0, len(difficulties), min(n_buckets, len(difficulties)) + 1, dtype=np.int64)
+
+    order = np.argpartition(difficulties, kth=bucket_bounds[1:-1]) if len(bucket_bounds) > 2 else np.arange(len(difficulties))
+    for start, stop in zip(bucket_bounds[:-1], bucket_bounds[1:]):
+        rng.shuffle(order[start:stop])
+
+    return order
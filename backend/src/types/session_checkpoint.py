@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+
+from backend.src.utils.io import load_json, PathLike, write_json
+
+
+@dataclass(frozen=True)
+class SessionCheckpoint:
+    """ Constant-size state sufficient for resuming a training session, that is for
+        regenerating its item order by means of seed and skipping the already faced items
+
+        filter_version and n_items serve the invalidation of checkpoints whose underlying
+        training items have changed since their creation
+
+        items_digest: digest of the locally persisted indices of the filtered training items,
+            by means of which they're restored without reapplying the filter, None if not persisted """
+
+    language: str
+    mode: str
+    seed: int
+    position: int
+    filter_version: int
+    n_items: int
+    items_digest: str | None = None
+
+    def to_document(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_document(cls, document: dict) -> SessionCheckpoint:
+        return cls(**document)
+
+    def save(self, file_path: PathLike):
+        write_json(self.to_document(), file_path)
+
+    @classmethod
+    def load(cls, file_path: PathLike) -> SessionCheckpoint:
+        return cls.from_document(load_json(file_path))
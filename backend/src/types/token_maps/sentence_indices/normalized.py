@@ -104,8 +104,15 @@ class LemmaSentenceIndicesMap(NormalizedToken2SentenceIndicesMap[SpacyToken]):
         return filter(lambda token: _pos(token) not in IGNORE_POS, tokens)
 
     def comprising_sentence_indices(self, vocable: str) -> list[int] | None:
-        types = self._types(vocable)
+        return self._types_comprising_sentence_indices(self._types(vocable))
 
+    def comprising_sentence_indices_batch(self, vocables: Iterable[str]) -> list[list[int] | None]:
+        """ Processes vocables by means of a single model pipe call """
+
+        assert self._model is not None
+        return [self._types_comprising_sentence_indices(set(self._filter_tokens(doc))) for doc in self._model.pipe(vocables)]
+
+    def _types_comprising_sentence_indices(self, types: set[SpacyToken]) -> list[int] | None:
         if pertinent_types := list(filter(lambda token: self._POS_TAG_2_PERTINENCE.get(_pos(token)) is not None, types)):
             pertinent_types.sort(key=lambda token: self._POS_TAG_2_PERTINENCE[_pos(token)])
             return self._find_best_fit_sentence_indices(relevance_sorted_types=_lemmas(pertinent_types))
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from itertools import repeat
+from typing import Iterable
 
 from backend.src.types.token_maps.custom_mapping import TokenMap
 from backend.src.types.token_maps.utils import display_creation_kickoff_message
@@ -56,6 +57,12 @@ class Token2ComprisingSentenceIndices(TokenMap[list[int]], ABC):
                 vocable: raw, unprocessed vocable of the same language as the types present in map;
                          may comprise singular word / word group | digits / special characters... """
 
+    def comprising_sentence_indices_batch(self, vocables: Iterable[str]) -> list[list[int] | None]:
+        """ Batch counterpart of comprising_sentence_indices, to be overridden by maps
+            able to process several vocables at once more efficiently """
+
+        return list(map(self.comprising_sentence_indices, vocables))
+
     def _find_best_fit_sentence_indices(self, relevance_sorted_types: list[str]) -> list[int] | None:
         """ Working Principle:
                 - query sentence indices corresponding to distinct types present in relevance_sorted_types
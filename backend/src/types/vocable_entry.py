@@ -1,33 +1,80 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import sys
+from typing import Iterable, Iterator, overload, Sequence
 
-from typing_extensions import TypeAlias
+import numpy as np
 
-from backend.src.utils.date import n_days_ago
+from backend.src.utils.date import today_epoch_day
 
 
-@dataclass
-class VocableEntry:
-    @classmethod
-    def new(cls, vocable: str, translation: str):
-        return cls(
-            vocable,
-            translation,
-            0,
-            0,
-            None
-        )
+PERFECTION_SCORE = 5
+PERFECTION_EXPIRY_DAYS = 50
 
-    vocable: str
-    translation: str
-    times_faced: int
-    score: float
-    last_faced_date: str | None
+
+def the_stripped_meaning(translation: str) -> str:
+    """ Returns:
+            whitespace-stripped translation devoid of a leading 'the ' article
+
+        >>> the_stripped_meaning(' the tea ')
+        'tea'
+        >>> the_stripped_meaning('to annoy, to bother')
+        'to annoy, to bother' """
+
+    return translation.strip().removeprefix('the ')
+
+
+class BaseVocableEntry:
+    """ VocableEntry API, shared by VocableEntry and the VocableEntries row views """
+
+    __slots__ = ()
+
+    # fields, declared as properties for VocableEntry to override by means of slots and
+    # VocableEntryRow by means of column accessors
+    @property
+    def vocable(self) -> str:
+        raise NotImplementedError
+
+    @vocable.setter
+    def vocable(self, value: str):
+        raise NotImplementedError
+
+    @property
+    def translation(self) -> str:
+        raise NotImplementedError
+
+    @translation.setter
+    def translation(self, value: str):
+        raise NotImplementedError
+
+    @property
+    def times_faced(self) -> int:
+        raise NotImplementedError
+
+    @times_faced.setter
+    def times_faced(self, value: int):
+        raise NotImplementedError
+
+    @property
+    def score(self) -> float:
+        raise NotImplementedError
+
+    @score.setter
+    def score(self, value: float):
+        raise NotImplementedError
+
+    @property
+    def last_faced_date(self) -> int | None:  # epoch day
+        raise NotImplementedError
+
+    @last_faced_date.setter
+    def last_faced_date(self, value: int | None):
+        raise NotImplementedError
 
     @property
-    def the_stripped_meaning(self):
-        return self.translation.lstrip('the ')
+    def the_stripped_meaning(self) -> str:
+        return the_stripped_meaning(self.translation)
 
     @property
     def is_new(self) -> bool:
@@ -44,12 +91,225 @@ class VocableEntry:
         self.score += increment
         self.times_faced += 1
 
+    def _fields(self) -> tuple:
+        return self.vocable, self.translation, self.times_faced, self.score, self.last_faced_date
+
+
+@dataclass
+class VocableEntry(BaseVocableEntry):
+    __slots__ = ('vocable', 'translation', 'times_faced', 'score', 'last_faced_date')
+
+    @classmethod
+    def new(cls, vocable: str, translation: str):
+        return cls(
+            vocable,
+            translation,
+            0,
+            0,
+            None
+        )
+
+    vocable: str
+    translation: str
+    times_faced: int
+    score: float
+    last_faced_date: int | None  # epoch day
+
 
-def is_perfected(entry: VocableEntry) -> bool:
+def is_perfected(entry: BaseVocableEntry) -> bool:
     if not entry.times_faced:
         return False
     assert entry.last_faced_date is not None
-    return entry.score >= 5 and n_days_ago(entry.last_faced_date) < 50
+    return entry.score >= PERFECTION_SCORE and today_epoch_day() - entry.last_faced_date < PERFECTION_EXPIRY_DAYS
+
+
+# ----------------
+# Columnar Entries
+# ----------------
+NEVER_FACED = np.iinfo(np.int32).min
+
+
+class VocableEntries(Sequence[BaseVocableEntry]):
+    """ Columnar vocable entry collection, comprising interned strings and numpy arrays
+        of the numeric fields, enabling the computation of masks over entire vocabularies
+        by means of single vectorized expressions
+
+        Integer indexing yields VocableEntryRow views writing through to the columns,
+        whereas slices, boolean masks and index arrays yield VocableEntries copies
+
+        last_faced_dates: epoch days, NEVER_FACED for new entries """
+
+    def __init__(self,
+                 vocables: Iterable[str] = (),
+                 translations: Iterable[str] = (),
+                 times_faced: Iterable[int] = (),
+                 scores: Iterable[float] = (),
+                 last_faced_dates: Iterable[int | None] = ()):
+
+        self.vocables: list[str] = list(map(sys.intern, vocables))
+        self.translations: list[str] = list(map(sys.intern, translations))
+        self.times_faced: np.ndarray = np.fromiter(times_faced, dtype=np.int32, count=len(self.vocables))
+        self.scores: np.ndarray = np.fromiter(scores, dtype=np.float64, count=len(self.vocables))
+        self.last_faced_dates: np.ndarray = np.fromiter(
+            (NEVER_FACED if date is None else date for date in last_faced_dates),
+            dtype=np.int32,
+            count=len(self.vocables)
+        )
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[BaseVocableEntry]) -> VocableEntries:
+        fields = list(zip(*(entry._fields() for entry in entries))) or [()] * 5
+        return cls(*fields)
+
+    @classmethod
+    def concatenated(cls, entries_sequence: Iterable[VocableEntries]) -> VocableEntries:
+        """ >>> pages = [VocableEntries.from_entries([VocableEntry.new('a', 'a')]), VocableEntries.from_entries([VocableEntry.new('b', 'b')])]
+            >>> VocableEntries.concatenated(pages).vocables
+            ['a', 'b'] """
+
+        if not (entries_list := list(entries_sequence)):
+            return cls()
+
+        return cls._from_columns(
+            vocables=[vocable for entries in entries_list for vocable in entries.vocables],
+            translations=[translation for entries in entries_list for translation in entries.translations],
+            times_faced=np.concatenate([entries.times_faced for entries in entries_list]),
+            scores=np.concatenate([entries.scores for entries in entries_list]),
+            last_faced_dates=np.concatenate([entries.last_faced_dates for entries in entries_list])
+        )
+
+    @classmethod
+    def _from_columns(cls, vocables: list[str], translations: list[str], times_faced: np.ndarray, scores: np.ndarray, last_faced_dates: np.ndarray) -> VocableEntries:
+        obj = cls.__new__(cls)
+        obj.vocables, obj.translations = vocables, translations
+        obj.times_faced, obj.scores, obj.last_faced_dates = times_faced, scores, last_faced_dates
+        return obj
+
+    def __len__(self) -> int:
+        return len(self.vocables)
+
+    @overload
+    def __getitem__(self, index: int) -> VocableEntryRow: ...
+
+    @overload
+    def __getitem__(self, index: slice | np.ndarray) -> VocableEntries: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            if not -len(self) <= index < len(self):
+                raise IndexError(index)
+            return VocableEntryRow(self, int(index) % len(self))
+
+        row_indices = np.arange(len(self))[index]
+        return self._from_columns(
+            vocables=[self.vocables[i] for i in row_indices.tolist()],
+            translations=[self.translations[i] for i in row_indices.tolist()],
+            times_faced=self.times_faced[row_indices],
+            scores=self.scores[row_indices],
+            last_faced_dates=self.last_faced_dates[row_indices]
+        )
+
+    def __iter__(self) -> Iterator[VocableEntryRow]:
+        return map(VocableEntryRow, [self] * len(self), range(len(self)))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({list(self)})'
+
+    # ----------------
+    # Masks
+    # ----------------
+    def perfected_mask(self, today: int | None = None) -> np.ndarray:
+        """ Vectorized is_perfected
+
+            Args:
+                today: epoch day, defaulting to the one of today
+
+            >>> entries = VocableEntries.from_entries([
+            ...     VocableEntry('a', 'a', 0, 0, None),
+            ...     VocableEntry('b', 'b', 4, 6.5, 19066),
+            ...     VocableEntry('c', 'c', 4, 6.5, 19000),
+            ...     VocableEntry('d', 'd', 4, 2, 19066)
+            ... ])
+            >>> entries.perfected_mask(today=19070)
+            array([False,  True, False, False])
+            >>> entries.due_mask(today=19070)
+            array([ True, False,  True,  True]) """
+
+        if today is None:
+            today = today_epoch_day()
+
+        return (self.times_faced > 0) \
+            & (self.scores >= PERFECTION_SCORE) \
+            & (today - self.last_faced_dates.astype(np.int64) < PERFECTION_EXPIRY_DAYS)
+
+    def due_mask(self, today: int | None = None) -> np.ndarray:
+        """ Returns:
+                mask of the entries to be trained, that is the non-perfected ones """
+
+        return ~self.perfected_mask(today)
+
+
+class VocableEntryRow(BaseVocableEntry):
+    """ Lightweight view of a VocableEntries row, reading from and writing to its columns
+
+        >>> entries = VocableEntries.from_entries([VocableEntry.new('il gatto', 'the cat')])
+        >>> row = entries[0]
+        >>> row.update_post_training_encounter(1.5)
+        >>> row == VocableEntry('il gatto', 'the cat', 1, 1.5, None), int(entries.times_faced[0])
+        (True, 1) """
+
+    __slots__ = ('_entries', '_i')
+
+    def __init__(self, entries: VocableEntries, i: int):
+        self._entries = entries
+        self._i = i
+
+    @property
+    def vocable(self) -> str:
+        return self._entries.vocables[self._i]
+
+    @vocable.setter
+    def vocable(self, value: str):
+        self._entries.vocables[self._i] = sys.intern(value)
+
+    @property
+    def translation(self) -> str:
+        return self._entries.translations[self._i]
+
+    @translation.setter
+    def translation(self, value: str):
+        self._entries.translations[self._i] = sys.intern(value)
+
+    @property
+    def times_faced(self) -> int:
+        return int(self._entries.times_faced[self._i])
+
+    @times_faced.setter
+    def times_faced(self, value: int):
+        self._entries.times_faced[self._i] = value
+
+    @property
+    def score(self) -> float:
+        return float(self._entries.scores[self._i])
+
+    @score.setter
+    def score(self, value: float):
+        self._entries.scores[self._i] = value
+
+    @property
+    def last_faced_date(self) -> int | None:
+        if (date := int(self._entries.last_faced_dates[self._i])) == NEVER_FACED:
+            return None
+        return date
+
+    @last_faced_date.setter
+    def last_faced_date(self, value: int | None):
+        self._entries.last_faced_dates[self._i] = NEVER_FACED if value is None else value
 
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BaseVocableEntry):
+            return NotImplemented
+        return self._fields() == other._fields()
 
-VocableEntries: TypeAlias = list[VocableEntry]
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}{self._fields()}'
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import Final, Literal, Optional, Sequence, Tuple
+
+
+AlignedIndexPair = Tuple[Optional[int], Optional[int]]
+
+# alignment steps
+_SUBSTITUTION: Final = 0
+_SUPERFLUOUS: Final = 1  # element of a missing in b
+_MISSING: Final = 2  # element of b missing in a
+
+_Step = Literal[0, 1, 2]
+
+
+def aligned_index_pairs(a: Sequence, b: Sequence, substitutions=True) -> list[AlignedIndexPair]:
+    """ Aligns a and b by means of the O(ND) furthest reaching diagonal algorithm (Ukkonen, Landau-Vishkin),
+        that is Myers' diff extended by substitutions, N being the sum of the sequence lengths and D their edit distance
+
+        Iterates over the number of edits d, storing for every diagonal k = a index - b index the furthest
+        a index reachable with d edits, trying substitutions prior to superfluous and missing elements,
+        whereupon the stored steps are traced back from the ends of both sequences
+
+        Args:
+            substitutions: whether to align unequal elements with each other; if False, the plain Myers' diff,
+                that is an alignment maximizing the number of equal elements, is computed, with
+                all unequal ones being aligned with None
+
+        Returns:
+            pairs of the aligned indices of a and b in ascending order, that is of
+                equal elements and substitutions: (i, j),
+                elements of a missing in b: (i, None),
+                elements of b missing in a: (None, j)
+
+        >>> aligned_index_pairs('scossare', 'scorsare')
+        [(0, 0), (1, 1), (2, 2), (3, 3), (4, 4), (5, 5), (6, 6), (7, 7)]
+        >>> aligned_index_pairs(['il', 'gatto', 'mangia'], ['gatto', 'beve'])
+        [(0, None), (1, 0), (2, 1)]
+        >>> aligned_index_pairs('opare', 'scopare')
+        [(None, 0), (None, 1), (0, 2), (1, 3), (2, 4), (3, 5), (4, 6)]
+        >>> aligned_index_pairs(['il', 'cane', 'mangia'], ['il', 'gatto', 'beve', 'mangia'], substitutions=False)
+        [(0, 0), (None, 1), (None, 2), (1, None), (2, 3)] """
+
+    n, m = len(a), len(b)
+
+    def slid(i: int, k: int) -> int:
+        """ Returns:
+                a index reached by following the equal elements along diagonal k, starting at i """
+
+        while i < n and i - k < m and a[i] == b[i - k]:
+            i += 1
+        return i
+
+    diagonal_2_furthest_index: dict[int, int] = {0: slid(0, 0)}
+    steps_per_n_edits: list[dict[int, tuple[int, _Step]]] = []
+
+    d = 0
+    while diagonal_2_furthest_index.get(n - m, -1) < n:
+        d += 1
+        diagonal_2_step: dict[int, tuple[int, _Step]] = {}
+
+        for k in range(max(-d, -m), min(d, n) + 1):
+            best: tuple[int, _Step] | None = None
+
+            if substitutions and (i := diagonal_2_furthest_index.get(k)) is not None and i < n and i - k < m:
+                best = (i + 1, _SUBSTITUTION)
+            if (i := diagonal_2_furthest_index.get(k - 1)) is not None and i < n and (best is None or i + 1 > best[0]):
+                best = (i + 1, _SUPERFLUOUS)
+            if (i := diagonal_2_furthest_index.get(k + 1)) is not None and i - k - 1 < m and (best is None or i > best[0]):
+                best = (i, _MISSING)
+
+            if best is not None:
+                diagonal_2_step[k] = best
+
+        steps_per_n_edits.append(diagonal_2_step)
+        diagonal_2_furthest_index = {k: slid(i, k) for k, (i, _) in diagonal_2_step.items()}
+
+    # trace back steps, emitting the equal elements slid along after each of them
+    reversed_pairs: list[AlignedIndexPair] = []
+
+    i, k = n, n - m
+    for d in range(len(steps_per_n_edits), 0, -1):
+        step_i, step = steps_per_n_edits[d - 1][k]
+        reversed_pairs.extend((j, j - k) for j in range(i - 1, step_i - 1, -1))
+
+        if step == _SUBSTITUTION:
+            reversed_pairs.append((step_i - 1, step_i - 1 - k))
+            i = step_i - 1
+        elif step == _SUPERFLUOUS:
+            reversed_pairs.append((step_i - 1, None))
+            i, k = step_i - 1, k - 1
+        else:
+            reversed_pairs.append((None, step_i - k - 1))
+            i, k = step_i, k + 1
+
+    reversed_pairs.extend((j, j) for j in range(i - 1, -1, -1))
+    return reversed_pairs[::-1]
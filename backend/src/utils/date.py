@@ -1,6 +1,9 @@
 import datetime
 
 
+_EPOCH = datetime.date(1970, 1, 1)
+
+
 def n_days_ago(date: str) -> int:
     """ Args:
             date: format of today value
@@ -16,3 +19,44 @@ def string_2_date(date: str) -> datetime.date:
             date: format of today value"""
 
     return datetime.datetime.strptime(date, '%Y-%m-%d').date()
+
+
+# ----------------
+# Epoch Days
+# ----------------
+def today_epoch_day() -> int:
+    return date_2_epoch_day(datetime.date.today())
+
+
+def date_2_epoch_day(date: datetime.date) -> int:
+    """ Returns:
+            number of days passed between 1970-01-01 and date
+
+        >>> date_2_epoch_day(datetime.date(1970, 1, 11))
+        10 """
+
+    return (date - _EPOCH).days
+
+
+def string_2_epoch_day(date: str) -> int:
+    """ Args:
+            date: format of today value
+
+        >>> string_2_epoch_day('2022-03-15')
+        19066 """
+
+    return date_2_epoch_day(string_2_date(date))
+
+
+def epoch_day_2_date(epoch_day: int) -> datetime.date:
+    """ >>> epoch_day_2_date(19066)
+        datetime.date(2022, 3, 15) """
+
+    return _EPOCH + datetime.timedelta(days=epoch_day)
+
+
+def epoch_day_now() -> float:
+    """ Returns:
+            fractional epoch day of the current local time, whose integer part equals today_epoch_day() """
+
+    return (datetime.datetime.now() - datetime.datetime.combine(_EPOCH, datetime.time())).total_seconds() / 86_400
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+
+def bounded_edit_distance(a: str, b: str, k: int, transpositions=False) -> int:
+    """ Levenshtein distance, or, if transpositions, optimal string alignment distance, that is
+        the Damerau-Levenshtein distance without substring edits subsequent to transpositions
+
+        Solely computes the dynamic programming cells within the diagonal band |i - j| <= k
+        (Ukkonen), exiting as soon as all cells of a row exceed k, thus running in O(k * min(len(a), len(b)))
+        time and O(k) space
+
+        Returns:
+            distance if <= k, otherwise k + 1
+
+        >>> bounded_edit_distance('scopare', 'scoare', k=1)
+        1
+        >>> bounded_edit_distance('sad', 'scopare', k=10)
+        5
+        >>> bounded_edit_distance('sad', 'scopare', k=2)
+        3
+        >>> bounded_edit_distance('socpare', 'scopare', k=2), bounded_edit_distance('socpare', 'scopare', k=2, transpositions=True)
+        (2, 1) """
+
+    # strip common prefix and suffix, not affecting the distance
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    stop_a, stop_b = len(a), len(b)
+    while stop_a > start and stop_b > start and a[stop_a - 1] == b[stop_b - 1]:
+        stop_a -= 1
+        stop_b -= 1
+    a, b = a[start:stop_a], b[start:stop_b]
+
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) > k:
+        return k + 1
+    if not a:
+        return len(b)
+
+    exceeded = k + 1
+
+    # band rows of the 2k + 1 cells |i - j| <= k, cell (i, j) residing at index j - i + k + 1
+    # of the row of i, framed by a cell set to exceeded on either side
+    def band_index(i: int, j: int) -> int:
+        return j - i + k + 1
+
+    previous_previous_row: list[int] = []
+    previous_row = [exceeded] + [j if 0 <= j <= len(b) else exceeded for j in range(-k, k + 1)] + [exceeded]
+
+    for i in range(1, len(a) + 1):
+        row = [exceeded] * (2 * k + 3)
+        if i <= k:
+            row[band_index(i, 0)] = i
+
+        row_minimum = min(i, exceeded)
+        for j in range(max(1, i - k), min(len(b), i + k) + 1):
+            d = band_index(i, j)
+            cost = a[i - 1] != b[j - 1]
+            # diagonal, upper and left neighbours residing at d, d + 1 and d - 1 respectively
+            distance = min(previous_row[d] + cost, previous_row[d + 1] + 1, row[d - 1] + 1)
+
+            if transpositions and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                distance = min(distance, previous_previous_row[d] + 1)
+
+            row[d] = min(distance, exceeded)
+            row_minimum = min(row_minimum, row[d])
+
+        if row_minimum > k:
+            return exceeded
+
+        previous_previous_row, previous_row = previous_row, row
+
+    return previous_row[band_index(len(a), len(b))]
@@ -67,3 +67,16 @@ def chinese_forename_converter():
 def test_forenames_conversion_chinese(sentence_pair, expected_sentence_pair, chinese_forename_converter):
     for converted, expected in zip(chinese_forename_converter(sentence_pair), expected_sentence_pair):
         assert converted == expected
+
+
+def test_batch_conversion(italian_forename_converter):
+    sentence_pairs = [
+        ["I am hungry.", "Ho fame."],
+        ["Tomorrow, Tom will cut the olive tree.", "Domani Tomás taglierà l'ulivo."],
+        ["Tomorrow, I will cut the olive tree.", "Domani taglierò l'ulivo."],
+        ["Tom's purpose in college is to get a degree.", "Lo scopo di Tom all'università è laurearsi."]
+    ]
+    converted_sentence_pairs = italian_forename_converter.convert_batch([list(sentence_pair) for sentence_pair in sentence_pairs])
+
+    assert [converted == original for converted, original in zip(converted_sentence_pairs, sentence_pairs)] == [True, False, True, False]
+    assert not any('Tom' in sentence for sentence_pair in converted_sentence_pairs for sentence in sentence_pair if 'Tomorrow' not in sentence)
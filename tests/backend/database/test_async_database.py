@@ -0,0 +1,99 @@
+import asyncio
+import datetime
+from functools import wraps
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from backend.src.database.aio import AsyncClient, AsyncCredentialsDatabase, AsyncUserDatabase
+from backend.src.database.user_database import VocabularyCollection
+from backend.src.types.vocable_entry import VocableEntries, VocableEntry
+from backend.src.utils.date import today_epoch_day
+from tests.conftest import MONGODB_TEST_USER
+
+
+def _run(test):
+    """ Runs the coroutine test within a dedicated event loop """
+
+    @wraps(test)
+    def wrapper(*args, **kwargs):
+        asyncio.run(test(*args, **kwargs))
+
+    return wrapper
+
+
+def _client() -> AsyncClient:
+    return AsyncClient(server_selection_timeout=2_000)
+
+
+@_run
+async def test_vocabulary_collection():
+    user_database = AsyncUserDatabase(_client(), MONGODB_TEST_USER, 'Swedish')
+    vocabulary_collection = user_database.vocabulary_collection
+    assert vocabulary_collection.name == 'vocabulary'
+
+    await vocabulary_collection.upsert_entry(VocableEntry.new('hund', 'dog'))
+    await vocabulary_collection.upsert_entry(VocableEntry.new('vovve', 'the dog'))
+    await vocabulary_collection.update_entry('hund', new_score=6.0)
+
+    assert sorted(await vocabulary_collection.vocables()) == ['hund', 'vovve']
+    assert await user_database.paraphrase_index_collection.paraphrases() == {'dog': ['hund', 'vovve']}
+
+    due_entries = VocableEntries.concatenated([page async for page in vocabulary_collection.query_entries(due_only=True)])
+    assert due_entries.vocables == ['vovve']
+
+    # documents identical to the ones of the synchronous collection
+    assert await vocabulary_collection.find_one({'language': 'Swedish', 'vocable': 'hund'}, projection={'_id': False}) == {
+        'language': 'Swedish', 'vocable': 'hund', 't': 'dog', 'tf': 1, 's': 6.0, 'lfd': today_epoch_day(), 'due': today_epoch_day() + 50
+    }
+    assert vocabulary_collection._entry_2_document.__func__ is VocabularyCollection._entry_2_document
+
+    await user_database.remove_language_related_documents()
+    assert not await vocabulary_collection.entries()
+
+
+@_run
+async def test_concurrent_sessions():
+    client = _client()
+    user_databases = [AsyncUserDatabase(client, MONGODB_TEST_USER, f'Language {i}') for i in range(50)]
+
+    await asyncio.gather(*(user_database.vocabulary_collection.upsert_entry(VocableEntry.new('hund', user_database.language)) for user_database in user_databases))
+    entries = await asyncio.gather(*(user_database.vocabulary_collection.entries() for user_database in user_databases))
+    assert [entry[0].translation for entry in entries] == [user_database.language for user_database in user_databases]
+
+    await asyncio.gather(*(user_database.remove_language_related_documents() for user_database in user_databases))
+
+
+@_run
+async def test_training_chronic_and_language_metadata():
+    user_database = AsyncUserDatabase(_client(), MONGODB_TEST_USER, 'Swedish')
+
+    await user_database.training_chronic_collection.upsert_session_statistics('v', n_faced_items=3)
+    assert (await user_database.training_chronic_collection.last_session_statistics())['nFacedItems'] == 3
+    assert await user_database.training_chronic_collection.total_statistics() == {'v': 3}
+    assert await user_database.training_chronic_collection.daily_statistics(datetime.date.today(), datetime.date.today()) == {str(datetime.date.today()): {'v': 3}}
+    assert (await user_database.training_chronic_collection.streak())['length'] == 1
+
+    await user_database.language_metadata_collection.upsert_accent('Swedish (Sweden)')
+    assert await user_database.language_metadata_collection.query_accent() == 'Swedish (Sweden)'
+
+    await user_database.remove_language_related_documents()
+    assert await user_database.training_chronic_collection.training_chronic() is None
+    assert await user_database.language_metadata_collection.query_accent() is None
+
+
+@_run
+async def test_credentials_database():
+    credentials_database = AsyncCredentialsDatabase(_client())
+    username = 'doctor_pepper'
+
+    await credentials_database.initialize_user(username, 'doctorpepper@poppers.com', 'doctorpepperpassword')
+
+    assert await credentials_database.usernames() == [username]
+    assert await credentials_database.mail_address_taken('doctorpepper@poppers.com')
+    assert await credentials_database.query_password(username) == 'doctorpepperpassword'
+    with pytest.raises(DuplicateKeyError):
+        await credentials_database.initialize_user(username, 'doctorsalt@poppers.com', 'doctorsaltpassword')
+
+    await credentials_database.remove_user(username)
+    assert not await credentials_database.username_taken(username)
@@ -0,0 +1,61 @@
+from backend.src.database.command_monitoring import _caller, CommandKey, CommandMonitor, InMemorySink, PrometheusTextFileSink, tagged
+from backend.src.database.mongo_client import Client
+
+
+def test_command_metrics(user_database):
+    command_monitor = Client.established().command_monitor
+
+    user_database.vocabulary_collection.vocabulary_possessing_languages()
+    user_database.training_chronic_collection.session_checkpoint('v')
+
+    snapshot = command_monitor.snapshot()
+    assert snapshot.commands[CommandKey('vocabulary', 'distinct', 'VocabularyCollection.vocabulary_possessing_languages')].n_commands >= 2
+    metrics = snapshot.commands[CommandKey('training_chronic', 'find', 'TrainingChronicCollection.session_checkpoint')]
+    assert metrics.n_commands >= 1
+    assert metrics.n_failures == 0
+    assert 0 < metrics.mean_latency <= metrics.latency_quantile(1.0)
+    assert snapshot.pool_statistics.n_checkouts > 0
+
+
+def test_outermost_caller_tag_retained():
+    class Collection:
+        @tagged
+        def outer(self):
+            return self.inner()
+
+        @tagged
+        def inner(self):
+            return _caller.get()
+
+    assert Collection().outer() == 'Collection.outer'
+    assert Collection().inner() == 'Collection.inner'
+    assert not _caller.get()
+
+
+def test_generator_tagged_upon_iteration():
+    class Collection:
+        @tagged
+        def pages(self):
+            yield _caller.get()
+            yield _caller.get()
+
+        @tagged
+        def outer(self):
+            return list(self.pages())
+
+    pages = Collection().pages()
+    assert not _caller.get()
+    assert list(pages) == ['Collection.pages', 'Collection.pages']
+    assert Collection().outer() == ['Collection.outer', 'Collection.outer']
+    assert not _caller.get()
+
+
+def test_sinks(tmp_path):
+    in_memory_sink = InMemorySink()
+    prometheus_file_path = tmp_path / 'mongodb.prom'
+    command_monitor = CommandMonitor(sinks=[in_memory_sink, PrometheusTextFileSink(prometheus_file_path)], export_interval=3600)
+
+    command_monitor.close()
+
+    assert in_memory_sink.snapshot.commands == {}
+    assert prometheus_file_path.read_text().startswith('# TYPE mongodb_command_duration_seconds histogram')
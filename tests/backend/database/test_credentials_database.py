@@ -1,4 +1,5 @@
 import pytest
+from pymongo.errors import DuplicateKeyError
 
 from backend.src.database.credentials_database import CredentialsDatabase
 
@@ -14,10 +15,46 @@ def test_credentials_database(credentials_database):
     credentials_database.initialize_user(username, 'doctorpepper@poppers.com', 'doctorpepperpassword')
 
     assert credentials_database.usernames() == [username]
+    assert credentials_database.username_taken(username)
+    assert credentials_database.mail_address_taken('doctorpepper@poppers.com')
     assert credentials_database.query_password(username) == 'doctorpepperpassword'
     assert list(credentials_database.mail_addresses()) == ['doctorpepper@poppers.com']
 
+    with pytest.raises(DuplicateKeyError):
+        credentials_database.initialize_user('doctor_salt', 'doctorpepper@poppers.com', 'doctorsaltpassword')
+
     credentials_database.remove_user(username)
 
     assert credentials_database.usernames() == []
+    assert not credentials_database.username_taken(username)
+    assert not credentials_database.mail_address_taken('doctorpepper@poppers.com')
     assert not list(credentials_database.mail_addresses())
+
+
+def test_user_collection_migration(credentials_database):
+    username = 'doctor_pepper'
+    credentials_database[username].insert_one({'_id': 'unique', 'emailAddress': 'doctorpepper@poppers.com', 'password': 'doctorpepperpassword'})
+
+    credentials_database.migrate_user_collections()
+    credentials_database.migrate_user_collections()
+
+    assert credentials_database.list_collection_names() == ['user_registry']
+    assert credentials_database.usernames() == [username]
+    assert credentials_database.query_password(username) == 'doctorpepperpassword'
+
+    credentials_database.remove_user(username)
+
+
+def test_lazy_user_collection_migration(credentials_database):
+    credentials_database['doctor_pepper'].insert_one({'_id': 'unique', 'emailAddress': 'doctorpepper@poppers.com', 'password': 'doctorpepperpassword'})
+
+    # registry miss triggering the migration
+    assert CredentialsDatabase().query_password('doctor_pepper') == 'doctorpepperpassword'
+
+    # conflicting user being reported and retained
+    credentials_database['doctor_salt'].insert_one({'_id': 'unique', 'emailAddress': 'doctorpepper@poppers.com', 'password': 'doctorsaltpassword'})
+    assert CredentialsDatabase().migrate_user_collections() == ['doctor_salt']
+    assert sorted(credentials_database.list_collection_names()) == ['doctor_salt', 'user_registry']
+
+    credentials_database.remove_user('doctor_pepper')
+    credentials_database.drop_collection('doctor_salt')
@@ -0,0 +1,30 @@
+from backend.src.database import connect_database_client
+from backend.src.database.connection_pool import PoolOptions
+from backend.src.database.mongo_client import Client
+
+
+def test_client_instantiated_once(caplog):
+    client = Client.established()
+    assert client is not None
+    assert client.healthy()
+
+    assert connect_database_client() is None
+    assert Client.established().pool_monitor is client.pool_monitor
+    assert not caplog.records
+
+    # differing options being ignored, yet warned about
+    assert connect_database_client(pool_options=PoolOptions(max_pool_size=7)) is None
+    assert Client.established().pool_options == PoolOptions()
+    assert 'differing from the ones of the established client' in caplog.text
+
+
+def test_pool_statistics(user_database):
+    statistics = Client.established().pool_statistics
+    n_checkouts = statistics.n_checkouts
+
+    user_database.training_chronic_collection.training_chronic()
+
+    assert statistics.n_checkouts > n_checkouts
+    assert statistics.n_open_connections >= 1
+    assert statistics.n_waiting == 0
+    assert 0 < statistics.checkout_latency_quantile(0.5) <= statistics.checkout_latency_quantile(0.99)
@@ -1,6 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 import datetime
 from itertools import chain
 
+from pymongo.collection import Collection
+from pymongo.errors import AutoReconnect, BulkWriteError
+import pytest
+
+from backend.src.database.user_database import LanguageMetadataCollection, UserDatabase, VocabularyChanges
+from backend.src.types.session_checkpoint import SessionCheckpoint
+from backend.src.types.vocable_entry import VocableEntries, VocableEntry
+from backend.src.utils.date import today_epoch_day
 from tests.conftest import MONGODB_TEST_LANGUAGE, MONGODB_TEST_USER
 
 
@@ -25,6 +35,47 @@ def test_user_mongo_client_attribute_reflection_in_collection(user_database):
     assert user_database.vocabulary_collection.language == user_database.language
 
 
+def test_language_scoped_handle(user_database):
+    swedish_user_database = user_database.for_language('Swedish')
+
+    assert swedish_user_database.vocabulary_collection.language == 'Swedish'
+    assert user_database.vocabulary_collection.language == MONGODB_TEST_LANGUAGE
+    assert swedish_user_database.client is user_database.client
+    assert swedish_user_database.write_behind_buffer is user_database.write_behind_buffer
+    assert UserDatabase.instance() is user_database
+
+
+def test_concurrent_sessions(user_database, throwaway_user_database):
+    languages = [f'Language {i}' for i in range(16)]
+
+    def session(language: str) -> tuple[bool, VocableEntry, SessionCheckpoint | None]:
+        with UserDatabase(throwaway_user_database.user, language) as session_user_database:
+            session_user_database.vocabulary_collection.upsert_entry(VocableEntry.new('hund', language))
+            session_user_database.vocabulary_collection.update_entry('hund', new_score=float(len(language)))
+            session_user_database.training_chronic_collection.upsert_session_checkpoint(
+                'v', SessionCheckpoint(language=language, mode='simple', seed=len(language), position=0, filter_version=0, n_items=1)
+            )
+
+            result = (
+                UserDatabase.instance() is session_user_database,
+                session_user_database.vocabulary_collection.entries()[0],
+                session_user_database.training_chronic_collection.session_checkpoint('v')
+            )
+            return result
+
+    with ThreadPoolExecutor(max_workers=len(languages)) as executor:
+        results = list(executor.map(session, languages))
+
+    for language, (current, entry, checkpoint) in zip(languages, results):
+        assert current
+        assert (entry.translation, entry.times_faced, entry.score) == (language, 1, len(language))
+        assert checkpoint.language == language
+
+    # handle of the main thread unaffected
+    assert UserDatabase.instance() is user_database
+    assert user_database.language == MONGODB_TEST_LANGUAGE
+
+
 def test_training_chronic_collection(user_database):
     language = 'Swedish'
     n_faced_items = 69
@@ -45,6 +96,31 @@ def test_training_chronic_collection(user_database):
     assert not training_chronic[today_str][trainer] % n_faced_items
 
 
+def test_training_chronic_rollups(throwaway_user_database):
+    throwaway_user_database.language = 'Swedish'
+    training_chronic_collection = throwaway_user_database.training_chronic_collection
+    today = datetime.date.today()
+    two_days_ago = today - datetime.timedelta(days=2)
+
+    # daily statistics preceding the rollups
+    training_chronic_collection.update_one({'_id': 'Swedish'}, {'$set': {'2022-03-13': None, str(two_days_ago): {'v': 4}, '2022-03-14': {'s': 2}, '2022-03-15': {'s': 1}}}, upsert=True)
+    assert training_chronic_collection.total_statistics() == {'v': 4, 's': 3}
+    assert training_chronic_collection.weekly_statistics(datetime.date(2022, 3, 13), datetime.date(2022, 3, 15)) == {'2022-W11': {'s': 3}}
+    assert training_chronic_collection.streak(today=two_days_ago) == {'length': 1, 'longest': 2, 'lastDate': str(two_days_ago)}
+
+    training_chronic_collection.upsert_session_statistics('v', n_faced_items=3)
+    training_chronic_collection.upsert_session_statistics('s', n_faced_items=5)
+
+    assert training_chronic_collection.daily_statistics(two_days_ago, today) == {str(two_days_ago): {'v': 4}, str(today): {'v': 3, 's': 5}}
+    assert sum(chain.from_iterable(map(dict.values, training_chronic_collection.weekly_statistics(two_days_ago, today).values()))) == 12
+    assert training_chronic_collection.monthly_statistics(datetime.date(2022, 1, 1), datetime.date(2022, 12, 31)) == {'2022-03': {'s': 3}}
+    assert training_chronic_collection.total_statistics() == {'v': 7, 's': 8}
+    assert set(training_chronic_collection.training_chronic()) == {'2022-03-13', '2022-03-14', '2022-03-15', str(two_days_ago), str(today)}
+
+    assert training_chronic_collection.streak() == {'length': 1, 'longest': 2, 'lastDate': str(today)}
+    assert training_chronic_collection.streak(today=today + datetime.timedelta(days=2))['length'] == 0
+
+
 def test_training_chronic_comprised_languages(user_database):
     assert user_database.training_chronic_collection.comprised_languages() == {
         'Albanian',
@@ -88,4 +164,220 @@ def test_training_chronic_comprised_languages(user_database):
         'Urdu',
         'Vietnamese',
         'Waray'
-    }
\ No newline at end of file
+    }
+
+
+def test_session_checkpoint(user_database):
+    checkpoint = SessionCheckpoint(language=MONGODB_TEST_LANGUAGE, mode='simple', seed=69, position=420, filter_version=0, n_items=1000)
+
+    user_database.training_chronic_collection.upsert_session_checkpoint('s', checkpoint)
+    assert user_database.training_chronic_collection.session_checkpoint('s') == checkpoint
+
+    user_database.training_chronic_collection.delete_session_checkpoint('s')
+    assert user_database.training_chronic_collection.session_checkpoint('s') is None
+
+
+def test_last_faced_date_migration(user_database):
+    user_database.language = 'Swedish'
+    user_database.vocabulary_collection.update_one(
+        filter={'_id': 'Swedish'},
+        update={'$set': {'hund': {'t': 'dog', 'tf': 3, 's': 6.0, 'lfd': '2022-03-15'}, 'katt': {'t': 'cat', 'tf': 0, 's': 0, 'lfd': None}}},
+        upsert=True
+    )
+    user_database.vocabulary_collection.migrate_language_documents()
+
+    assert {entry.vocable: entry.last_faced_date for entry in user_database.vocabulary_collection.entries()} == {'hund': 19066, 'katt': None}
+    assert user_database.vocabulary_collection.find_one({'language': 'Swedish', 'vocable': 'hund'})['lfd'] == 19066
+    assert user_database.vocabulary_collection.find_one('Swedish') is None
+
+    user_database.vocabulary_collection.remove_language_related_documents()
+
+
+def test_paraphrase_index_build(user_database):
+    user_database.language = 'Swedish'
+    user_database.paraphrase_index_collection.remove_language_related_documents()
+    user_database.vocabulary_collection.insert_many([
+        {'language': 'Swedish', 'vocable': vocable, 't': translation, 'tf': 0, 's': 0.0, 'lfd': None, 'due': 0}
+        for vocable, translation in [('hund', 'dog'), ('vovve', 'dog')]
+    ])
+
+    # document added prior to the index having been built
+    user_database.vocabulary_collection.upsert_entry(VocableEntry.new('valp', 'dog'))
+    assert user_database.paraphrase_index_collection.paraphrases() == {'dog': ['valp', 'hund', 'vovve']}
+
+    # build not being repeated
+    user_database.paraphrase_index_collection.remove('hund', 'dog')
+    assert user_database.paraphrase_index_collection.paraphrases() == {'dog': ['valp', 'vovve']}
+
+    user_database.vocabulary_collection.remove_language_related_documents()
+    user_database.paraphrase_index_collection.remove_language_related_documents()
+
+
+def test_vocabulary_indexes(user_database):
+    user_database.language = 'Swedish'
+    user_database.vocabulary_collection.upsert_entry(VocableEntry.new('hund', 'dog'))
+
+    index_information = user_database.vocabulary_collection.index_information()
+    assert index_information['language_1_vocable_1']['unique']
+    assert index_information['language_1_due_1']['key'] == [('language', 1), ('due', 1)]
+
+    user_database.vocabulary_collection.remove_language_related_documents()
+
+
+def test_query_entries(user_database):
+    user_database.language = 'Swedish'
+    today = today_epoch_day()
+    user_database.vocabulary_collection.update_one(
+        filter={'_id': 'Swedish'},
+        update={'$set': {
+            'katt': {'t': 'cat', 'tf': 0, 's': 0, 'lfd': None},
+            'hund': {'t': 'dog', 'tf': 3, 's': 2.0, 'lfd': today - 3},
+            'häst': {'t': 'horse', 'tf': 5, 's': 6.0, 'lfd': today - 3},
+            'ko': {'t': 'cow', 'tf': 5, 's': 6.0, 'lfd': today - 60},
+            'get': {'t': 'goat', 'tf': 5, 's': 6.0, 'lfd': '2022-03-15'}
+        }},
+        upsert=True
+    )
+    user_database.vocabulary_collection.migrate_language_documents()
+
+    assert sorted(user_database.vocabulary_collection.vocables()) == ['get', 'hund', 'häst', 'katt', 'ko']
+
+    due_pages = list(user_database.vocabulary_collection.query_entries(due_only=True, page_size=2))
+    assert all(len(page) <= 2 for page in due_pages)
+    assert sorted(VocableEntries.concatenated(due_pages).vocables) == ['get', 'hund', 'katt', 'ko']
+
+    entries = VocableEntries.concatenated(user_database.vocabulary_collection.query_entries(vocables=['häst', 'hund', 'älg']))
+    assert sorted(entries, key=lambda entry: entry.vocable) == [VocableEntry('hund', 'dog', 3, 2.0, today - 3), VocableEntry('häst', 'horse', 5, 6.0, today - 3)]
+
+    user_database.vocabulary_collection.remove_language_related_documents()
+
+
+def test_vocabulary_changes_recording(user_database):
+    user_database.language = 'Swedish'
+    schedule_collection = user_database.vocable_schedule_collection
+    try:
+        for vocable in ['hund', 'katt', 'häst']:
+            user_database.vocabulary_collection.upsert_entry(VocableEntry.new(vocable, 'animal'))
+        user_database.vocabulary_collection.delete_entry(VocableEntry.new('katt', 'animal'))
+        user_database.vocabulary_collection.alter_entry('häst', VocableEntry.new('ko', 'cow'))
+
+        schedule, changes = schedule_collection.schedule_and_vocabulary_changes()
+        assert schedule is None
+        assert (sorted(changes.added), changes.deleted) == (['hund', 'ko'], ['katt', 'häst'])
+
+        # changes recorded whilst synchronizing being retained
+        schedule_collection.upsert_schedule({'v': ['hund', 'ko']}, reconciled_changes=changes)
+        user_database.vocabulary_collection.upsert_entry(VocableEntry.new('get', 'goat'))
+        assert schedule_collection.schedule_and_vocabulary_changes() == ({'v': ['hund', 'ko']}, VocabularyChanges(added=['get']))
+    finally:
+        user_database.vocabulary_collection.remove_language_related_documents()
+        user_database.paraphrase_index_collection.remove_language_related_documents()
+        schedule_collection.remove_language_related_documents()
+
+
+def test_write_behind_buffer(user_database):
+    user_database.language = 'Swedish'
+    user_database.training_chronic_collection.remove_language_related_documents()
+    user_database.vocabulary_collection.upsert_entry(VocableEntry.new('hund', 'dog'))
+    user_database.write_behind_buffer.flush()
+    statistics = replace(user_database.write_behind_buffer.statistics)
+
+    user_database.vocabulary_collection.update_entry('hund', new_score=1.0)
+    user_database.vocabulary_collection.update_entry('hund', new_score=2.5)
+    assert user_database.write_behind_buffer.n_pending == 1
+    assert user_database.vocabulary_collection.find_one({'language': 'Swedish', 'vocable': 'hund'})['tf'] == 0
+
+    user_database.training_chronic_collection.upsert_session_statistics('v', n_faced_items=2)
+    assert user_database.write_behind_buffer.n_pending == 0
+    assert user_database.vocabulary_collection.find_one({'language': 'Swedish', 'vocable': 'hund'}, projection={'_id': False}) == {
+        'language': 'Swedish', 'vocable': 'hund', 't': 'dog', 'tf': 2, 's': 2.5, 'lfd': today_epoch_day(), 'due': 0
+    }
+
+    assert user_database.write_behind_buffer.statistics.n_saved_operations - statistics.n_saved_operations == 1
+    # training chronic pipeline update written within the bulk write of the buffered last session statistics
+    assert user_database.write_behind_buffer.statistics.n_bulk_writes - statistics.n_bulk_writes == 2
+    assert user_database.training_chronic_collection.total_statistics() == {'v': 2}
+
+    user_database.vocabulary_collection.remove_language_related_documents()
+    user_database.training_chronic_collection.remove_language_related_documents()
+
+
+def test_write_behind_buffer_coalesces_distinct_vocables(user_database):
+    user_database.language = 'Swedish'
+    vocables = ['hund', 'katt', 'häst']
+    for vocable in vocables:
+        user_database.vocabulary_collection.upsert_entry(VocableEntry.new(vocable, 'animal'))
+    user_database.write_behind_buffer.flush()
+    statistics = replace(user_database.write_behind_buffer.statistics)
+
+    # updates of identical paths, yet of distinct entries, not causing preceding flushes
+    for vocable in vocables:
+        user_database.vocabulary_collection.update_entry(vocable, new_score=1.0)
+    assert user_database.write_behind_buffer.n_pending == len(vocables)
+
+    user_database.write_behind_buffer.flush()
+    assert user_database.write_behind_buffer.statistics.n_bulk_writes - statistics.n_bulk_writes == 1
+    assert [entry.times_faced for entry in user_database.vocabulary_collection.entries()] == [1, 1, 1]
+
+    user_database.vocabulary_collection.remove_language_related_documents()
+
+
+def test_write_behind_buffer_errors(user_database, monkeypatch):
+    user_database.language = 'Swedish'
+    user_database.vocabulary_collection.upsert_entry(VocableEntry.new('hund', 'dog'))
+    write_behind_buffer = user_database.write_behind_buffer
+    write_behind_buffer.flush()
+
+    def bulk_write_failing_with(error):
+        def bulk_write(self, requests, ordered):
+            raise error
+        return bulk_write
+
+    # connection errors retaining the updates and re-arming the timer
+    user_database.vocabulary_collection.update_entry('hund', new_score=1.0)
+    with monkeypatch.context() as patch:
+        patch.setattr(Collection, 'bulk_write', bulk_write_failing_with(AutoReconnect('unreachable')))
+        with pytest.raises(AutoReconnect):
+            write_behind_buffer.flush()
+    assert write_behind_buffer.n_pending == 1
+    assert write_behind_buffer._timer is not None
+
+    write_behind_buffer.flush()
+    assert user_database.vocabulary_collection.find_one({'language': 'Swedish', 'vocable': 'hund'})['tf'] == 1
+
+    # write errors dropping the rejected updates
+    user_database.vocabulary_collection.update_entry('hund', new_score=2.0)
+    with monkeypatch.context() as patch:
+        patch.setattr(Collection, 'bulk_write', bulk_write_failing_with(BulkWriteError({'writeErrors': [{'index': 0, 'code': 2, 'errmsg': 'rejected'}]})))
+        write_behind_buffer.flush()
+    assert write_behind_buffer.n_pending == 0
+    assert write_behind_buffer._timer is None
+    assert user_database.vocabulary_collection.find_one({'language': 'Swedish', 'vocable': 'hund'})['tf'] == 1
+
+    user_database.vocabulary_collection.remove_language_related_documents()
+
+
+def test_language_metadata_cache(user_database, monkeypatch):
+    user_database.language = 'Swedish'
+    language_metadata_collection = user_database.language_metadata_collection
+
+    language_metadata_collection.upsert_accent('Swedish (Sweden)')
+    language_metadata_collection.upsert_playback_speed('SwedishSwedish (Sweden)', 1.25)
+    language_metadata_collection.upsert_tts_enablement(False)
+
+    # served from the written through cache, also by other instances
+    with monkeypatch.context() as patch:
+        patch.setattr(LanguageMetadataCollection, 'find_one', lambda *args, **kwargs: pytest.fail('round trip'))
+        for collection in (language_metadata_collection, LanguageMetadataCollection(user_database)):
+            assert collection.query_accent() == 'Swedish (Sweden)'
+            assert collection.query_playback_speed('SwedishSwedish (Sweden)') == 1.25
+            assert collection.query_tts_enablement() is False
+
+    # upsert of another process
+    language_metadata_collection.update_one({'_id': 'Swedish'}, {'$set': {'accent': 'Swedish (Finland)'}, '$inc': {'version': 1}})
+    assert LanguageMetadataCollection(user_database).query_accent() == 'Swedish (Sweden)'
+    assert LanguageMetadataCollection(user_database, version_validated=True).query_accent() == 'Swedish (Finland)'
+    assert LanguageMetadataCollection(user_database, cache_ttl=0).query_accent() == 'Swedish (Finland)'
+
+    language_metadata_collection.remove_language_related_documents()
+    assert language_metadata_collection.query_accent() is None
@@ -0,0 +1,170 @@
+import datetime
+
+from pymongo.errors import ServerSelectionTimeoutError
+import pytest
+
+from backend.src.database.journal import JournalSynchronizer, UserJournal
+from backend.src.database.user_database import UserDatabase
+from backend.src.types.session_checkpoint import SessionCheckpoint
+from backend.src.types.vocable_entry import VocableEntry
+
+
+@pytest.fixture
+def swedish_user_database(throwaway_user_database) -> UserDatabase:
+    """ Remote database the journal syncs with, being the one of a throwaway user, as an in-process
+        stand-in would have to evaluate the update pipelines of the training chronic """
+
+    throwaway_user_database.language = 'Swedish'
+    return throwaway_user_database
+
+
+@pytest.fixture
+def user_journal(swedish_user_database, tmp_path) -> UserJournal:
+    with UserJournal(swedish_user_database, tmp_path / 'journal.sqlite', sync_interval=None) as journal:
+        yield journal
+
+
+def _remote_entry_document(user_database: UserDatabase, vocable: str):
+    return user_database.vocabulary_collection.find_one({'language': 'Swedish', 'vocable': vocable})
+
+
+def test_local_reads_and_writes(user_journal, swedish_user_database):
+    vocabulary_collection = user_journal.vocabulary_collection
+    vocabulary_collection.upsert_entry(VocableEntry.new('hund', 'dog'))
+    vocabulary_collection.upsert_entry(VocableEntry.new('katt', 'cat'))
+    vocabulary_collection.update_entry('hund', 2.5)
+    vocabulary_collection.update_entry('hund', 6.0)
+
+    assert vocabulary_collection.vocables() == ['hund', 'katt']
+    assert vocabulary_collection.entries()[0] == VocableEntry('hund', 'dog', 2, 6.0, vocabulary_collection.entries()[0].last_faced_date)
+    assert [entries.vocables for entries in vocabulary_collection.query_entries(due_only=True)] == [['katt']]
+    assert 'Swedish' in vocabulary_collection.vocabulary_possessing_languages()
+
+    user_journal.training_chronic_collection.upsert_session_statistics('v', 20)
+    user_journal.training_chronic_collection.upsert_session_statistics('v', 4)
+    assert user_journal.training_chronic_collection.total_statistics() == {'v': 24}
+    assert user_journal.training_chronic_collection.streak()['length'] == 1
+    assert user_journal.training_chronic_collection.last_session_statistics()['nFacedItems'] == 4
+
+    user_journal.language_metadata_collection.upsert_playback_speed('sv', 1.25)
+    assert user_journal.language_metadata_collection.query_playback_speed('sv') == 1.25
+
+    # not replayed yet
+    assert _remote_entry_document(swedish_user_database, 'hund') is None
+    assert user_journal.store.n_pending > 0
+
+
+def test_sync(user_journal, swedish_user_database):
+    user_journal.vocabulary_collection.upsert_entry(VocableEntry.new('hund', 'dog'))
+    user_journal.vocabulary_collection.upsert_entry(VocableEntry.new('vovve', 'dog'))
+    user_journal.vocabulary_collection.update_entry('hund', 2.5)
+    user_journal.vocabulary_collection.alter_entry('vovve', VocableEntry.new('valp', 'puppy'))
+    user_journal.training_chronic_collection.upsert_session_statistics('v', 20)
+    checkpoint = SessionCheckpoint(language='Swedish', mode='simple', seed=1, position=3, filter_version=0, n_items=20)
+    user_journal.training_chronic_collection.upsert_session_checkpoint('v', checkpoint)
+    user_journal.language_metadata_collection.upsert_accent('sv')
+    # cached, to be invalidated by the sync
+    assert swedish_user_database.language_metadata_collection.query_accent() is None
+
+    user_journal.sync()
+
+    assert user_journal.store.n_pending == 0
+    assert _remote_entry_document(swedish_user_database, 'hund')['tf'] == 1
+    assert _remote_entry_document(swedish_user_database, 'vovve') is None
+    assert list(swedish_user_database.vocabulary_collection.entries()) == list(user_journal.vocabulary_collection.entries())
+    assert swedish_user_database.paraphrase_index_collection.find_one({'language': 'Swedish', 'meaning': 'dog'})['vocables'] == ['hund']
+    assert swedish_user_database.training_chronic_collection.total_statistics() == {'v': 20}
+    assert swedish_user_database.training_chronic_collection.daily_statistics(datetime.date.today(), datetime.date.today()) == user_journal.training_chronic_collection.daily_statistics(datetime.date.today(), datetime.date.today())
+    assert swedish_user_database.training_chronic_collection.session_checkpoint('v') == checkpoint
+    assert swedish_user_database.language_metadata_collection.query_accent() == 'sv'
+
+    assert user_journal.pull()
+    assert list(user_journal.vocabulary_collection.entries()) == list(swedish_user_database.vocabulary_collection.entries())
+    assert user_journal.training_chronic_collection.training_chronic() == swedish_user_database.training_chronic_collection.training_chronic()
+
+
+def test_replays_are_idempotent(user_journal, swedish_user_database):
+    user_journal.vocabulary_collection.upsert_entry(VocableEntry.new('hund', 'dog'))
+    user_journal.vocabulary_collection.update_entry('hund', 2.5)
+    user_journal.vocabulary_collection.upsert_entry(VocableEntry.new('katt', 'cat'))
+    user_journal.vocabulary_collection.delete_entry(VocableEntry.new('katt', 'cat'))
+    user_journal.vocabulary_collection.upsert_entry(VocableEntry.new('katt', 'cat'))
+    user_journal.vocabulary_collection.update_entry('katt', 6.0)
+    user_journal.training_chronic_collection.upsert_session_statistics('v', 20)
+    user_journal.language_metadata_collection.upsert_accent('sv')
+
+    # interruption between the replay and the removal from the outbox
+    user_journal.synchronizer._replay(user_journal.store.pending_operations(limit=64))
+    user_journal.sync()
+
+    assert _remote_entry_document(swedish_user_database, 'hund')['tf'] == 1
+    assert _remote_entry_document(swedish_user_database, 'katt')['tf'] == 1
+    assert swedish_user_database.training_chronic_collection.total_statistics() == {'v': 20}
+    assert swedish_user_database.language_metadata_collection.find_one({'_id': 'Swedish'})['version'] == 1
+    assert user_journal.statistics.n_conflicts == 0
+
+
+def test_conflicts(user_journal, swedish_user_database):
+    user_journal.vocabulary_collection.upsert_entry(VocableEntry.new('hund', 'dog'))
+    user_journal.sync()
+
+    # concurrent writes of another session
+    swedish_user_database.vocabulary_collection.update_entry('hund', 1.0)
+    swedish_user_database.vocabulary_collection.upsert_entry(VocableEntry.new('katt', 'cat'))
+    swedish_user_database.write_behind_buffer.flush()
+    swedish_user_database.vocabulary_collection.delete_entry(VocableEntry.new('katt', 'cat'))
+
+    user_journal.vocabulary_collection.update_entry('hund', 6.0)
+    user_journal.vocabulary_collection.update_entry('katt', 2.0)
+    user_journal.sync()
+
+    # increments add up, sets are won by the last writer, updates of deleted entries are dropped
+    assert _remote_entry_document(swedish_user_database, 'hund')['tf'] == 2
+    assert _remote_entry_document(swedish_user_database, 'hund')['s'] == 6.0
+    assert _remote_entry_document(swedish_user_database, 'katt') is None
+    assert user_journal.statistics.n_unmatched_updates == 1
+    assert user_journal.store.n_pending == 0
+
+
+def test_offline_journaling(swedish_user_database, monkeypatch, tmp_path):
+    def push_unreachable(self):
+        raise ServerSelectionTimeoutError('unreachable')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(JournalSynchronizer, 'push', push_unreachable)
+
+        with UserJournal(swedish_user_database, tmp_path / 'journal.sqlite', sync_interval=None) as offline_journal:
+            offline_journal.vocabulary_collection.upsert_entry(VocableEntry.new('hund', 'dog'))
+            with pytest.raises(ServerSelectionTimeoutError):
+                offline_journal.sync()
+
+    assert _remote_entry_document(swedish_user_database, 'hund') is None
+
+    # pending operations persisting across sessions, the local state not being overwritten by the pull
+    with UserJournal(swedish_user_database, tmp_path / 'journal.sqlite', sync_interval=None) as reopened_journal:
+        assert reopened_journal.vocabulary_collection.vocables() == ['hund']
+        assert reopened_journal.store.n_pending == 3  # entry, paraphrase index and vocabulary change updates
+        reopened_journal.sync()
+
+    assert _remote_entry_document(swedish_user_database, 'hund')['t'] == 'dog'
+
+
+def test_trainer_database_handle(user_journal, swedish_user_database):
+    journal = user_journal.for_language('Swedish')
+    assert journal.store is user_journal.store
+    assert journal.write_behind_buffer is swedish_user_database.write_behind_buffer
+
+    journal.vocabulary_collection.upsert_entry(VocableEntry.new('hund', 'dog'))
+    journal.vocabulary_collection.upsert_entry(VocableEntry.new('vovve', 'the dog'))
+    assert journal.paraphrase_index_collection.paraphrases() == {'dog': ['hund', 'vovve']}
+
+    schedule = {'v': ['hund', 'vovve'], 'd': [1, 2], 'e': [2.5, 2.5], 'i': [0, 0], 'r': [0, 0]}
+    journal.vocable_schedule_collection.upsert_schedule(schedule)
+    assert journal.vocable_schedule_collection.schedule() == schedule
+
+    # solely closed by the owning handle
+    journal.close()
+    user_journal.sync()
+
+    assert swedish_user_database.vocable_schedule_collection.schedule() == schedule
+    assert sorted(swedish_user_database.paraphrase_index_collection.paraphrases()['dog']) == ['hund', 'vovve']
@@ -0,0 +1,44 @@
+import pytest
+
+from backend.src.trainers.sentence_translation.response_evaluation import get_sentence_evaluation, get_sentence_evaluations, TokenVerdict
+
+
+@pytest.mark.parametrize('response,reference,verdicts', [
+    ('Il gatto mangia la farfalla.', 'Il gatto mangia la farfalla.', [TokenVerdict.Correct] * 5),
+    ('il gatto mangia la farfalla', 'Il gatto mangia la farfalla.', [TokenVerdict.Correct] * 5),
+    ('Perche non vieni', 'Perché non vieni?', [TokenVerdict.AccentError, TokenVerdict.Correct, TokenVerdict.Correct]),
+    ('Perche non veni', 'Perché non vieni?', [TokenVerdict.AccentError, TokenVerdict.Correct, TokenVerdict.AlmostCorrect]),
+    ('Il cane mangia la farfalla', 'Il gatto mangia la farfalla', [TokenVerdict.Correct, TokenVerdict.Wrong, TokenVerdict.Correct, TokenVerdict.Correct, TokenVerdict.Correct]),
+    ('Il gatto mangia farfalla', 'Il gatto mangia la farfalla', [TokenVerdict.Correct, TokenVerdict.Correct, TokenVerdict.Correct, TokenVerdict.Missing, TokenVerdict.Correct]),
+    ('Il gatto grasso mangia la farfalla', 'Il gatto mangia la farfalla', [TokenVerdict.Correct, TokenVerdict.Correct, TokenVerdict.Superfluous, TokenVerdict.Correct, TokenVerdict.Correct, TokenVerdict.Correct]),
+    ('la farfala', 'la farfalla rara', [TokenVerdict.Correct, TokenVerdict.AlmostCorrect, TokenVerdict.Missing]),
+    ("Non c'e problema", "Non c'è problema", [TokenVerdict.Correct, TokenVerdict.Correct, TokenVerdict.AccentError, TokenVerdict.Correct]),
+    ('', 'Ciao', [TokenVerdict.Missing])
+])
+def test_token_verdicts(response, reference, verdicts):
+    assert [token_evaluation.verdict for token_evaluation in get_sentence_evaluation(response, reference).token_evaluations] == verdicts
+
+
+def test_token_evaluations():
+    token_evaluations = get_sentence_evaluation('Il cane grasso mangia', 'Il gatto mangia la farfalla.').token_evaluations
+    assert [(evaluation.response_token, evaluation.reference_token) for evaluation in token_evaluations] == [
+        ('Il', 'Il'), ('cane', 'gatto'), ('grasso', None), ('mangia', 'mangia'), (None, 'la'), (None, 'farfalla')
+    ]
+
+
+@pytest.mark.parametrize('response,reference,score', [
+    ('Il gatto mangia la farfalla.', 'Il gatto mangia la farfalla.', 1.0),
+    ('Il cane beve il latte.', 'Il gatto mangia la farfalla.', 0.2),
+    ('Il gatto grasso mangia la farfalla', 'Il gatto mangia la farfalla', 5 / 6),
+    ('', 'Il gatto mangia la farfalla.', 0.0),
+    ('', '', 1.0)
+])
+def test_score(response, reference, score):
+    assert get_sentence_evaluation(response, reference).score == pytest.approx(score)
+
+
+def test_get_sentence_evaluations():
+    responses = ['Il gatto mangia la farfalla.', 'Il gato mangia', '']
+    references = ['Il gatto mangia la farfalla.'] * 3
+    assert get_sentence_evaluations(responses, references) == list(map(get_sentence_evaluation, responses, references))
+
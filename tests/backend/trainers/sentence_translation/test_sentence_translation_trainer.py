@@ -1,6 +1,21 @@
 import pytest
 
+from backend.src.database._utils import UNIQUE_ID_FILTER
 from backend.src.trainers.sentence_translation import modes, SentenceTranslationTrainerBackend
+from tests.conftest import get_bilingual_corpus
+
+
+@pytest.fixture(autouse=True)
+def delete_stored_checkpoints(user_database):
+    """ Prevents sessions from resuming the stored ones of other tests """
+
+    def delete():
+        user_database.write_behind_buffer.flush()
+        user_database.training_chronic_collection.update_one(UNIQUE_ID_FILTER, {'$unset': {'sessionCheckpoints': 1}})
+
+    delete()
+    yield
+    delete()
 
 
 @pytest.mark.parametrize('language, train_english, tts_available, sentence_data_filter, n_traverse_sentences', [
@@ -16,6 +31,9 @@ from backend.src.trainers.sentence_translation import modes, SentenceTranslation
     (
         'Assamese', True, True, modes.simple.filter_sentence_data, 130
     ),
+    (
+        'Basque', False, False, modes.difficulty.filter_sentence_data, 50
+    ),
 ])
 def test_sentence_translation_trainer(language, train_english, tts_available, sentence_data_filter, n_traverse_sentences):
     backend = SentenceTranslationTrainerBackend(language, train_english=train_english)
@@ -26,3 +44,117 @@ def test_sentence_translation_trainer(language, train_english, tts_available, se
 
     for _ in range(n_traverse_sentences):
         assert backend.get_training_item() is not None
+
+
+def test_session_resumption():
+    backend = SentenceTranslationTrainerBackend('Galician', train_english=False)
+    backend.sentence_data_filter = modes.random.filter_sentence_data
+    backend.set_item_iterator()
+
+    for _ in range(10):
+        backend.get_training_item()
+    checkpoint = backend.checkpoint()
+    assert checkpoint.position == 10
+
+    resumed_backend = SentenceTranslationTrainerBackend('Galician', train_english=False)
+    resumed_backend.set_item_iterator(checkpoint=checkpoint)
+
+    assert resumed_backend.sentence_data_filter is modes.random.filter_sentence_data
+    for _ in range(10):
+        assert resumed_backend.get_training_item().tolist() == backend.get_training_item().tolist()
+
+
+def test_session_resumption_from_stored_checkpoint(monkeypatch):
+    backend = SentenceTranslationTrainerBackend('Bulgarian', train_english=False)
+    backend.sentence_data_filter = modes.simple.filter_sentence_data
+    backend.set_item_iterator()
+
+    for _ in range(10):
+        backend.get_training_item()
+    checkpoint = backend.checkpoint()
+    assert checkpoint.items_digest is not None
+
+    # restored from the persisted filtered sentence indices
+    def filter_unexpectedly(*args):
+        raise AssertionError('mode filter reapplied')
+
+    monkeypatch.setattr(SentenceTranslationTrainerBackend, '_filtered_sentence_indices', filter_unexpectedly)
+
+    resumed_backend = SentenceTranslationTrainerBackend('Bulgarian', train_english=False)
+    resumed_backend.sentence_data_filter = modes.simple.filter_sentence_data
+    resumed_backend.set_item_iterator()
+
+    assert resumed_backend.checkpoint() == checkpoint
+    for _ in range(10):
+        assert resumed_backend.get_training_item().tolist() == backend.get_training_item().tolist()
+
+
+def test_periodic_checkpoint_persistence():
+    backend = SentenceTranslationTrainerBackend('Galician', train_english=False)
+    backend.sentence_data_filter = modes.random.filter_sentence_data
+    backend.set_item_iterator()
+
+    for _ in range(SentenceTranslationTrainerBackend._CHECKPOINT_INTERVAL - 1):
+        backend.get_training_item()
+    assert backend.stored_checkpoint() is None
+
+    backend.get_training_item()
+    assert backend.stored_checkpoint() == backend.checkpoint()
+
+    # persisted at session end
+    backend.get_training_item()
+    backend.close()
+    assert backend.stored_checkpoint() == backend.checkpoint()
+
+
+def test_get_training_items():
+    backend = SentenceTranslationTrainerBackend('Bulgarian', train_english=False)
+    backend.sentence_data_filter = modes.random.filter_sentence_data
+    backend.set_item_iterator()
+
+    items = backend.get_training_items(5, look_ahead=3)
+
+    assert len(items) == 5
+    assert all(len(item.sentence_pair) == 2 and all(isinstance(sentence, str) for sentence in item.sentence_pair) for item in items)
+    assert all(item.audio is not None for item in items) == (backend.tts_available and backend.tts.enabled)
+    assert len(backend._prepared_items) == 3
+    assert backend.checkpoint().position == 5
+
+
+def test_training_item_retrieval_not_mixable():
+    with SentenceTranslationTrainerBackend('Galician', train_english=False) as backend:
+        backend.sentence_data_filter = modes.random.filter_sentence_data
+        backend.set_item_iterator()
+
+        backend.get_training_items(2, look_ahead=1)
+        with pytest.raises(RuntimeError):
+            backend.get_training_item()
+
+        # reset along with the session
+        backend.set_item_iterator()
+        assert backend.get_training_item() is not None
+        with pytest.raises(RuntimeError):
+            backend.get_training_items(2)
+
+
+def test_close():
+    backend = SentenceTranslationTrainerBackend('Bulgarian', train_english=False)
+    backend.sentence_data_filter = modes.random.filter_sentence_data
+    backend.set_item_iterator()
+    backend.get_training_items(2, look_ahead=3)
+    audio_download_executor = backend.__dict__.get('_audio_download_executor')
+
+    backend.close()
+
+    assert not backend._prepared_items
+    assert audio_download_executor is None or audio_download_executor._shutdown
+
+
+def test_sample_within_mode_filter():
+    bilingual_corpus = get_bilingual_corpus('Bulgarian')
+    sentence_indices = modes.get_sentence_indices_filter(modes.simple.filter_sentence_data)(bilingual_corpus, 'Bulgarian')
+
+    sampled_sentence_indices = bilingual_corpus.sample_indices(20, char_length_range=(10, 40), within=sentence_indices)
+
+    assert len(sampled_sentence_indices) == 20
+    assert set(sampled_sentence_indices) <= set(sentence_indices)
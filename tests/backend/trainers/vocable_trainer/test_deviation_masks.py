@@ -1,6 +1,12 @@
+from itertools import compress
+from operator import not_
+import random
+
 import pytest
 
 from backend.src.trainers.vocable_trainer.deviation_masks import deviation_masks
+from backend.src.utils.strings.edit_distance import bounded_edit_distance
+from tests.backend.trainers.vocable_trainer.recursive_deviation_masks import recursive_deviation_masks
 
 
 @pytest.mark.parametrize('response,ground_truth,response_mask,ground_truth_mask', [
@@ -20,3 +26,80 @@ def test_deviation_masks(response, ground_truth, response_mask, ground_truth_mas
     masks = list(map(list, deviation_masks(response=response, ground_truth=ground_truth)))
     assert masks[0] == response_mask
     assert masks[1] == ground_truth_mask
+
+
+@pytest.mark.parametrize('response,ground_truth,masks,previous_masks', [
+    # substitution of the first char, misaligning the remainder
+    ('rentredì', 'ventredì', ([True, False, False, False, False, False, False, False], [True, False, False, False, False, False, False, False]), ([False, False, True, True, True, True, True, True], [True, True, True, True, False, False, True, True])),
+    # transposition within the first 2 chars, formerly marked as a superfluous and a missing char
+    ('evntredì', 'ventredì', ([True, True, False, False, False, False, False, False], [True, True, False, False, False, False, False, False]), ([True, False, False, False, False, False, False, False], [False, False, True, False, False, False, False, False])),
+    ('csopare', 'scopare', ([True, True, False, False, False, False, False], [True, True, False, False, False, False, False]), ([True, False, False, False, False, False, False], [False, False, True, False, False, False, False])),
+    ('socpare', 'scopare', ([False, True, True, False, False, False, False], [False, True, True, False, False, False, False]), ([False, True, False, False, False, False, False], [False, False, False, True, False, False, False]))
+])
+def test_deviation_masks_diverging_from_recursive_implementation(response, ground_truth, masks, previous_masks):
+    """ Documents the cases whose masks deviate from the ones of the recursive implementation
+        which the O(ND) alignment superseded, namely edits within the first 2 chars and
+        transpositions, which are marked as 2 substitutions instead """
+
+    assert deviation_masks(response, ground_truth) == masks
+    assert tuple(map(list, recursive_deviation_masks(response, ground_truth))) == previous_masks
+
+
+# ----------------
+# Properties
+# ----------------
+# seeded random loops over edited words, standing in for property-based tests
+_WORDS = ['scopare', 'sopravvalutare', 'infastidire', 'ventredì', 'accanto', 'il meglio', 'la faccia', 'la bella giornata di sole']
+_CHARS = 'abcdefghilmnoprstuvzàèì '
+
+
+def _edited(string: str, n_edits: int, rng: random.Random, min_index=0) -> str:
+    chars = list(string)
+    for _ in range(n_edits):
+        i = rng.randrange(min_index, len(chars))
+        edit = rng.choice(['insertion', 'deletion', 'substitution'])
+        if edit == 'insertion':
+            chars.insert(i, rng.choice(_CHARS))
+        elif edit == 'deletion' and len(chars) > min_index + 1:
+            del chars[i]
+        else:
+            chars[i] = rng.choice(_CHARS)
+    return ''.join(chars)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_agreement_with_recursive_implementation_on_single_edits(seed):
+    """ The recursive implementation's prefix heuristic misaligns edits within the first
+        2 chars, e.g. 'rentredì' vs 'ventredì', hence single edits beyond these """
+
+    rng = random.Random(seed)
+    for _ in range(100):
+        ground_truth = rng.choice(_WORDS)
+        response = _edited(ground_truth, n_edits=1, rng=rng, min_index=2)
+        assert list(deviation_masks(response, ground_truth)) == list(map(list, recursive_deviation_masks(response, ground_truth)))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_alignment_validity(seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        ground_truth = rng.choice(_WORDS)
+        response = _edited(ground_truth, n_edits=rng.randint(0, 6), rng=rng) if rng.random() < 0.8 else rng.choice(_WORDS)
+        response_mask, ground_truth_mask = deviation_masks(response, ground_truth)
+
+        assert len(response_mask) == len(response)
+        assert len(ground_truth_mask) == len(ground_truth)
+
+        # unmasked chars are the aligned, thus matching ones
+        assert list(compress(response, map(not_, response_mask))) == list(compress(ground_truth, map(not_, ground_truth_mask)))
+
+        # minimal alignment
+        distance = bounded_edit_distance(response, ground_truth, k=len(response) + len(ground_truth))
+        assert max(sum(response_mask), sum(ground_truth_mask)) <= distance <= sum(response_mask) + sum(ground_truth_mask)
+
+
+def test_sentence_length_alignment():
+    ground_truth = ' '.join(_WORDS * 8)
+    response = _edited(ground_truth, n_edits=10, rng=random.Random(69))
+    response_mask, ground_truth_mask = deviation_masks(response, ground_truth)
+    assert 0 < sum(response_mask) <= 10 and 0 < sum(ground_truth_mask) <= 10
@@ -1,6 +1,7 @@
 import pytest
 
-from backend.src.trainers.vocable_trainer.response_evaluation import _n_char_deviations, get_response_evaluation, ResponseEvaluation
+from backend.src.trainers.vocable_trainer.response_evaluation import get_response_evaluation, get_response_evaluations, ResponseEvaluation
+from backend.src.utils.strings.edit_distance import bounded_edit_distance
 
 
 @pytest.mark.parametrize('response,ground_truth,expected', [
@@ -8,14 +9,24 @@ from backend.src.trainers.vocable_trainer.response_evaluation import _n_char_dev
     ('scoware', 'scopare', 1),
     ('scoppare', 'scopare', 1),
     ('scoare', 'scopare', 1),
-    ('sad', 'scopare', 6),
+    ('sad', 'scopare', 5),
     ('', 'scopare', 7),
     ('socpare', 'scopare', 2),
     ('scoprare', 'scopare', 1),
     ('scossare', 'scorsare', 1)
 ])
-def test_n_char_deviations(response, ground_truth, expected):
-    assert _n_char_deviations(response, ground_truth) == expected
+def test_edit_distance(response, ground_truth, expected):
+    assert bounded_edit_distance(response, ground_truth, k=len(ground_truth)) == expected
+    assert bounded_edit_distance(response, ground_truth, k=1) == min(expected, 2)
+
+
+@pytest.mark.parametrize('a,b,expected', [
+    ('socpare', 'scopare', 1),
+    ('scopaer', 'scopare', 1),
+    ('soccpare', 'scopare', 2),
+])
+def test_edit_distance_with_transpositions(a, b, expected):
+    assert bounded_edit_distance(a, b, k=3, transpositions=True) == expected
 
 
 @pytest.mark.parametrize('response,ground_truth,expected', [
@@ -36,3 +47,14 @@ def test_n_char_deviations(response, ground_truth, expected):
 ])
 def test_get_response_evaluation(response, ground_truth, expected):
     assert get_response_evaluation(response, ground_truth)[1] is expected
+
+
+def test_get_response_evaluations():
+    responses, ground_truths = ['la meglio', 'scopar', 'ventredi', 'sopar'], ['il meglio', 'scopare', 'ventredì', 'scopare']
+
+    assert get_response_evaluations(responses, ground_truths) == list(map(get_response_evaluation, responses, ground_truths))
+
+    with pytest.raises(ValueError):
+        get_response_evaluations(responses, ground_truths[:-1])
+    with pytest.raises(ValueError):
+        get_response_evaluations(responses, ground_truths, vocable_identification_aids=['il'])
@@ -0,0 +1,93 @@
+import pytest
+
+from backend.src.trainers.vocable_trainer.response_evaluation import ResponseEvaluation
+from backend.src.trainers.vocable_trainer.scheduler import VocableScheduler
+from backend.src.types.vocable_entry import VocableEntries, VocableEntry
+from backend.src.utils.date import today_epoch_day
+
+
+TODAY = today_epoch_day()
+NOW = TODAY + 0.5
+
+
+@pytest.fixture
+def scheduler() -> VocableScheduler:
+    scheduler = VocableScheduler()
+    scheduler.synchronize(VocableEntries.from_entries([
+        VocableEntry('new', 'new', 0, 0, None),
+        VocableEntry('faced', 'faced', 3, 2, TODAY - 3),
+        VocableEntry('perfected', 'perfected', 5, 6, TODAY - 3),
+        VocableEntry('expired', 'expired', 5, 6, TODAY - 60),
+    ]))
+    return scheduler
+
+
+def test_synchronize(scheduler):
+    assert set(scheduler.due_vocables(NOW)) == {'new', 'faced', 'expired'}
+    assert scheduler.state('perfected').due == TODAY - 3 + 50
+
+    scheduler.synchronize(VocableEntries.from_entries([VocableEntry('faced', 'faced', 3, 2, TODAY - 3), VocableEntry('added', 'added', 0, 0, None)]))
+    assert len(scheduler) == 2
+    assert set(scheduler.due_vocables(NOW)) == {'faced', 'added'}
+
+
+def test_pop_order_and_upcoming(scheduler):
+    upcoming = scheduler.upcoming(3, NOW)
+
+    popped = [scheduler.pop_due(NOW) for _ in range(4)]
+    assert popped[:3] == upcoming == ['expired', 'faced', 'new']
+    assert popped[3] is None
+
+
+def test_unschedule(scheduler):
+    scheduler.unschedule('expired')
+
+    assert 'expired' not in scheduler
+    assert [scheduler.pop_due(NOW) for _ in range(3)] == ['faced', 'new', None]
+
+
+def test_rescheduling_after_unscheduling(scheduler):
+    scheduler.unschedule('faced')
+    scheduler.synchronize(VocableEntries.from_entries([
+        VocableEntry('new', 'new', 0, 0, None),
+        VocableEntry('faced', 'faced', 3, 2, TODAY - 3),
+        VocableEntry('expired', 'expired', 5, 6, TODAY - 60),
+    ]))
+
+    # the heap item preceding the unscheduling, identical in due and ease, not being served as well
+    assert scheduler.upcoming(4, NOW) == ['expired', 'faced', 'new']
+    assert [scheduler.pop_due(NOW) for _ in range(4)] == ['expired', 'faced', 'new', None]
+
+
+@pytest.mark.parametrize('evaluations, expected_interval, expected_repetitions', [
+    ([ResponseEvaluation.Correct], 1, 1),
+    ([ResponseEvaluation.Correct] * 2, 6, 2),
+    ([ResponseEvaluation.Correct] * 3, 16, 3),
+    ([ResponseEvaluation.Correct, ResponseEvaluation.Wrong], 0, 0),
+])
+def test_update(scheduler, evaluations, expected_interval, expected_repetitions):
+    for evaluation in evaluations:
+        scheduler.update('new', evaluation, now=NOW)
+
+    state = scheduler.state('new')
+    assert (state.interval, state.repetitions) == (expected_interval, expected_repetitions)
+    assert 'new' not in scheduler.due_vocables(NOW)
+
+
+def test_failed_entry_requeued_within_session(scheduler):
+    while (vocable := scheduler.pop_due(NOW)) is not None:
+        scheduler.update(vocable, ResponseEvaluation.Wrong if vocable == 'faced' else ResponseEvaluation.Correct, now=NOW)
+
+    assert scheduler.state('faced').ease < 2.5
+    assert scheduler.pop_due(NOW) is None
+    assert scheduler.pop_due(NOW + 1 / 24) == 'faced'
+
+
+def test_persistence(scheduler):
+    scheduler.update('new', ResponseEvaluation.Correct, now=NOW)
+    document = scheduler.to_document()
+
+    assert len(document['v']) == len(scheduler)
+
+    restored_scheduler = VocableScheduler.from_document(document)
+    assert [restored_scheduler.pop_due(TODAY + 100) for _ in range(4)] == [scheduler.pop_due(TODAY + 100) for _ in range(4)]
@@ -1,18 +1,172 @@
+import collections
+
 import pytest
 
+from backend.src.database.journal import UserJournal
 from backend.src.trainers import VocableTrainerBackend
+from backend.src.trainers.vocable_trainer.response_evaluation import ResponseEvaluation
+from backend.src.types.vocable_entry import VocableEntries, VocableEntry
 
 
-@pytest.fixture
-def vocable_entries(user_database):
-    return user_database.vocabulary_collection.entries()
+def test_paraphrases():
+    assert {meaning: sorted(vocables) for meaning, vocables in VocableTrainerBackend._paraphrases().items()} == {
+        'cool': ['figo', 'gergo'],
+        'face': ['il viso', 'la faccia'],
+        'next to': ['accanto a', 'di fianco'],
+        'to annoy, to bother': ['dare fastidio', 'infastidiscere'],
+        'unknown': ["l'ignoto", 'lo sconosciuto']
+    }
 
 
-def test_find_paraphrases(vocable_entries):
-    assert VocableTrainerBackend._find_paraphrases(vocable_entries) == {
-        'cool': ['figo', 'gergo'],
-        'face': ['la faccia', 'il viso'],
-        'next to': ['di fianco', 'accanto a'],
-        'o annoy, to bother': ['dare fastidio', 'infastidiscere'],
-        'unknown': ['lo sconosciuto', "l'ignoto"]
-    }
\ No newline at end of file
+def test_paraphrase_index_maintenance(user_database):
+    vocabulary_collection = user_database.vocabulary_collection
+
+    vocabulary_collection.upsert_entry(VocableEntry.new('il volto', 'the face'))
+    assert 'il volto' in user_database.paraphrase_index_collection.paraphrases()['face']
+
+    vocabulary_collection.alter_entry('il volto', VocableEntry.new('il volto', 'the visage'))
+    assert 'il volto' not in user_database.paraphrase_index_collection.paraphrases()['face']
+
+    vocabulary_collection.delete_entry(VocableEntry.new('il volto', 'the visage'))
+    assert 'visage' not in user_database.paraphrase_index_collection.paraphrases()
+
+
+@pytest.mark.parametrize('vocable, n', [
+    ('la faccia', 5),
+    ('accanto a', 200),
+    ('xyzxyz', 3),
+])
+def test_related_sentence_pairs(vocable, n):
+    backend = VocableTrainerBackend('Italian', train_english=False)
+    backend.resolve_related_sentence_indices([vocable])
+
+    related_sentence_indices = backend._vocable_2_related_sentence_indices[vocable]
+    sentence_pairs = backend.related_sentence_pairs(vocable, n)
+
+    assert len(sentence_pairs) == min(n, len(related_sentence_indices))
+    assert len(set(map(tuple, sentence_pairs))) == len(sentence_pairs)
+    assert all(sentence_pair in backend._sentence_data[related_sentence_indices].tolist() for sentence_pair in sentence_pairs)
+
+
+def test_related_sentences_prefetching():
+    backend = VocableTrainerBackend('Italian', train_english=False)
+    backend.set_item_iterator()
+
+    for _ in range(min(5, backend.n_training_items)):
+        entry = backend.get_training_item()
+        backend.related_sentence_pairs(entry.vocable, 3)
+
+    statistics = backend.prefetch_statistics
+    assert statistics.n_misses == 0
+    assert statistics.hit_rate == 1.0
+    assert statistics.n_prefetched >= statistics.n_hits
+
+    n_unqueried_prefetched_vocables = len(backend._unqueried_prefetched_vocables)
+    backend.set_item_iterator()
+    assert backend.prefetch_statistics.n_wasted == n_unqueried_prefetched_vocables
+
+
+def test_session_related_sentences_resolved_at_start():
+    backend = VocableTrainerBackend('Italian', train_english=False)
+    backend.set_item_iterator()
+
+    # submitted in chunks, rather than as one batch all queries would have to wait for
+    vocables_per_prefetch = collections.Counter(backend._pending_prefetches.values()).values()
+    assert all(n_vocables <= backend._SESSION_PREFETCH_CHUNK_SIZE for n_vocables in vocables_per_prefetch)
+
+    for pending_prefetch in set(backend._pending_prefetches.values()):
+        pending_prefetch.result()
+
+    assert backend._vocable_2_related_sentence_indices.keys() == backend._vocable_2_entry.keys()
+
+
+def test_stale_prefetches_discarded():
+    backend = VocableTrainerBackend('Italian', train_english=False)
+    backend.set_item_iterator()
+    stale_generation = backend._generation
+
+    backend.set_item_iterator()
+    for pending_prefetch in set(backend._pending_prefetches.values()):
+        pending_prefetch.result()
+    n_prefetched = backend.prefetch_statistics.n_prefetched
+
+    # completing after the reset
+    backend.resolve_related_sentence_indices(['xyzxyz'], prefetch=True, generation=stale_generation)
+    assert 'xyzxyz' not in backend._vocable_2_related_sentence_indices
+    assert backend.prefetch_statistics.n_prefetched == n_prefetched
+
+
+def test_misses_resolved_irrespective_of_caching(monkeypatch):
+    backend = VocableTrainerBackend('Italian', train_english=False)
+    monkeypatch.setattr(backend, '_RELATED_SENTENCE_INDICES_CACHE_SIZE', 0)
+    backend.set_item_iterator()
+
+    # evicted right upon its resolution
+    vocable = backend.get_training_item().vocable
+    sentence_indices = backend.resolve_related_sentence_indices([vocable])[vocable]
+    assert vocable not in backend._vocable_2_related_sentence_indices
+
+    assert len(backend.related_sentence_pairs(vocable, 3)) == min(3, len(sentence_indices))
+    assert backend.related_sentence_pairs('xyzxyz', 3) == []
+    assert backend.prefetch_statistics.n_misses >= 1
+
+
+def test_deleted_vocables_skipped():
+    backend = VocableTrainerBackend('Italian', train_english=False)
+    backend.set_item_iterator()
+
+    # scheduled, yet deleted from the vocabulary in the meantime
+    backend.scheduler.schedule_unscheduled(VocableEntries.from_entries([VocableEntry.new('xyzxyz', 'deleted')]))
+
+    assert 'xyzxyz' not in [entry.vocable for entry in backend.upcoming_items(len(backend.scheduler))]
+    assert 'xyzxyz' not in backend.scheduler
+    assert all(entry.vocable != 'xyzxyz' for entry in iter(backend.get_training_item, None))
+
+
+def test_failed_entries_requeued_within_session():
+    backend = VocableTrainerBackend('Italian', train_english=False)
+    backend.set_item_iterator()
+    n_training_items = backend.n_training_items
+
+    failed_entry = backend.get_training_item()
+    _, evaluation = backend.get_response_evaluation('xyzxyz', failed_entry)
+    assert evaluation is ResponseEvaluation.Wrong
+    assert backend.n_training_items == n_training_items + 1
+
+    # served ahead of its due time, once no other entries are left
+    served_vocables = [entry.vocable for entry in iter(backend.get_training_item, None)]
+    assert served_vocables[-1] == failed_entry.vocable
+    assert len(served_vocables) + 1 == backend.n_training_items
+
+
+def test_session_resumed_by_persisted_schedule(user_database):
+    schedule_collection = user_database.for_language('Italian').vocable_schedule_collection
+    schedule_document = schedule_collection.schedule()
+
+    backend = VocableTrainerBackend('Italian', train_english=False)
+    backend.set_item_iterator()
+    n_training_items = backend.n_training_items
+
+    entry = backend.get_training_item()
+    backend.get_response_evaluation(entry.vocable, entry)
+    backend.persist_schedule()
+
+    try:
+        resumed_backend = VocableTrainerBackend('Italian', train_english=False)
+        resumed_backend.set_item_iterator()
+        assert resumed_backend.n_training_items == n_training_items - 1
+        assert entry.vocable not in [upcoming_entry.vocable for upcoming_entry in resumed_backend.upcoming_items(n_training_items)]
+    finally:
+        if schedule_document is not None:
+            schedule_collection.upsert_schedule(schedule_document)
+
+
+def test_journal_database_handle(user_database, tmp_path):
+    with UserJournal(user_database, tmp_path / 'journal.sqlite', sync_interval=None) as journal:
+        backend = VocableTrainerBackend('Italian', train_english=False, user_database=journal)
+        backend.set_item_iterator()
+
+        assert backend._user_database.store is journal.store
+        assert {meaning: sorted(vocables) for meaning, vocables in backend.paraphrases.items()} == {
+            meaning: sorted(vocables) for meaning, vocables in VocableTrainerBackend._paraphrases().items()
+        }
@@ -3,7 +3,7 @@ import re
 import numpy as np
 import pytest
 
-from backend.src.types.bilingual_corpus import bilaterally_present_quote_stripped
+from backend.src.types.bilingual_corpus import BilingualCorpus, bilaterally_present_quote_stripped
 from backend.src.utils.strings.transformation import asciiized, UNICODE_POINT_PATTERN
 from tests.conftest import get_bilingual_corpus
 
@@ -131,3 +131,76 @@ class TestCorpus:
 # ])
 # def test_deduce_default_forenames_translations(language, expected):
 #     assert list(map(sorted, BilingualCorpus(language).infer_forename_translations())) == expected
+
+
+# ----------------
+# Length Constrained Sampling
+# ----------------
+@pytest.mark.parametrize('char_length_range, token_count_range, english', [
+    ((10, 20), None, False),
+    (None, (3, 4), False),
+    ((15, 40), (2, 5), True),
+])
+def test_sample(char_length_range, token_count_range, english):
+    bilingual_corpus = get_bilingual_corpus('Bulgarian')
+    corpus = [bilingual_corpus.non_english_corpus, bilingual_corpus.english_corpus][english]
+
+    sentence_indices = bilingual_corpus.sample_indices(50, char_length_range, token_count_range, english=english)
+
+    assert len(sentence_indices) == len(set(sentence_indices)) == 50
+    for sentence_index in sentence_indices:
+        sentence = corpus[sentence_index]
+        if char_length_range is not None:
+            assert char_length_range[0] <= len(sentence) <= char_length_range[1]
+        if token_count_range is not None:
+            assert token_count_range[0] <= len(sentence.split(' ')) <= token_count_range[1]
+
+    assert bilingual_corpus.sample(50, char_length_range, token_count_range, english=english).shape == (50, 2)
+
+
+def test_sample_within():
+    bilingual_corpus = get_bilingual_corpus('Bulgarian')
+    within = np.arange(0, len(bilingual_corpus), 3)
+
+    sentence_indices = bilingual_corpus.sample_indices(len(bilingual_corpus), char_length_range=(5, 30), within=within)
+
+    char_lengths = np.asarray(list(map(len, bilingual_corpus.non_english_corpus)))
+    assert len(sentence_indices) == np.sum((char_lengths[within] >= 5) & (char_lengths[within] <= 30))
+    assert not len(np.setdiff1d(sentence_indices, within))
+
+
+def test_length_indices_persisted():
+    bilingual_corpus = BilingualCorpus('Bulgarian')
+    sentence_indices = bilingual_corpus.sample_indices(len(bilingual_corpus), char_length_range=(10, 20), token_count_range=(3, 4))
+
+    # loaded from the cache by a new instance
+    reloaded_corpus = BilingualCorpus('Bulgarian')
+    np.testing.assert_array_equal(
+        reloaded_corpus.non_english_corpus.char_length_index.indices((10, 20)),
+        bilingual_corpus.non_english_corpus.char_length_index.indices((10, 20))
+    )
+    assert sorted(reloaded_corpus.sample_indices(len(bilingual_corpus), char_length_range=(10, 20), token_count_range=(3, 4))) == sorted(sentence_indices)
+
+    # not persisted for derived corpora, whose rows don't correspond to the corpus file
+    assert bilingual_corpus[:100].non_english_corpus._length_index_key is None
+
+
+# ----------------
+# Pivot Corpora
+# ----------------
+def test_pivot():
+    reference_corpus, learn_corpus = get_bilingual_corpus('Bulgarian'), get_bilingual_corpus('Galician')
+    pivot_corpus = BilingualCorpus.pivot('Bulgarian', learn_language='Galician')
+
+    assert len(pivot_corpus) and pivot_corpus.shape[1] == 2
+    assert not pivot_corpus._train_english
+    assert len(pivot_corpus.learn_language_indices) == len(pivot_corpus)
+
+    np.testing.assert_array_equal(pivot_corpus.non_english_corpus, learn_corpus.non_english_corpus[pivot_corpus.learn_language_indices])
+    for i in range(0, len(pivot_corpus), 97):
+        reference_index = np.flatnonzero(reference_corpus.non_english_corpus == pivot_corpus[i, 0])
+        assert any(reference_corpus.english_corpus[reference_index] == learn_corpus.english_corpus[pivot_corpus.learn_language_indices[i]])
+
+    # cached join yielding identical corpus, in both directions
+    np.testing.assert_array_equal(BilingualCorpus.pivot('Bulgarian', learn_language='Galician'), pivot_corpus)
+    np.testing.assert_array_equal(BilingualCorpus.pivot('Galician', learn_language='Bulgarian'), pivot_corpus[:, ::-1])
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from backend.src.types.vocable_entry import is_perfected, NEVER_FACED, VocableEntries, VocableEntry
+from backend.src.utils.date import today_epoch_day
+
+
+TODAY = today_epoch_day()
+
+
+@pytest.fixture
+def entries() -> list[VocableEntry]:
+    return [
+        VocableEntry('il gatto', 'the cat', 0, 0, None),
+        VocableEntry('la faccia', 'the face', 7, 5.5, TODAY - 2),
+        VocableEntry('il viso', 'the face', 7, 5.5, TODAY - 80),
+        VocableEntry('figo', 'cool', 3, 1.0, TODAY),
+    ]
+
+
+def test_vocable_entry_slots(entries):
+    assert not hasattr(entries[0], '__dict__')
+
+
+def test_from_entries(entries):
+    vocable_entries = VocableEntries.from_entries(entries)
+
+    assert len(vocable_entries) == len(entries)
+    assert list(vocable_entries) == entries
+    assert vocable_entries.last_faced_dates[0] == NEVER_FACED
+    assert vocable_entries[-1] == entries[-1]
+
+    with pytest.raises(IndexError):
+        vocable_entries[len(entries)]
+
+
+def test_empty():
+    vocable_entries = VocableEntries.from_entries([])
+
+    assert not len(vocable_entries)
+    assert not len(vocable_entries.due_mask())
+
+
+def test_masks(entries):
+    vocable_entries = VocableEntries.from_entries(entries)
+
+    np.testing.assert_array_equal(vocable_entries.perfected_mask(), list(map(is_perfected, entries)))
+    assert [entry.vocable for entry in vocable_entries[vocable_entries.due_mask()]] == ['il gatto', 'il viso', 'figo']
+
+
+def test_row_write_through(entries):
+    vocable_entries = VocableEntries.from_entries(entries)
+
+    row = vocable_entries[0]
+    row.update_post_training_encounter(2.5)
+    row.last_faced_date = TODAY
+    assert (vocable_entries.times_faced[0], vocable_entries.scores[0], vocable_entries.last_faced_dates[0]) == (1, 2.5, TODAY)
+    assert not row.is_new
+
+    row.alter('il micio', 'the kitten')
+    assert vocable_entries[0] == VocableEntry('il micio', 'the kitten', 0, 0, None)
+    assert vocable_entries[0].the_stripped_meaning == 'kitten'
+
+
+def test_subset_copies(entries):
+    vocable_entries = VocableEntries.from_entries(entries)
+    subset = vocable_entries[1:3]
+
+    subset[0].score = 0
+    assert vocable_entries[1].score == 5.5
+    assert [entry.vocable for entry in subset] == ['la faccia', 'il viso']
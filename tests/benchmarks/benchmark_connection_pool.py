@@ -0,0 +1,64 @@
+""" Pool checkout latencies and wait queue lengths of concurrent sessions for different
+    maximal pool sizes, as a basis for sizing the pool, as well as the number of sessions
+    per process, under load
+
+    Requires a MongoDB server, writing to and subsequently dropping a dedicated database on it
+
+    Run via:
+        python -m tests.benchmarks.benchmark_connection_pool [N_SESSIONS] [MONGODB_URI] """
+
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import time
+
+from pymongo import MongoClient
+
+from backend.src.database.connection_pool import PoolMonitor, PoolOptions
+
+
+_DATABASE_NAME = 'connection_pool_benchmark'
+_MAX_POOL_SIZES = (1, 4, 16, 64)
+_N_OPERATIONS_PER_SESSION = 50
+
+
+def _session(client: MongoClient, i: int):
+    collection = client[_DATABASE_NAME]['sessions']
+    for _ in range(_N_OPERATIONS_PER_SESSION):
+        collection.update_one({'_id': i}, {'$inc': {'n': 1}}, upsert=True)
+        collection.find_one({'_id': i})
+
+
+def main(n_sessions: int, uri: str):
+    print(f'{n_sessions} concurrent sessions, {2 * _N_OPERATIONS_PER_SESSION} operations each')
+    print(f'{"max pool size":>14}{"open":>8}{"max waiting":>13}{"p50 [ms]":>10}{"p99 [ms]":>10}{"duration [s]":>14}')
+
+    for max_pool_size in _MAX_POOL_SIZES:
+        pool_monitor = PoolMonitor()
+        client = MongoClient(uri, event_listeners=[pool_monitor], **PoolOptions(max_pool_size=max_pool_size).client_kwargs())
+        try:
+            client.admin.command('ping')
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=n_sessions) as executor:
+                list(executor.map(lambda i: _session(client, i), range(n_sessions)))
+            duration = time.perf_counter() - start
+
+            statistics = pool_monitor.statistics
+            print(
+                f'{max_pool_size:>14}'
+                f'{statistics.n_open_connections:>8}'
+                f'{statistics.max_n_waiting:>13}'
+                f'{statistics.checkout_latency_quantile(0.5) * 1e3:>10.2f}'
+                f'{statistics.checkout_latency_quantile(0.99) * 1e3:>10.2f}'
+                f'{duration:>14.2f}'
+            )
+        finally:
+            client.drop_database(_DATABASE_NAME)
+            client.close()
+
+
+if __name__ == '__main__':
+    main(
+        n_sessions=int(sys.argv[1]) if len(sys.argv) > 1 else 64,
+        uri=sys.argv[2] if len(sys.argv) > 2 else 'mongodb://localhost:27017'
+    )
@@ -0,0 +1,60 @@
+""" Throughput of the iterative deviation_masks alignment as opposed to the previously employed
+    recursive implementation, on sentence-length inputs of increasing numbers of edits
+
+    Run via:
+        python -m tests.benchmarks.benchmark_deviation_masks [SENTENCE_LENGTH] """
+
+import random
+import sys
+import timeit
+
+from backend.src.trainers.vocable_trainer.deviation_masks import deviation_masks
+from tests.backend.trainers.vocable_trainer.recursive_deviation_masks import recursive_deviation_masks
+
+
+_N_PAIRS = 200
+_N_REPETITIONS = 5
+_CHARS = 'abcdefghilmnoprstuvz '
+
+
+def _sentence(length: int, rng: random.Random) -> str:
+    return ''.join(rng.choice(_CHARS) for _ in range(length))
+
+
+def _edited(sentence: str, n_edits: int, rng: random.Random) -> str:
+    chars = list(sentence)
+    for _ in range(n_edits):
+        i = rng.randrange(2, len(chars))
+        edit = rng.choice(['insertion', 'deletion', 'substitution'])
+        if edit == 'insertion':
+            chars.insert(i, rng.choice(_CHARS))
+        elif edit == 'deletion':
+            del chars[i]
+        else:
+            chars[i] = rng.choice(_CHARS)
+    return ''.join(chars)
+
+
+def _milliseconds_per_pair(masks, pairs: list[tuple[str, str]]) -> float:
+    def align_all():
+        for response, ground_truth in pairs:
+            list(map(list, masks(response, ground_truth)))
+
+    try:
+        return min(timeit.repeat(align_all, number=1, repeat=_N_REPETITIONS)) / len(pairs) * 1e3
+    except RecursionError:
+        return float('nan')
+
+
+def main(sentence_length: int):
+    rng = random.Random(69)
+
+    print(f'{sentence_length} char sentences, ms per pair')
+    print(f'{"edits":<10}{"recursive":>12}{"iterative":>12}')
+    for n_edits in (0, 1, 3, 10, 30):
+        pairs = [(_edited(ground_truth, n_edits, rng), ground_truth) for ground_truth in (_sentence(sentence_length, rng) for _ in range(_N_PAIRS))]
+        print(f'{n_edits:<10}{_milliseconds_per_pair(recursive_deviation_masks, pairs):>12.3f}{_milliseconds_per_pair(deviation_masks, pairs):>12.3f}')
+
+
+if __name__ == '__main__':
+    main(sentence_length=int(sys.argv[1]) if len(sys.argv) > 1 else 120)
@@ -0,0 +1,29 @@
+""" Duration of the token-wise grading of sentence translation responses, on a sentence-length
+    response comprising accent errors, misspellings and a missing token, as well as on a batch
+    of responses by means of get_sentence_evaluations
+
+    Run via:
+        python -m tests.benchmarks.benchmark_sentence_evaluation [N_EVALUATIONS] """
+
+import sys
+import timeit
+
+from backend.src.trainers.sentence_translation.response_evaluation import get_sentence_evaluation, get_sentence_evaluations
+
+
+_N_REPETITIONS = 5
+_RESPONSE = 'non so se riusciro finire il lavorro prima che arriveno gli ospitti stassera'
+_REFERENCE = 'Non so se riuscirò a finire il lavoro prima che arrivino gli ospiti stasera.'
+
+
+def main(n_evaluations: int):
+    single = min(timeit.repeat(lambda: get_sentence_evaluation(_RESPONSE, _REFERENCE), number=n_evaluations, repeat=_N_REPETITIONS))
+    batch = min(timeit.repeat(lambda: get_sentence_evaluations([_RESPONSE] * n_evaluations, [_REFERENCE] * n_evaluations), number=1, repeat=_N_REPETITIONS))
+
+    print(f'{n_evaluations} evaluations, ms per evaluation')
+    print(f'{"single":<10}{single / n_evaluations * 1e3:>10.3f}')
+    print(f'{"batch":<10}{batch / n_evaluations * 1e3:>10.3f}')
+
+
+if __name__ == '__main__':
+    main(n_evaluations=int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,102 @@
+""" Sign-up existence check latencies of the indexed user registry, as employed by the CredentialsDatabase,
+    as opposed to the previously employed layout of one credentials collection per user
+
+    Requires a MongoDB server, writing to and subsequently dropping a dedicated database on it;
+    creating the per-user collections takes a while for large numbers of users
+
+    Run via:
+        python -m tests.benchmarks.benchmark_user_registry [N_USERS] [MONGODB_URI] """
+
+import statistics
+import sys
+import time
+from typing import Callable
+
+from more_itertools import chunked
+from pymongo import ASCENDING, MongoClient
+from pymongo.database import Database
+
+from backend.src.database._utils import ID, UNIQUE_ID_FILTER
+
+
+_DATABASE_NAME = 'user_registry_benchmark'
+_REGISTRY_COLLECTION_NAME = 'user_registry'
+_N_REGISTRY_SAMPLES = 1_000
+_N_PER_USER_COLLECTION_SAMPLES = 3
+_INSERTION_BATCH_SIZE = 10_000
+
+
+def _username(i: int) -> str:
+    return f'user {i}'
+
+
+def _credentials(i: int) -> dict:
+    return {'emailAddress': f'user{i}@mail.com', 'password': f'password {i}'}
+
+
+def _populate_registry(database: Database, n_users: int):
+    registry = database[_REGISTRY_COLLECTION_NAME]
+    registry.create_index([('emailAddress', ASCENDING)], unique=True)
+    for batch in chunked(range(n_users), _INSERTION_BATCH_SIZE):
+        registry.insert_many([{ID: _username(i)} | _credentials(i) for i in batch])
+
+
+def _populate_per_user_collections(database: Database, n_users: int):
+    for i in range(n_users):
+        database[_username(i)].insert_one(UNIQUE_ID_FILTER | _credentials(i))
+
+
+def _median_milliseconds(operation: Callable[[int], object], user_indices: list[int]) -> float:
+    durations = []
+    for i in user_indices:
+        start = time.perf_counter()
+        operation(i)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1e3
+
+
+def main(n_users: int, uri: str):
+    client = MongoClient(uri)
+    registry_database = client[f'{_DATABASE_NAME}_registry']
+    per_user_collection_database = client[f'{_DATABASE_NAME}_per_user_collections']
+
+    # indices of both existent and, being the worst case of the per-user collection layout, non-existent users
+    checked_user_indices = list(range(0, 2 * n_users, 2 * n_users // _N_REGISTRY_SAMPLES or 1))
+
+    try:
+        _populate_registry(registry_database, n_users)
+        _populate_per_user_collections(per_user_collection_database, n_users)
+
+        registry = registry_database[_REGISTRY_COLLECTION_NAME]
+        rows = [
+            ('mail address taken [ms]', (
+                lambda i: any(
+                    per_user_collection_database[name].find_one(UNIQUE_ID_FILTER)['emailAddress'] == _credentials(i)['emailAddress']  # type: ignore[index]
+                    for name in per_user_collection_database.list_collection_names()
+                ),
+                lambda i: registry.find_one({'emailAddress': _credentials(i)['emailAddress']}, projection={ID: True}) is not None
+            )),
+            ('username taken [ms]', (
+                lambda i: _username(i) in per_user_collection_database.list_collection_names(),
+                lambda i: registry.find_one({ID: _username(i)}, projection={ID: True}) is not None
+            ))
+        ]
+
+        print(f'{n_users:,} users')
+        print(f'{"":<26}{"per-user collections":>22}{"user registry":>16}')
+        for name, (per_user_collection_operation, registry_operation) in rows:
+            print(
+                f'{name:<26}'
+                f'{_median_milliseconds(per_user_collection_operation, checked_user_indices[-_N_PER_USER_COLLECTION_SAMPLES:]):>22.2f}'
+                f'{_median_milliseconds(registry_operation, checked_user_indices):>16.2f}'
+            )
+    finally:
+        client.drop_database(registry_database.name)
+        client.drop_database(per_user_collection_database.name)
+
+
+if __name__ == '__main__':
+    main(
+        n_users=int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        uri=sys.argv[2] if len(sys.argv) > 2 else 'mongodb://localhost:27017'
+    )
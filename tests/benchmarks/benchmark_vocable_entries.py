@@ -0,0 +1,88 @@
+""" Memory and throughput of the columnar VocableEntries as opposed to a list of VocableEntry
+    dataclass instances, as previously employed
+
+    Run via:
+        python -m tests.benchmarks.benchmark_vocable_entries [N_ENTRIES] """
+
+import random
+import sys
+import timeit
+import tracemalloc
+from typing import Callable
+
+from backend.src.types.vocable_entry import is_perfected, VocableEntries, VocableEntry
+from backend.src.utils.date import today_epoch_day
+
+
+_N_REPETITIONS = 5
+
+
+def _vocabulary(n_entries: int) -> dict[str, dict]:
+    """ Returns:
+            vocabulary document of the form stored in the VocabularyCollection """
+
+    today = today_epoch_day()
+    return {
+        f'vocable {i}': {
+            't': f'translation {i}',
+            'tf': (times_faced := random.randint(0, 10)),
+            's': random.uniform(0, 10) if times_faced else 0,
+            'lfd': today - random.randint(0, 100) if times_faced else None
+        }
+        for i in range(n_entries)
+    }
+
+
+def _entry_list(vocabulary: dict[str, dict]) -> list[VocableEntry]:
+    return [VocableEntry(vocable, corpus['t'], corpus['tf'], corpus['s'], corpus['lfd']) for vocable, corpus in vocabulary.items()]
+
+
+def _columnar_entries(vocabulary: dict[str, dict]) -> VocableEntries:
+    corpora = vocabulary.values()
+    return VocableEntries(
+        vocables=vocabulary.keys(),
+        translations=(corpus['t'] for corpus in corpora),
+        times_faced=(corpus['tf'] for corpus in corpora),
+        scores=(corpus['s'] for corpus in corpora),
+        last_faced_dates=(corpus['lfd'] for corpus in corpora)
+    )
+
+
+def _allocated_bytes(create: Callable[[], object]) -> int:
+    tracemalloc.start()
+    obj = create()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def _seconds(statement: Callable[[], object]) -> float:
+    return min(timeit.repeat(statement, number=1, repeat=_N_REPETITIONS))
+
+
+def main(n_entries: int):
+    vocabulary = _vocabulary(n_entries)
+    entry_list, columnar_entries = _entry_list(vocabulary), _columnar_entries(vocabulary)
+
+    rows = [
+        ('memory [MB]', lambda create: _allocated_bytes(create) / 1e6, (lambda: _entry_list(vocabulary), lambda: _columnar_entries(vocabulary))),
+        ('construction [ms]', lambda statement: _seconds(statement) * 1e3, (lambda: _entry_list(vocabulary), lambda: _columnar_entries(vocabulary))),
+        ('due filtering [ms]', lambda statement: _seconds(statement) * 1e3, (
+            lambda: [entry for entry in entry_list if not is_perfected(entry)],
+            lambda: columnar_entries[columnar_entries.due_mask()]
+        )),
+        ('iteration [ms]', lambda statement: _seconds(statement) * 1e3, (
+            lambda: [entry.score for entry in entry_list],
+            lambda: [entry.score for entry in columnar_entries]
+        )),
+    ]
+
+    print(f'{n_entries:,} entries')
+    print(f'{"":<20}{"dataclass list":>16}{"VocableEntries":>16}')
+    for name, measure, (list_candidate, columnar_candidate) in rows:
+        print(f'{name:<20}{measure(list_candidate):>16.2f}{measure(columnar_candidate):>16.2f}')
+
+
+if __name__ == '__main__':
+    main(n_entries=int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
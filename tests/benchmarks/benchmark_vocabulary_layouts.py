@@ -0,0 +1,109 @@
+""" Update and read latencies of the per-entry vocabulary layout, as employed by the VocabularyCollection,
+    as opposed to the previously employed one of one document per language, for growing vocabulary sizes
+
+    Requires a MongoDB server, writing to and subsequently dropping a dedicated database on it
+
+    Run via:
+        python -m tests.benchmarks.benchmark_vocabulary_layouts [MONGODB_URI] """
+
+import random
+import statistics
+import sys
+import time
+from typing import Callable
+
+from pymongo import ASCENDING, MongoClient
+from pymongo.database import Database
+
+from backend.src.database.user_database import VocabularyCollection
+from backend.src.utils.date import today_epoch_day
+
+
+_DATABASE_NAME = 'vocabulary_layout_benchmark'
+_LANGUAGE = 'Italian'
+_VOCABULARY_SIZES = (1_000, 10_000, 50_000)
+_N_SAMPLES = 200
+_N_READ_SAMPLES = 10
+
+
+def _vocabulary(n_entries: int) -> dict[str, dict]:
+    today = today_epoch_day()
+    return {
+        f'vocable {i}': {
+            't': f'translation {i}',
+            'tf': (times_faced := random.randint(0, 10)),
+            's': random.uniform(0, 10) if times_faced else 0,
+            'lfd': today - random.randint(0, 100) if times_faced else None
+        }
+        for i in range(n_entries)
+    }
+
+
+def _populate(database: Database, vocabulary: dict[str, dict]):
+    database.drop_collection('language_documents')
+    database.drop_collection('entry_documents')
+
+    database.language_documents.insert_one({'_id': _LANGUAGE} | vocabulary)
+
+    database.entry_documents.create_index([('language', ASCENDING), ('vocable', ASCENDING)], unique=True)
+    database.entry_documents.create_index([('language', ASCENDING), ('due', ASCENDING)])
+    database.entry_documents.insert_many([
+        {'language': _LANGUAGE, 'vocable': vocable} | VocabularyCollection._migrated_entry_fields(entry_corpus)  # type: ignore[arg-type]
+        for vocable, entry_corpus in vocabulary.items()
+    ])
+
+
+def _median_milliseconds(operation: Callable[[str], object], vocables: list[str]) -> float:
+    durations = []
+    for vocable in vocables:
+        start = time.perf_counter()
+        operation(vocable)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1e3
+
+
+def main(uri: str):
+    database = MongoClient(uri)[_DATABASE_NAME]
+    today = today_epoch_day()
+
+    print(f'{"":<26}{"language documents":>20}{"entry documents":>20}')
+    try:
+        for n_entries in _VOCABULARY_SIZES:
+            vocabulary = _vocabulary(n_entries)
+            _populate(database, vocabulary)
+            sampled_vocables = random.sample(list(vocabulary), _N_SAMPLES)
+
+            rows = [
+                ('update [ms]', sampled_vocables, (
+                    lambda vocable: database.language_documents.update_one(
+                        {'_id': _LANGUAGE},
+                        {'$inc': {f'{vocable}.tf': 1}, '$set': {f'{vocable}.lfd': today, f'{vocable}.s': 2.5}}
+                    ),
+                    lambda vocable: database.entry_documents.update_one(
+                        {'language': _LANGUAGE, 'vocable': vocable},
+                        {'$inc': {'tf': 1}, '$set': {'lfd': today, 's': 2.5, 'due': 0}}
+                    )
+                )),
+                ('entry read [ms]', sampled_vocables, (
+                    lambda vocable: database.language_documents.find_one({'_id': _LANGUAGE}, projection={vocable: True}),
+                    lambda vocable: database.entry_documents.find_one({'language': _LANGUAGE, 'vocable': vocable})
+                )),
+                ('due entries read [ms]', sampled_vocables[:_N_READ_SAMPLES], (
+                    lambda _: database.language_documents.find_one({'_id': _LANGUAGE}),
+                    lambda _: list(database.entry_documents.find({'language': _LANGUAGE, 'due': {'$lte': today}}))
+                ))
+            ]
+
+            print(f'{n_entries:,} entries')
+            for name, vocables, (language_document_operation, entry_document_operation) in rows:
+                print(
+                    f'  {name:<24}'
+                    f'{_median_milliseconds(language_document_operation, vocables):>20.2f}'
+                    f'{_median_milliseconds(entry_document_operation, vocables):>20.2f}'
+                )
+    finally:
+        database.client.drop_database(_DATABASE_NAME)
+
+
+if __name__ == '__main__':
+    main(uri=sys.argv[1] if len(sys.argv) > 1 else 'mongodb://localhost:27017')
@@ -1,7 +1,9 @@
 from functools import lru_cache
+from typing import Iterator
 
 import pytest
 
+from backend.src import paths
 from backend.src.database import connect_database_client
 from backend.src.database.user_database import UserDatabase
 from backend.src.types.bilingual_corpus import BilingualCorpus
@@ -11,6 +13,15 @@ MONGODB_TEST_USER = 'janek'
 MONGODB_TEST_LANGUAGE = 'Italian'
 
 
+@pytest.fixture(scope='session', autouse=True)
+def redirect_cache(tmp_path_factory):
+    """ Keeps the data derived from the corpora out of the user cache """
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(paths, 'CACHE_DIR_PATH', tmp_path_factory.mktemp('cache'))
+        yield
+
+
 @pytest.fixture(scope='session', autouse=True)
 def launch_database_client():
     connect_database_client(server_selection_timeout=2_000)
@@ -18,7 +29,8 @@ def launch_database_client():
 
 @pytest.fixture(autouse=True)
 def instantiate_user_database():
-    UserDatabase(MONGODB_TEST_USER, MONGODB_TEST_LANGUAGE)
+    with UserDatabase(MONGODB_TEST_USER, MONGODB_TEST_LANGUAGE):
+        yield
 
 
 @pytest.fixture
@@ -26,6 +38,17 @@ def user_database() -> UserDatabase:
     return UserDatabase.instance()
 
 
+@pytest.fixture
+def throwaway_user_database(user_database) -> Iterator[UserDatabase]:
+    """ Handle of a dedicated user, whose database is dropped at teardown, thus
+        leaving the one of the test user shared by the other tests unaltered """
+
+    throwaway_user_database = UserDatabase(f'{MONGODB_TEST_USER}-throwaway', MONGODB_TEST_LANGUAGE, client=user_database.client, current=False)
+    yield throwaway_user_database
+    throwaway_user_database.close()
+    user_database.client.drop_database(throwaway_user_database.name)
+
+
 @lru_cache
 def get_bilingual_corpus(language: str, train_english=False) -> BilingualCorpus:
     """ Cashes already instantiated corpora for reuse """